@@ -0,0 +1,299 @@
+"""Board-pack generator: a PDF or PowerPoint pack per investment scenario and circle group
+
+Packs reuse the dashboard's own figures. Every page view a pack needs is run
+headlessly with AppTest and its Plotly specs are collected. The specs are
+de-duplicated across packs and each is rendered to PNG once, in a process
+pool, with Kaleido (Plotly's local static renderer). Each pack is then
+assembled from those images plus the Risk Assessment and Final Strategic
+Recommendations text:
+
+    python board_pack.py spectrum_analysis2.py --format pptx --out packs
+    python board_pack.py spectrum_analysis2.py --format pdf --groups Metro "Category A" --workers 8
+
+Every pack covers one circle group: its State-wise Comparison and its
+Strategic Insights ranking are scoped to the group's circles.
+
+Rendering needs kaleido (see requirements.txt). Kaleido 1.x, the release for
+plotly 6 and later, drives a local Chrome. Install one once per machine:
+
+    plotly_get_chrome -y
+
+or point BROWSER_PATH at an existing Chrome or Chromium (it needs its usual
+system libraries, libatk, libasound and the X11 client libraries among
+them). Kaleido 0.2.1, the release for plotly 5.x, bundles its own Chromium
+and needs no browser. The generator renders a test figure before running any
+page and stops with these instructions when it cannot. PPTX packs need
+python-pptx; PDF pages are composed with Pillow.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import textwrap
+import time
+
+from circles import circle_groups
+from data_plane import data_version
+from export_static import NAV_LABEL, slug
+
+STATES_LABEL = "Select States for Comparison"
+SCENARIO_LABEL = "Select Investment Strategy"
+GROUP_LABEL = "Circles to Rank"
+FIGURE_SIZE = (1280, 720)
+
+# Pages whose figures open every pack, whatever the scenario or circle group
+SHARED_PAGES = ["Executive Summary"]
+# Subheaders on the strategy page whose text goes into the pack
+TEXT_SECTIONS = ("Risk Assessment", "Final Strategic Recommendations")
+
+
+def _figure_title(spec, default):
+    title = json.loads(spec).get('layout', {}).get('title', {})
+    return (title.get('text') if isinstance(title, dict) else title) or default
+
+
+def collect(script, page, selections=()):
+    """Figure specs and text sections of one page view
+
+    `selections` is a sequence of (widget label, value) pairs applied in order.
+    Returns (figures, sections) with figures as (title, spec) pairs.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    next(box for box in at.sidebar.selectbox if box.label == NAV_LABEL).set_value(page).run()
+    for label, value in selections:
+        widgets = list(at.main.selectbox) + list(at.main.multiselect)
+        next(widget for widget in widgets if widget.label == label).set_value(value).run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+    figures = [(_figure_title(chart.proto.spec, page), chart.proto.spec) for chart in at.get('plotly_chart')]
+
+    sections = []
+    for element in at.main:
+        kind = type(element).__name__
+        if kind == 'Subheader':
+            current = element.value if any(name in element.value for name in TEXT_SECTIONS) else None
+            if current:
+                sections.append((current, []))
+        elif kind == 'Markdown' and sections and current:
+            text = textwrap.dedent(element.value).strip()
+            if text and text != '---' and not text.startswith('<'):
+                sections[-1][1].append(text)
+    return figures, sections
+
+
+def check_renderer():
+    """Render a one-bar figure; raises RuntimeError, with the setup steps, when Kaleido cannot"""
+    import plotly.io as pio
+
+    try:
+        pio.to_image({'data': [{'type': 'bar', 'y': [1]}]}, format='png', width=64, height=64)
+    except Exception as e:
+        raise RuntimeError(f"Kaleido cannot render figures: {e}\n\nInstall a Chrome for it with "
+                           "`plotly_get_chrome -y`, or set BROWSER_PATH to one (see board_pack.py).") from e
+
+
+def render_figure(spec, path):
+    """Render one Plotly spec to a PNG file with Kaleido"""
+    import plotly.io as pio
+
+    width, height = FIGURE_SIZE
+    figure = json.loads(spec)
+    figure.setdefault('layout', {}).update(width=width, height=height)
+    with open(path, 'wb') as f:
+        f.write(pio.to_image(figure, format='png', width=width, height=height, scale=1.5))
+    return path
+
+
+def _text_lines(blocks):
+    """Markdown blocks as (level, text) lines: headings at level 0, bullets indented by depth"""
+    lines = []
+    for block in blocks:
+        for raw in block.splitlines():
+            if not raw.strip():
+                continue
+            indent = (len(raw) - len(raw.lstrip())) // 2
+            text = raw.strip()
+            if text.startswith('#'):
+                lines.append((0, text.lstrip('#').strip().replace('**', '')))
+            elif text.startswith(('- ', '• ')):
+                lines.append((1 + min(indent, 2), text[2:].replace('**', '')))
+            else:
+                lines.append((1, text.replace('**', '')))
+    return lines
+
+
+def _pptx(path, title, subtitle, figures, sections):
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(13.333), Inches(7.5)
+
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = title
+    slide.placeholders[1].text = subtitle
+
+    for figure_title, image in figures:
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = figure_title
+        slide.shapes.title.text_frame.paragraphs[0].font.size = Pt(28)
+        slide.shapes.add_picture(image, Inches(1.0), Inches(1.4), height=Inches(5.9))
+
+    for heading, blocks in sections:
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = heading
+        body = slide.placeholders[1]
+        body.left, body.top, body.width, body.height = Inches(0.6), Inches(1.4), Inches(12.1), Inches(5.8)
+        frame = body.text_frame
+        frame.text = ''
+        for i, (level, text) in enumerate(_text_lines(blocks)):
+            paragraph = frame.paragraphs[0] if i == 0 else frame.add_paragraph()
+            paragraph.text = text
+            paragraph.level = max(level - 1, 0)
+            paragraph.font.size = Pt(18 if level == 0 else 14)
+            paragraph.font.bold = level == 0
+    prs.save(path)
+
+
+def _pdf(path, title, subtitle, figures, sections):
+    from PIL import Image, ImageDraw, ImageFont
+
+    size = (1600, 900)
+    # The built-in font has no emoji; drop them rather than print boxes
+    clean = lambda text: re.sub(r'[\U00010000-\U0010FFFF☀-➿️]', '', text).strip()
+    heading_font = ImageFont.load_default(size=40)
+    body_font = ImageFont.load_default(size=24)
+
+    pages = []
+    page = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(page)
+    draw.text((100, 350), clean(title), fill='#1f77b4', font=ImageFont.load_default(size=56))
+    draw.text((100, 450), clean(subtitle), fill='#31333f', font=body_font)
+    pages.append(page)
+
+    for figure_title, image in figures:
+        page = Image.new('RGB', size, 'white')
+        ImageDraw.Draw(page).text((60, 30), clean(figure_title), fill='#31333f', font=heading_font)
+        with Image.open(image) as chart:
+            chart = chart.convert('RGB')
+            chart.thumbnail((size[0] - 120, size[1] - 130))
+            page.paste(chart, ((size[0] - chart.width) // 2, 110))
+        pages.append(page)
+
+    for heading, blocks in sections:
+        page = Image.new('RGB', size, 'white')
+        draw = ImageDraw.Draw(page)
+        draw.text((60, 30), clean(heading), fill='#31333f', font=heading_font)
+        y = 110
+        for level, text in _text_lines(blocks):
+            if y > size[1] - 60:
+                pages.append(page)
+                page = Image.new('RGB', size, 'white')
+                draw = ImageDraw.Draw(page)
+                y = 60
+            prefix = '' if level == 0 else '• '
+            draw.text((60 + 40 * level, y), prefix + clean(text), fill='#31333f',
+                      font=heading_font if level == 0 else body_font)
+            y += 52 if level == 0 else 34
+        pages.append(page)
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=150)
+
+
+def assemble(path, fmt, title, subtitle, figures, sections):
+    """Write one pack from rendered figure images (title, PNG path) and text sections"""
+    (_pptx if fmt == 'pptx' else _pdf)(path, title, subtitle, figures, sections)
+    return path
+
+
+def generate(script, out_dir, fmt='pptx', scenarios=None, groups=None, workers=None):
+    """Build every requested scenario x circle-group pack; returns the written paths"""
+    check_renderer()
+    script = os.path.abspath(script)
+    all_groups = circle_groups()
+    groups = {name: all_groups[name] for name in (groups or all_groups)}
+    figure_dir = os.path.join(out_dir, 'figures')
+    os.makedirs(figure_dir, exist_ok=True)
+    version = data_version()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        # Scenario names come from the strategy page itself (dashboards without one get a single pack per group)
+        strategy = pool.submit(_strategy_options, script).result()
+        scenarios = scenarios or strategy or [None]
+
+        jobs = {('page', page): (script, page) for page in SHARED_PAGES}
+        jobs.update({('group', name): (script, "State-wise Comparison", [(STATES_LABEL, circles)])
+                     for name, circles in groups.items()})
+        if strategy:
+            jobs.update({('scenario', scenario, name): (script, "Strategic Insights",
+                                                        [(SCENARIO_LABEL, scenario), (GROUP_LABEL, name)])
+                         for scenario in scenarios for name in groups})
+        futures = {key: pool.submit(collect, *args) for key, args in jobs.items()}
+        collected = {key: future.result() for key, future in futures.items()}
+
+        # Each distinct figure is rendered once, however many packs use it
+        specs = {}
+        for figures, _ in collected.values():
+            for _, spec in figures:
+                specs.setdefault(hashlib.sha1(spec.encode()).hexdigest()[:16], spec)
+        paths = {key: os.path.join(figure_dir, f'{key}.png') for key in specs}
+        list(pool.map(render_figure, [specs[key] for key in paths], paths.values()))
+        image = lambda spec: paths[hashlib.sha1(spec.encode()).hexdigest()[:16]]
+
+        shared = [(title, image(spec)) for page in SHARED_PAGES for title, spec in collected[('page', page)][0]]
+        packs = []
+        for scenario in scenarios:
+            for name in groups:
+                strategy_figures, sections = collected.get(('scenario', scenario, name), ([], []))
+                group_figures = [(f'{title} ({name})', image(spec)) for title, spec in collected[('group', name)][0]]
+                figures = shared + group_figures + [(title, image(spec)) for title, spec in strategy_figures]
+                label = name if scenario is None else f'{scenario} · {name}'
+                stem = slug(name) if scenario is None else f'{slug(scenario)}--{slug(name)}'
+                packs.append((os.path.join(out_dir, f'{stem}.{fmt}'), fmt, "Spectrum Auction Board Pack",
+                              f"{label}\nData version {version} · {time.strftime('%d %b %Y')}",
+                              figures, sections))
+        return list(pool.map(assemble, *zip(*packs)))
+
+
+def _strategy_options(script):
+    """Investment scenarios offered by the dashboard's strategy page (empty if it has none)"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    nav = next(box for box in at.sidebar.selectbox if box.label == NAV_LABEL)
+    if "Strategic Insights" not in nav.options:
+        return []
+    nav.set_value("Strategic Insights").run()
+    return [list(box.options) for box in at.main.selectbox if box.label == SCENARIO_LABEL][0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('script', help="dashboard script whose figures the packs reuse")
+    parser.add_argument('--format', choices=['pptx', 'pdf'], default='pptx')
+    parser.add_argument('--out', default='board_packs', help="output folder")
+    parser.add_argument('--scenarios', nargs='*', help="investment scenarios (default: all)")
+    parser.add_argument('--groups', nargs='*', choices=list(circle_groups()), help="circle groups (default: all)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        paths = generate(args.script, args.out, args.format, args.scenarios, args.groups, args.workers)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    print(f"Wrote {len(paths)} {args.format.upper()} packs to {args.out}/ in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    # Workers must find their functions under the module name: AppTest swaps out __main__ while it runs
+    import board_pack
+    sys.exit(board_pack.main())
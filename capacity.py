@@ -0,0 +1,97 @@
+"""Capacity value of mid-band and mmWave spectrum as expected cell throughput
+
+Block bandwidth becomes downlink throughput per cell: MHz per direction
+for FDD bands, or MHz times the downlink share of the TDD frame for TDD
+bands, times the spectral efficiency of the technology deployed in the
+band. Throughput is computed for every band and circle of the cube at once
+(one broadcast over the circle x band quantum matrix) and memoized per
+parameter set, so switching assumptions back and forth costs nothing.
+"""
+
+import collections
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ingest import BANDS, DUPLEX_MODES, QUANTUM_COLUMNS
+
+# Average downlink spectral efficiency per cell (bit/s/Hz) by technology
+SPECTRAL_EFFICIENCY = {
+    'LTE': 1.6,              # 2x2 MIMO
+    'NR': 2.2,               # 4x4 MIMO
+    'NR massive MIMO': 7.0,  # 64T64R active antennas
+    'NR mmWave': 3.0,        # beamformed, up to 4 layers
+}
+
+# Technology per band; None follows the mid-band technology chosen by the analyst
+BAND_TECHNOLOGY = {
+    '800 MHz': 'LTE',
+    '900 MHz': 'LTE',
+    '1800 MHz': None,
+    '2100 MHz': None,
+    '2300 MHz': None,
+    '2500 MHz': None,
+    '3300 MHz': 'NR massive MIMO',
+    '26 GHz': 'NR mmWave',
+}
+
+MID_BAND_TECHNOLOGIES = ['LTE', 'NR']
+
+# Bands counted as capacity today, and as future capacity
+CAPACITY_BANDS = ['1800 MHz', '2100 MHz', '2300 MHz', '2500 MHz', '3300 MHz']
+FUTURE_BANDS = ['26 GHz']
+
+# Share of a TDD frame carrying downlink (DDDSU is about 0.74)
+TDD_DOWNLINK_SHARE = 0.74
+TDD_DOWNLINK_SHARES = [0.5, 0.6, 0.7, 0.74, 0.8]
+
+CapacityParameters = collections.namedtuple('CapacityParameters', ['mid_band_technology', 'tdd_downlink_share'])
+
+
+def throughput_column(band):
+    """Column holding the band's downlink throughput per cell (Mbps)"""
+    return f"Throughput_{QUANTUM_COLUMNS[band].replace('Quantum_', '')}"
+
+
+def band_efficiency(parameters):
+    """Downlink Mbps per cell for each MHz of quantum, per position in BANDS"""
+    technology = [BAND_TECHNOLOGY[band] or parameters.mid_band_technology for band in BANDS]
+    efficiency = np.array([SPECTRAL_EFFICIENCY[name] for name in technology])
+    downlink = np.array([1.0 if DUPLEX_MODES[band] == 'FDD' else parameters.tdd_downlink_share for band in BANDS])
+    return efficiency * downlink
+
+
+class CapacityModel:
+    """Downlink cell throughput per circle and band of one cube, memoized per parameter set"""
+
+    def __init__(self, cube):
+        self.states = cube['State'].to_numpy()
+        self.bands = [band for band in BANDS if QUANTUM_COLUMNS[band] in cube.columns]
+        self._quantum = cube[[QUANTUM_COLUMNS[band] for band in self.bands]].to_numpy(dtype=float)
+        self._positions = [BANDS.index(band) for band in self.bands]
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def throughput(self, mid_band_technology='LTE', tdd_downlink_share=TDD_DOWNLINK_SHARE):
+        """Per circle: Mbps per cell in every band, Capacity_Mbps over CAPACITY_BANDS and
+        Future_Mbps over FUTURE_BANDS (shared frame; copy before changing it)"""
+        if mid_band_technology not in MID_BAND_TECHNOLOGIES:
+            raise ValueError(f"Unknown mid-band technology {mid_band_technology!r}; "
+                             f"expected one of {MID_BAND_TECHNOLOGIES}")
+        if not 0 < tdd_downlink_share <= 1:
+            raise ValueError(f"tdd_downlink_share must be in (0, 1], got {tdd_downlink_share}")
+        parameters = CapacityParameters(mid_band_technology, float(tdd_downlink_share))
+        with self._lock:
+            if parameters in self._results:
+                return self._results[parameters]
+
+        mbps = self._quantum * band_efficiency(parameters)[self._positions]
+        frame = pd.DataFrame(mbps.round(1), columns=[throughput_column(band) for band in self.bands])
+        frame.insert(0, 'State', self.states)
+        in_bands = lambda bands: [i for i, band in enumerate(self.bands) if band in bands]
+        frame['Capacity_Mbps'] = mbps[:, in_bands(CAPACITY_BANDS)].sum(axis=1).round(1)
+        frame['Future_Mbps'] = mbps[:, in_bands(FUTURE_BANDS)].sum(axis=1).round(1)
+        with self._lock:
+            self._results[parameters] = frame
+        return frame
@@ -0,0 +1,104 @@
+"""Canonical dimension of telecom circles (Licensed Service Areas)"""
+
+import numpy as np
+import pandas as pd
+
+# One row per LSA; the position in this list is the integer Circle_ID used for every join
+CIRCLES = [
+    # (Circle, Category, Metro, Region)
+    ('Andhra Pradesh', 'A', False, 'South'),
+    ('Assam', 'C', False, 'North East'),
+    ('Bihar', 'C', False, 'East'),
+    ('Delhi', 'Metro', True, 'North'),
+    ('Gujarat', 'A', False, 'West'),
+    ('Haryana', 'B', False, 'North'),
+    ('Himachal Pradesh', 'C', False, 'North'),
+    ('Jammu and Kashmir', 'C', False, 'North'),
+    ('Karnataka', 'A', False, 'South'),
+    ('Kerala', 'B', False, 'South'),
+    ('Kolkata', 'Metro', True, 'East'),
+    ('Madhya Pradesh', 'B', False, 'West'),
+    ('Maharashtra', 'A', False, 'West'),
+    ('Mumbai', 'Metro', True, 'West'),
+    ('North East', 'C', False, 'North East'),
+    ('Odisha', 'C', False, 'East'),
+    ('Punjab', 'B', False, 'North'),
+    ('Rajasthan', 'B', False, 'North'),
+    ('Tamil Nadu', 'A', False, 'South'),
+    ('Uttar Pradesh (East)', 'B', False, 'North'),
+    ('Uttar Pradesh (West)', 'B', False, 'North'),
+    ('West Bengal', 'B', False, 'East'),
+]
+
+N_CIRCLES = len(CIRCLES)
+
+# Other spellings seen in DoT documents and analyst inputs
+ALIASES = {
+    'Jammu & Kashmir': 'Jammu and Kashmir',
+    'J&K': 'Jammu and Kashmir',
+    'Tamilnadu': 'Tamil Nadu',
+    'Chennai': 'Tamil Nadu',
+    'Orissa': 'Odisha',
+    'Calcutta': 'Kolkata',
+    'Bombay': 'Mumbai',
+    'NE': 'North East',
+    'UP (East)': 'Uttar Pradesh (East)',
+    'UP East': 'Uttar Pradesh (East)',
+    'UP (West)': 'Uttar Pradesh (West)',
+    'UP West': 'Uttar Pradesh (West)',
+    'MP': 'Madhya Pradesh',
+    'AP': 'Andhra Pradesh',
+}
+
+CIRCLE_NAMES = [name for name, _, _, _ in CIRCLES]
+
+_LOOKUP = {name.casefold(): i for i, name in enumerate(CIRCLE_NAMES)}
+_LOOKUP.update({alias.casefold(): CIRCLE_NAMES.index(name) for alias, name in ALIASES.items()})
+
+
+def circle_dimension():
+    """The circle dimension as a DataFrame indexed by Circle_ID"""
+    dim = pd.DataFrame(CIRCLES, columns=['Circle', 'Category', 'Metro', 'Region'])
+    dim.index.name = 'Circle_ID'
+    return dim
+
+
+def circle_groups():
+    """Named groups of circles a view or board pack can cover: all, by category and by region"""
+    dim = circle_dimension()
+    groups = {'All Circles': dim['Circle'].tolist()}
+    for category in ['Metro', 'A', 'B', 'C']:
+        name = category if category == 'Metro' else f'Category {category}'
+        groups[name] = dim.loc[dim['Category'] == category, 'Circle'].tolist()
+    for region in sorted(dim['Region'].unique()):
+        groups[f'{region} Region'] = dim.loc[dim['Region'] == region, 'Circle'].tolist()
+    return groups
+
+
+def canonical_name(name):
+    """Canonical spelling of a circle name or alias (unknown names are returned tidied)"""
+    name = ' '.join(str(name).split())
+    circle = _LOOKUP.get(name.casefold())
+    return name if circle is None else CIRCLE_NAMES[circle]
+
+
+def circle_id(name):
+    """Integer Circle_ID for a circle name or alias"""
+    circle = _LOOKUP.get(' '.join(str(name).split()).casefold())
+    if circle is None:
+        raise KeyError(f"Unknown circle: {name!r}")
+    return circle
+
+
+def circle_ids(names):
+    """Vectorized Circle_ID lookup; unknown names map to -1"""
+    names = pd.Series(names, dtype=object)
+    return names.str.split().str.join(' ').str.casefold().map(_LOOKUP).fillna(-1).to_numpy(dtype=np.int64)
+
+
+def align(circle_id_values, values, fill=0):
+    """Scatter per-row `values` into a dense array indexed by Circle_ID"""
+    values = np.asarray(values)
+    out = np.full(N_CIRCLES, fill, dtype=np.result_type(values.dtype, type(fill)))
+    out[np.asarray(circle_id_values)] = values
+    return out
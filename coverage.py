@@ -0,0 +1,176 @@
+"""Coverage value of sub-GHz spectrum from propagation estimates
+
+Low bands are bought for reach: a cell at 800/900 MHz covers several times
+the area of one at 1800 MHz, so the same circle needs far fewer sites. The
+model estimates the uplink cell radius from a link budget and the
+Okumura-Hata path-loss formula (COST-231 Hata above 1500 MHz), per circle
+terrain class, band and carrier size. The site count then follows from the
+circle's area (data/circle_geography.csv). A circle's coverage value is the
+number of sites its sub-GHz offer saves compared with covering the same area
+at 1800 MHz.
+
+Everything is evaluated as arrays over band x carrier x circle at once.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, N_CIRCLES, circle_ids
+from ingest import QUANTUM_COLUMNS
+from valuation import DATA_DIR
+
+# Area and terrain class per circle (approximate land areas; adjust as needed)
+GEOGRAPHY_PATH = os.path.join(DATA_DIR, 'circle_geography.csv')
+
+SUB_GHZ_BANDS = ['800 MHz', '900 MHz']
+# Band whose site count the sub-GHz bands are compared with
+REFERENCE_BAND = '1800 MHz'
+
+# Uplink centre frequency per band (MHz); the uplink limits coverage
+UPLINK_MHZ = {
+    '800 MHz': 834.0,
+    '900 MHz': 902.5,
+    '1800 MHz': 1747.5,
+}
+
+# Standard LTE carrier sizes (MHz per direction) the offered spectrum can form
+CARRIER_MHZ = np.array([1.4, 3.0, 5.0, 10.0])
+
+# Terrain class: (Hata environment, building penetration and terrain loss in dB, share of the area to cover)
+TERRAIN = {
+    'Dense Urban': ('metropolitan', 20.0, 1.0),
+    'Urban': ('urban', 15.0, 0.9),
+    'Suburban': ('suburban', 12.0, 0.8),
+    'Rural': ('open', 8.0, 0.6),
+    'Hilly': ('open', 16.0, 0.4),
+}
+
+# Uplink link budget (UE to base station)
+LINK_BUDGET = {
+    'ue_power_dbm': 23.0,
+    'antenna_gain_dbi': 17.0,
+    'cable_loss_db': 2.0,
+    'noise_figure_db': 3.0,
+    'required_sinr_db': -2.0,
+    'interference_margin_db': 3.0,
+    'shadowing_margin_db': 8.0,
+    'base_height_m': 30.0,
+    'mobile_height_m': 1.5,
+}
+
+# Area served by a three-sector site, in units of the cell radius squared
+SITE_AREA_FACTOR = 9 * np.sqrt(3) / 8
+
+
+def load_circle_geography(path=GEOGRAPHY_PATH):
+    """Area (km²) and terrain class per Circle_ID (NaN area and 'Rural' where not given)"""
+    area = np.full(N_CIRCLES, np.nan)
+    terrain = np.full(N_CIRCLES, 'Rural', dtype=object)
+    if not os.path.exists(path):
+        return area, terrain
+    frame = pd.read_csv(path)
+    circles = circle_ids(frame['Circle'])
+    known = circles >= 0
+    unknown = sorted(set(frame['Terrain'][known]) - set(TERRAIN))
+    if unknown:
+        raise ValueError(f"Unknown terrain class(es) {unknown} in {path}; expected one of {list(TERRAIN)}")
+    area[circles[known]] = pd.to_numeric(frame['Area_km2'], errors='coerce').to_numpy()[known]
+    terrain[circles[known]] = frame['Terrain'].to_numpy()[known]
+    return area, terrain
+
+
+def _hata_terms(freq_mhz, environment, base_height_m, mobile_height_m):
+    """Loss at 1 km and slope per decade of distance (dB) of (COST-231) Hata"""
+    log_f = np.log10(freq_mhz)
+    log_hb = np.log10(base_height_m)
+    metropolitan = environment == 'metropolitan'
+    # Mobile antenna correction: large city versus small/medium city
+    a_hm = np.where(metropolitan,
+                    3.2 * np.log10(11.75 * mobile_height_m) ** 2 - 4.97,
+                    (1.1 * log_f - 0.7) * mobile_height_m - (1.56 * log_f - 0.8))
+    loss = np.where(freq_mhz <= 1500,
+                    69.55 + 26.16 * log_f,
+                    46.3 + 33.9 * log_f + np.where(metropolitan, 3.0, 0.0)) - 13.82 * log_hb - a_hm
+    loss = loss - np.select([environment == 'suburban', environment == 'open'],
+                            [2 * np.log10(freq_mhz / 28) ** 2 + 5.4,
+                             4.78 * log_f ** 2 - 18.33 * log_f + 40.94], 0.0)
+    return loss, 44.9 - 6.55 * log_hb
+
+
+def path_loss_db(freq_mhz, distance_km, environment, base_height_m=30.0, mobile_height_m=1.5):
+    """Median path loss (dB) by Okumura-Hata up to 1500 MHz and COST-231 Hata above; broadcasts"""
+    loss, slope = _hata_terms(np.asarray(freq_mhz, dtype=float), np.asarray(environment),
+                              base_height_m, mobile_height_m)
+    return loss + slope * np.log10(distance_km)
+
+
+def max_path_loss_db(bandwidth_mhz, extra_loss_db, budget=LINK_BUDGET):
+    """Maximum allowable path loss (dB) when the UE's power is spread over `bandwidth_mhz`"""
+    noise_dbm = -174.0 + 10 * np.log10(np.asarray(bandwidth_mhz) * 1e6) + budget['noise_figure_db']
+    sensitivity_dbm = noise_dbm + budget['required_sinr_db']
+    return (budget['ue_power_dbm'] + budget['antenna_gain_dbi'] - budget['cable_loss_db'] - sensitivity_dbm
+            - budget['interference_margin_db'] - budget['shadowing_margin_db'] - extra_loss_db)
+
+
+def cell_radius_km(freq_mhz, bandwidth_mhz, terrain, budget=LINK_BUDGET):
+    """Cell radius (km) at which the path loss uses up the link budget; broadcasts over all arguments"""
+    terrain = np.asarray(terrain, dtype=object)
+    environment = np.vectorize(lambda name: TERRAIN[name][0], otypes=[object])(terrain)
+    extra = np.vectorize(lambda name: TERRAIN[name][1], otypes=[float])(terrain)
+    loss, slope = _hata_terms(np.asarray(freq_mhz, dtype=float), environment.astype(str),
+                              budget['base_height_m'], budget['mobile_height_m'])
+    return 10 ** ((max_path_loss_db(bandwidth_mhz, extra, budget) - loss) / slope)
+
+
+def coverage_grid(area, terrain, bands=SUB_GHZ_BANDS + [REFERENCE_BAND], carriers=CARRIER_MHZ, budget=LINK_BUDGET):
+    """Cell radius (km) and sites needed for every band x carrier size x circle, as two arrays"""
+    freq = np.array([UPLINK_MHZ[band] for band in bands])[:, None, None]
+    share = np.vectorize(lambda name: TERRAIN[name][2], otypes=[float])(np.asarray(terrain, dtype=object))
+    radius = cell_radius_km(freq, np.asarray(carriers)[None, :, None], np.asarray(terrain, dtype=object)[None, None, :],
+                            budget)
+    sites = np.ceil(area * share / (SITE_AREA_FACTOR * radius ** 2))
+    return radius, sites
+
+
+def sites_saved(mhz, sites):
+    """Thousands of sites saved against 1800 MHz by holding `mhz` per sub-GHz band and circle
+
+    `mhz` is shaped (..., sub-GHz band, circle), so a whole stack of portfolios is
+    valued at once; `sites` comes from `coverage_grid`. Returns the value and the
+    index in CARRIER_MHZ of the carrier each holding forms, both shaped like `mhz`.
+    """
+    mhz = np.asarray(mhz, dtype=float)
+    carrier = np.maximum(np.searchsorted(CARRIER_MHZ, mhz, side='right') - 1, 0)
+    usable = np.minimum(mhz / CARRIER_MHZ[0], 1.0)
+    bands = np.arange(len(SUB_GHZ_BANDS))[:, None]
+    circles = np.arange(N_CIRCLES)
+    saved = sites[-1, carrier, circles] - sites[bands, carrier, circles]
+    return np.nan_to_num(saved * usable) / 1000, carrier
+
+
+def coverage_value(cube, area, terrain, budget=LINK_BUDGET):
+    """Coverage of each circle's sub-GHz offer: the band and carrier it supports, cell radius, sites
+    needed and Coverage_Value, thousands of sites saved against the same carrier at 1800 MHz
+
+    The offer forms the largest standard carrier it can fill. An offer too small for any carrier
+    (blocks that top up an existing one) counts pro rata against the smallest. Circles with
+    no sub-GHz offer, or no area given, are worth 0.
+    """
+    radius, sites = coverage_grid(area, terrain, budget=budget)
+    circles = np.arange(N_CIRCLES)
+    offered = np.array([cube[QUANTUM_COLUMNS[band]].to_numpy(dtype=float) if QUANTUM_COLUMNS[band] in cube
+                        else np.zeros(N_CIRCLES) for band in SUB_GHZ_BANDS])
+    value, carrier = sites_saved(offered, sites)
+    best = value.argmax(axis=0)
+    chosen = carrier[best, circles]
+    return pd.DataFrame({
+        'State': CIRCLE_NAMES,
+        'Coverage_Band': np.where(value.max(axis=0) > 0, np.array(SUB_GHZ_BANDS, dtype=object)[best], None),
+        'Carrier_MHz': np.where(value.max(axis=0) > 0, CARRIER_MHZ[chosen], np.nan),
+        'Cell_Radius_km': radius[best, chosen, circles].round(2),
+        'Sites_Needed': sites[best, chosen, circles],
+        'Reference_Sites': sites[-1, chosen, circles],
+        'Coverage_Value': value.max(axis=0).round(3),
+    })
@@ -0,0 +1,213 @@
+"""Shared data layer, page-plugin registry and configuration of the unified dashboard
+
+`spectrum_dashboard.py` is one app in place of the two divergent scripts.
+Pages are plugins: a module registers each page's render function with
+`@page(name)`, and the config file chooses which plugin modules are loaded,
+which pages appear (in nav order) and which bands they cover. Every page
+reads the same `DataLayer`, built once per data version and server process
+from the shared-memory data plane, so rankings, the query engine, the
+validation report and prefetched charts are held once however many pages
+are enabled.
+
+The config is TOML, dashboard.toml next to this file by default or the file
+named by SPECTRUM_DASHBOARD_CONFIG:
+
+    title = "Spectrum Auction Dashboard 2023-24"
+    plugins = ["dashboard_pages"]
+    pages = ["Executive Summary", "Band-wise Analysis", "Strategic Insights"]
+    bands = ["900 MHz", "1800 MHz", "3300 MHz", "26 GHz"]
+    top_n = 10
+
+    [features]
+    prefetch = true
+    validation = true
+
+Keys left out take the defaults below.
+"""
+
+import functools
+import importlib
+import os
+import threading
+import tomllib
+
+import streamlit as st
+
+from capacity import CapacityModel
+from coverage import coverage_value, load_circle_geography
+from data_plane import shared_frames
+from duplex import band_duplex_totals, with_duplex_totals
+from holdings import offered_spectrum
+from ingest import BANDS, band_summary, band_tables, load_block_table, spectrum_by_circle
+from lineage import Lineage
+from prefetch import LOOKAHEAD, Prefetcher
+from query import QueryEngine
+from ranking import RankIndex
+from replay import supply_blocks
+from similarity import CircleSimilarity
+from validation import validate_spectrum_data
+from valuation import load_circle_population, load_reserve_prices, with_valuation
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.environ.get('SPECTRUM_DASHBOARD_CONFIG') or os.path.join(ROOT, 'dashboard.toml')
+
+# Name the tables are published under in the data plane
+DATA_PLANE_NAME = 'spectrum_dashboard'
+
+DEFAULT_CONFIG = {
+    'title': "Spectrum Auction Dashboard 2023-24",
+    'plugins': ['dashboard_pages'],
+    'pages': ["Executive Summary", "Band-wise Analysis", "State-wise Comparison", "Circle Map",
+              "Holdings & Caps", "Ad-hoc Query", "Market Opportunities", "Similar Circles", "Strategic Insights",
+              "Portfolio Frontier",
+              "Auction Replay", "Live Auction"],
+    'bands': BANDS,
+    'top_n': 10,
+    'features': {
+        # Build the Band-wise Analysis views a session is likely to open next in the background
+        'prefetch': True,
+        # Show the ingest cross-check report in the sidebar
+        'validation': True,
+    },
+}
+
+# Registered page plugins: name -> render(data, config, rank_by)
+PAGES = {}
+
+
+def page(name):
+    """Register a page plugin: `render(data, config, rank_by)` draws the page called `name`"""
+    def register(render):
+        PAGES[name] = render
+        return render
+    return register
+
+
+def load_config(path=CONFIG_PATH):
+    """Dashboard config from a TOML file (defaults for missing keys), with its plugin modules loaded
+
+    Raises ValueError for pages no plugin provides and for unknown bands.
+    """
+    config = dict(DEFAULT_CONFIG, features=dict(DEFAULT_CONFIG['features']))
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            settings = tomllib.load(f)
+        config.update({key: value for key, value in settings.items() if key != 'features'})
+        config['features'].update(settings.get('features', {}))
+    for module in config['plugins']:
+        importlib.import_module(module)
+    missing = [name for name in config['pages'] if name not in PAGES]
+    if missing:
+        raise ValueError(f"No plugin provides the page(s) {missing}; loaded plugins: {config['plugins']}")
+    unknown = [band for band in config['bands'] if band not in BANDS]
+    if unknown:
+        raise ValueError(f"Unknown band(s) {unknown}; expected some of {BANDS}")
+    # Bands always appear in frequency order
+    config['bands'] = [band for band in BANDS if band in config['bands']]
+    return config
+
+
+def build_tables():
+    """Base tables, circle cube and workbook block plan, as published to the data plane
+
+    Everything is derived from the auction workbooks: the per-band tables are sums over their block plan.
+    """
+    blocks, totals = load_block_table()
+    df_800, df_900, df_1800, df_high = band_tables(blocks)
+    df_circles = with_valuation(with_duplex_totals(spectrum_by_circle(df_900, df_1800, df_high, df_800=df_800)),
+                                load_reserve_prices(), *load_circle_population())
+    return df_800, df_900, df_1800, df_high, df_circles, blocks, totals
+
+
+# Band-wise Analysis charts: (column, title, colour scale, circles with spectrum only)
+BAND_CHARTS = {
+    "800 MHz": [
+        ('Blocks_800MHz', "800 MHz Blocks by State", 'blues', False),
+        ('Quantum_800MHz', "800 MHz Spectrum Quantum by State", 'greens', False),
+    ],
+    "900 MHz": [
+        ('Blocks_900MHz', "900 MHz Blocks by State", 'oranges', False),
+        ('Quantum_900MHz', "900 MHz Spectrum Quantum by State", 'reds', False),
+    ],
+    "1800 MHz": [
+        ('Blocks_1800MHz', "1800 MHz Blocks by State", 'purples', False),
+        ('Quantum_1800MHz', "1800 MHz Spectrum Quantum by State", 'viridis', False),
+    ],
+    "2100 MHz": [
+        ('2100MHz', "2100 MHz Spectrum by State", 'blues', True),
+    ],
+    "2300 MHz": [
+        ('2300MHz', "2300 MHz Spectrum by State", 'greens', True),
+    ],
+    "2500 MHz": [
+        ('2500MHz', "2500 MHz Spectrum by State", 'reds', True),
+    ],
+    "3300 MHz": [
+        ('3300MHz', "3300 MHz Spectrum by State", 'plasma', False),
+    ],
+    "26 GHz": [
+        ('26GHz', "26 GHz Spectrum by State", 'inferno', True),
+    ],
+}
+
+
+def band_figures(data, view):
+    """Band-wise Analysis charts of one band (built ahead of time by the prefetcher)"""
+    # Imported on first use, so starting a server process does not wait for it
+    import plotly.express as px
+    df = data.band_tables[view[1]]
+    figures = []
+    for column, title, scale, offered_only in BAND_CHARTS[view[1]]:
+        shown = df[df[column] > 0] if offered_only else df
+        fig = px.bar(shown, x='State', y=column, title=title, color=column, color_continuous_scale=scale)
+        fig.update_xaxes(tickangle=45)
+        figures.append(fig)
+    return figures
+
+
+class DataLayer:
+    """Tables and derived artefacts of one data version, shared by every page and session of a process"""
+
+    def __init__(self, version):
+        self.version = version
+        # Attached read-only from shared memory; built and published by the first process to need them
+        (self.df_800, self.df_900, self.df_1800, self.df_high,
+         self.df_circles, self.blocks, self.totals) = shared_frames(DATA_PLANE_NAME, version, build_tables)
+        self.band_tables = {band: self.df_high for band in BANDS}
+        self.band_tables.update({'800 MHz': self.df_800, '900 MHz': self.df_900, '1800 MHz': self.df_1800})
+        summary = band_summary(self.df_900, self.df_1800, self.df_high, df_800=self.df_800)
+        self.validation_report = validate_spectrum_data(summary, self.blocks, self.totals)
+        self.band_totals = band_duplex_totals(summary)
+        self.rankings = RankIndex(self.df_circles, version)
+        self.offered = offered_spectrum(self.blocks)
+        # Workbook file, sheet and rows behind every band x circle value, for drill-downs
+        self.lineage = Lineage(self.blocks)
+        self.supply = supply_blocks(self.blocks)
+        self.coverage = coverage_value(self.df_circles, *load_circle_geography())
+        self.capacity = CapacityModel(self.df_circles)
+        self.similarity = CircleSimilarity(self.df_circles)
+        self.query_engine = QueryEngine(self.df_circles, self.blocks, version)
+        self._prefetchers = {}
+        self._lock = threading.Lock()
+
+    def prefetcher(self, bands, prefetch=True):
+        """Prefetcher of the Band-wise Analysis views of `bands` (building inline only when `prefetch` is off)"""
+        key = (tuple(bands), prefetch)
+        with self._lock:
+            if key not in self._prefetchers:
+                self._prefetchers[key] = Prefetcher(functools.partial(band_figures, self),
+                                                    [("Band-wise Analysis", band) for band in bands],
+                                                    lookahead=LOOKAHEAD if prefetch else 0)
+            return self._prefetchers[key]
+
+
+@st.cache_resource(max_entries=1)
+def load_data_layer(version):
+    """The data layer of a data version, built once per server process"""
+    return DataLayer(version)
+
+
+def visit(prefetcher, view):
+    """Record the view this session is on and prefetch the views likely to follow"""
+    prefetcher.visit(st.session_state.get('view'), view)
+    st.session_state['view'] = view
@@ -0,0 +1,977 @@
+"""Page plugins of the unified dashboard
+
+Each page is a render function registered with `dashboard.page`; it draws
+into the main area from the shared `DataLayer`, the dashboard config and the
+session's sidebar ranking. Pages cover the configured bands only.
+
+plotly.express is imported where a chart is built rather than up front,
+so a new server process paints its first page without it; figures that
+depend on the data version alone are built once per version and shared.
+"""
+
+import io
+import time
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+import streamlit.components.v1 as components
+
+from capacity import CapacityParameters, MID_BAND_TECHNOLOGIES, TDD_DOWNLINK_SHARE, TDD_DOWNLINK_SHARES
+from circles import CIRCLE_NAMES, circle_groups, circle_ids
+from coverage import coverage_grid, load_circle_geography
+from dashboard import load_data_layer, page, visit
+from duplex import occupied_mhz
+from geo import circle_map_figure
+from holdings import SPECTRUM_CAPS, cap_headroom, holdings_overlay, holdings_template, load_holdings, max_acquirable
+from ingest import BANDS, BLOCK_COLUMNS, BLOCK_SIZE_MHZ, QUANTUM_COLUMNS
+from live import LIVE_REFRESH_SECONDS, LiveAuction
+from portfolio import PortfolioSet
+from query import EXAMPLES, QueryError, describe
+from replay import Replay, load_round_log, round_log_template
+from similarity import N_CLUSTERS
+from valuation import RANK_BY, load_reserve_prices, top_circles
+
+# Executive Summary note under each band's total
+BAND_ROLES = {
+    "800 MHz": "Coverage",
+    "900 MHz": "High Demand",
+    "1800 MHz": "LTE Primary",
+    "2100 MHz": "3G/LTE",
+    "2300 MHz": "LTE TDD",
+    "2500 MHz": "Broadband",
+    "3300 MHz": "5G",
+    "26 GHz": "mmWave 5G",
+}
+
+# State-wise Comparison bar colour per band
+BAND_COLORS = {
+    "800 MHz": '#FF6B6B',
+    "900 MHz": '#4ECDC4',
+    "1800 MHz": '#45B7D1',
+    "2100 MHz": '#96CEB4',
+    "2300 MHz": '#FECA57',
+    "2500 MHz": '#FF9FF3',
+    "3300 MHz": '#54A0FF',
+    "26 GHz": '#5F27CD',
+}
+
+QUERY_HELP = """
+Queries read `circles` (one row per circle, every band side by side) or `blocks` (one row per workbook block):
+
+    circles where Contiguous_1800MHz >= 10 and 3300MHz >= 50 order by 3300MHz desc
+    blocks where Band = '900 MHz' group by State select count(*) as Blocks, sum(Quantum_MHz) as MHz
+
+Clauses, in order: `where`, `group by`, `select`, `order by ... [asc|desc]`, `limit`. Conditions use
+comparisons, `in (...)`, arithmetic, `and`/`or`/`not` and brackets; aggregates are count, sum, min,
+max and mean. `Contiguous_*` is the widest run of adjacent blocks and `Offered_*` the MHz on offer.
+"""
+
+
+def capacity_assumptions():
+    """Capacity-model assumptions chosen on the page, as CapacityParameters and a label for them"""
+    with st.expander("Capacity Assumptions"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            technology = st.selectbox("Mid-band Technology", MID_BAND_TECHNOLOGIES,
+                                      help="Technology on 1800-2500 MHz; 3300 MHz and 26 GHz are always NR")
+
+        with col2:
+            share = st.select_slider("TDD Downlink Share", options=TDD_DOWNLINK_SHARES, value=TDD_DOWNLINK_SHARE)
+
+        st.caption("Downlink throughput per cell: MHz (times the downlink share for TDD bands) times "
+                   "the technology's spectral efficiency.")
+    return CapacityParameters(technology, share), f"{technology}, TDD DL {share:g}"
+
+
+def source_rows(data, bands, circles=None, cube_mhz=None):
+    """Drill-down from a figure to the workbook file, sheet and row ranges of the blocks behind it"""
+    trace = data.lineage.trace(bands, circles)
+    if trace.empty:
+        st.info("No workbook blocks behind this figure.")
+        return
+
+    summary = (f"{trace['Blocks'].sum()} blocks, {trace['Quantum_MHz'].sum():g} MHz in {len(trace)} row "
+               f"range(s) of {trace['Sheet'].nunique()} sheet(s)")
+    if cube_mhz is not None:
+        summary += f" · dashboard figure: {cube_mhz:g} MHz"
+    st.caption(summary)
+    st.dataframe(trace, use_container_width=True, hide_index=True)
+    st.download_button("Download Source Rows", data.lineage.rows(bands, circles).to_csv(index=False),
+                       file_name="source_rows.csv", mime="text/csv", key=f"source_rows_{bands}_{circles}")
+
+
+def selected_points(event):
+    """Points picked on a chart drawn with `on_select`"""
+    return event.selection.points if event else []
+
+
+def short_label(band):
+    """Compact band label used in metric and column names, e.g. '900MHz'"""
+    return band.replace(' ', '')
+
+
+def decimals(band):
+    """Decimal places a band's totals need: those of its block size"""
+    return len(f'{BLOCK_SIZE_MHZ[band]:g}'.partition('.')[2])
+
+
+@st.cache_resource(max_entries=4)
+def band_total_figures(version, bands):
+    """Executive Summary charts of the configured bands, built once per data version"""
+    import plotly.express as px
+    band_totals = load_data_layer(version).band_totals
+    df_bands = band_totals[band_totals['Band'].isin(bands)]
+
+    fig_bands = px.bar(df_bands, x='Band', y='Occupied_MHz',
+                      title="Total Spectrum Available by Frequency Band (UL + DL)",
+                      color='Duplex',
+                      hover_data=['Paired_MHz', 'Unpaired_MHz'])
+    fig_bands.update_layout(height=400)
+
+    fig_pie = px.pie(df_bands, values='Occupied_MHz', names='Band',
+                    title="Spectrum Distribution")
+    fig_pie.update_layout(height=400)
+    return fig_bands, fig_pie
+
+
+@page("Executive Summary")
+def executive_summary(data, config, rank_by):
+    st.header("📈 Executive Summary")
+
+    # Key metrics, two bands per column
+    bands = config['bands']
+    columns = st.columns(max((len(bands) + 1) // 2, 1))
+    for i, band in enumerate(bands):
+        with columns[i // 2]:
+            total = data.df_circles[QUANTUM_COLUMNS[band]].sum()
+            st.metric(f"Total {short_label(band)} Spectrum", f"{total:.{decimals(band)}f} MHz", BAND_ROLES[band])
+
+    with st.expander("🔎 Trace a Metric to the Workbooks"):
+        labels = [f"Total {short_label(band)} Spectrum" for band in bands]
+        traced = bands[labels.index(st.selectbox("Trace Metric", labels))]
+        source_rows(data, [traced], cube_mhz=round(data.df_circles[QUANTUM_COLUMNS[traced]].sum(), 4))
+
+    st.markdown("---")
+
+    # Total spectrum by band
+    st.subheader("📊 Total Spectrum Available by Band")
+
+    # Paired bands occupy their quantum twice (uplink + downlink), so compare occupied MHz
+    df_bands = data.band_totals[data.band_totals['Band'].isin(bands)]
+    fig_bands, fig_pie = band_total_figures(data.version, tuple(bands))
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        bars = st.plotly_chart(fig_bands, use_container_width=True, on_select='rerun', selection_mode='points',
+                               key='band_totals')
+
+    with col2:
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+    st.caption(f"Paired (FDD): 2 × {df_bands['Paired_MHz'].sum():.2f} MHz · "
+               f"Unpaired (TDD): {df_bands['Unpaired_MHz'].sum():.0f} MHz · "
+               f"Occupied: {df_bands['Occupied_MHz'].sum():.2f} MHz")
+
+    picked = [point['x'] for point in selected_points(bars)]
+    if picked:
+        st.markdown(f"**Source rows of {', '.join(picked)}**")
+        source_rows(data, picked)
+    else:
+        st.caption("Click a bar to trace it to its workbook rows.")
+
+    # Reserve-price valuation (data/reserve_prices.csv and data/circle_population.csv)
+    st.subheader("💰 Circle Ranking by Value")
+
+    _, rank_column, ascending = RANK_BY[rank_by]
+    value_table = data.df_circles[['State', 'Occupied_MHz', 'Outlay_Cr', 'Cr_per_MHz', 'Rs_per_MHz_pop', 'Rs_per_MHz_sub']]
+    if value_table['Outlay_Cr'].isna().all():
+        st.info("No reserve prices loaded: fill in data/reserve_prices.csv and data/circle_population.csv "
+                "to rank circles by outlay and ₹ per MHz-pop.")
+        return
+    value_table = value_table.sort_values(rank_column, ascending=ascending, kind='stable', na_position='last')
+    value_table.columns = ['State', 'Occupied (MHz)', 'Reserve Outlay (₹ Cr)', '₹ Cr per MHz',
+                           '₹ per MHz-pop', '₹ per MHz-sub']
+    # Without populations the per MHz-pop and per MHz-sub columns stay empty
+    st.dataframe(value_table.head(10).dropna(axis=1, how='all'), use_container_width=True, hide_index=True)
+
+
+@page("Band-wise Analysis")
+def band_analysis(data, config, rank_by):
+    st.header("📡 Band-wise Spectrum Analysis")
+
+    prefetcher = data.prefetcher(config['bands'], config['features']['prefetch'])
+
+    @st.fragment
+    def band_view():
+        """Band selector and its charts; reruns on its own when the band changes"""
+        selected_band = st.selectbox("Select Frequency Band for Analysis", config['bands'])
+
+        # Charts for the band, usually prefetched while the previous band was on screen
+        visit(prefetcher, ("Band-wise Analysis", selected_band))
+        band_charts = prefetcher.get(("Band-wise Analysis", selected_band))
+
+        st.subheader(f"{selected_band} Band Analysis")
+
+        df = data.band_tables[selected_band]
+        quantum = QUANTUM_COLUMNS[selected_band]
+        col1, col2 = st.columns(2)
+
+        picked = []
+        if selected_band in BLOCK_COLUMNS:
+            # Blocks and quantum side by side
+            with col1:
+                picked += selected_points(st.plotly_chart(band_charts[0], use_container_width=True, on_select='rerun',
+                                                          selection_mode='points', key=f'blocks_{selected_band}'))
+
+            with col2:
+                picked += selected_points(st.plotly_chart(band_charts[1], use_container_width=True, on_select='rerun',
+                                                          selection_mode='points', key=f'quantum_{selected_band}'))
+
+            columns = ['State', BLOCK_COLUMNS[selected_band], quantum]
+        else:
+            # Circles with spectrum in the band
+            df_offered = df[df[quantum] > 0]
+
+            with col1:
+                if not df_offered.empty:
+                    picked += selected_points(st.plotly_chart(band_charts[0], use_container_width=True, on_select='rerun',
+                                                              selection_mode='points', key=f'quantum_{selected_band}'))
+                else:
+                    st.write("No visualization available - limited state coverage")
+
+            with col2:
+                # Summary statistics
+                st.subheader(f"{selected_band} Summary")
+                st.metric(f"Total {selected_band} Spectrum", f"{df[quantum].sum()} MHz")
+                st.metric(f"States with {selected_band}", f"{len(df_offered)}")
+                if not df_offered.empty:
+                    st.metric("Average per State", f"{df_offered[quantum].mean():.1f} MHz")
+
+            df = df_offered
+            columns = ['State', quantum]
+
+        # Bars picked on either chart, traced to their workbook rows
+        states = list(dict.fromkeys(point['x'] for point in picked))
+        if states:
+            st.markdown(f"**Source rows of {selected_band} in {', '.join(states)}**")
+            source_rows(data, [selected_band], circle_ids(states),
+                        cube_mhz=round(df.loc[df['State'].isin(states), quantum].sum(), 4))
+        else:
+            st.caption("Click a bar to trace it to its workbook rows.")
+
+        # Top opportunities
+        st.subheader(f"Top {selected_band} Opportunities")
+        if not df.empty:
+            top = top_circles(df, selected_band, config['top_n'], rank_by, data.rankings, columns)
+            st.dataframe(top, use_container_width=True)
+        else:
+            st.write(f"No states have {selected_band} spectrum available.")
+
+    band_view()
+
+
+@page("State-wise Comparison")
+def state_comparison(data, config, rank_by):
+    import plotly.express as px
+
+    st.header("🗺️ State-wise Spectrum Comparison")
+
+    bands = config['bands']
+
+    @st.fragment
+    def state_view():
+        """State selector and comparison; reruns on its own when the selection changes"""
+        selected_states = st.multiselect("Select States for Comparison", CIRCLE_NAMES, default=[])
+
+        if not selected_states:
+            st.info("Please select states to compare their spectrum allocations.")
+            return
+
+        # Select the circles by integer key (bands a circle lacks are already 0)
+        df_comparison = data.df_circles.iloc[circle_ids(selected_states)].reset_index(drop=True)
+
+        # Stacked bar chart over the configured bands
+        fig_stacked = go.Figure()
+        for band in bands:
+            fig_stacked.add_trace(go.Bar(
+                name=short_label(band),
+                x=df_comparison['State'],
+                y=df_comparison[QUANTUM_COLUMNS[band]],
+                marker_color=BAND_COLORS[band]
+            ))
+        fig_stacked.update_layout(
+            barmode='stack',
+            title='Total Spectrum Comparison by State',
+            xaxis_title='State',
+            yaxis_title='Spectrum (MHz)',
+            height=500
+        )
+        bars = st.plotly_chart(fig_stacked, use_container_width=True, on_select='rerun', selection_mode='points',
+                               key='state_bands')
+
+        # Each trace is one band, so a picked bar is a band in a circle
+        picked = selected_points(bars)
+        if picked:
+            for band in dict.fromkeys(bands[point['curve_number']] for point in picked):
+                states = [point['x'] for point in picked if bands[point['curve_number']] == band]
+                st.markdown(f"**Source rows of {band} in {', '.join(states)}**")
+                source_rows(data, [band], circle_ids(states))
+        else:
+            st.caption("Click a bar segment to trace it to its workbook rows.")
+
+        # Detailed comparison table
+        st.subheader("Detailed Spectrum Comparison")
+
+        comparison_table = df_comparison[['State'] + [QUANTUM_COLUMNS[band] for band in bands]]
+        comparison_table.columns = ['State'] + bands
+        # Total excluding 26 GHz for readability; paired bands count UL + DL
+        comparison_table['Total (MHz)'] = occupied_mhz(df_comparison, [band for band in bands if band != "26 GHz"])
+        st.dataframe(comparison_table, use_container_width=True)
+
+        # Market share analysis
+        st.subheader("Market Share Analysis")
+
+        total_available = comparison_table['Total (MHz)'].sum()
+        if total_available > 0:
+            comparison_table['Market Share %'] = (comparison_table['Total (MHz)'] / total_available * 100).round(2)
+
+            fig_pie_states = px.pie(comparison_table, values='Total (MHz)', names='State',
+                                   title="Market Share Among Selected States (Excluding 26 GHz)")
+            st.plotly_chart(fig_pie_states, use_container_width=True)
+
+    state_view()
+
+
+@page("Circle Map")
+def circle_map(data, config, rank_by):
+    st.header("🗺️ Circle Map")
+
+    @st.fragment
+    def map_view():
+        """Band selector and the map; reruns on its own when the band changes"""
+        map_band = st.selectbox("Select Frequency Band to Map", config['bands'])
+
+        # Outlines are cached once; only the values change per band. Circles without the band are missing, not 0 MHz
+        available = data.df_circles[QUANTUM_COLUMNS[map_band]].to_numpy(dtype=float)
+        fig_map = circle_map_figure(np.where(available > 0, available, np.nan),
+                                    title=f"{map_band} Spectrum Available by Circle")
+        st.plotly_chart(fig_map, use_container_width=True)
+        st.caption("Schematic tile map: one hexagon tile per telecom circle, laid out in a grid, not its "
+                   "boundary or location. Grey tiles have none of the band on offer.")
+
+    map_view()
+
+
+@page("Holdings & Caps")
+def holdings_caps(data, config, rank_by):
+    st.header("🧾 Holdings & Spectrum Caps")
+
+    offered = data.offered
+
+    @st.fragment
+    def holdings_view():
+        """Holdings upload and cap check; reruns on its own when the file or band changes"""
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            holdings_file = st.file_uploader("Upload Holdings (CSV or Parquet)", type=['csv', 'parquet'])
+
+        with col2:
+            st.download_button("Download Template", holdings_template().to_csv(index=False),
+                               file_name="holdings_template.csv", mime="text/csv")
+
+        if holdings_file is None:
+            st.info("Upload current holdings per circle and band (Circle, Band, Held_MHz and optionally "
+                    "Assigned_MHz for all operators). Until then no existing holdings are assumed.")
+            held = assigned = np.zeros_like(offered)
+        else:
+            try:
+                held, assigned = load_holdings(holdings_file)
+            except (ValueError, ImportError) as e:
+                st.error(f"Could not read the holdings file: {e}")
+                return
+
+        # Cap-limited maximum per band and circle, vectorized over the whole block plan
+        overlay = holdings_overlay(held, assigned, offered, bands=config['bands'])
+        headroom = cap_headroom(held, assigned, offered, np.zeros_like(offered))[0]
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Circles Within All Caps Today", f"{int((headroom >= 0).all(axis=0).sum())} / {headroom.shape[1]}")
+
+        with col2:
+            offered_pairs = overlay['Offered_MHz'] > 0
+            st.metric("Full Offers Within Caps", f"{int(overlay['Full_Offer_Compliant'][offered_pairs].sum())} / {int(offered_pairs.sum())}",
+                      "Band x circle")
+
+        with col3:
+            st.metric("Max Acquirable Spectrum", f"{overlay['Max_Acquirable_MHz'].sum():.1f} MHz",
+                      f"of {overlay['Offered_MHz'].sum():.1f} MHz offered")
+
+        cap_band = st.selectbox("Select Band to Check", config['bands'])
+        df_band = overlay[overlay['Band'] == cap_band]
+
+        fig_caps = go.Figure()
+        fig_caps.add_trace(go.Bar(name='Held', x=df_band['Circle'], y=df_band['Held_MHz']))
+        fig_caps.add_trace(go.Bar(name='Offered', x=df_band['Circle'], y=df_band['Offered_MHz']))
+        fig_caps.add_trace(go.Bar(name='Max Acquirable (cap-limited)', x=df_band['Circle'], y=df_band['Max_Acquirable_MHz']))
+        fig_caps.update_layout(barmode='group', title=f"{cap_band}: Holdings, Offer and Cap Headroom by Circle",
+                               yaxis_title='Spectrum (MHz)', height=500)
+        fig_caps.update_xaxes(tickangle=45)
+        st.plotly_chart(fig_caps, use_container_width=True)
+
+        st.subheader("Cap Headroom by Circle (Occupied MHz)")
+        df_headroom = pd.DataFrame(headroom.T.round(2), columns=list(SPECTRUM_CAPS))
+        df_headroom.insert(0, 'Circle', CIRCLE_NAMES)
+        st.dataframe(df_headroom, use_container_width=True, hide_index=True)
+        st.caption("Caps are shares of the spectrum pooled per band group (assigned plus on offer); "
+                   "paired bands count uplink and downlink.")
+
+    holdings_view()
+
+
+@page("Ad-hoc Query")
+def adhoc_query(data, config, rank_by):
+    st.header("🔎 Ad-hoc Query")
+
+    query_engine = data.query_engine
+
+    @st.fragment
+    def query_view():
+        """Query editor and results; reruns on its own when the query changes"""
+        example = st.selectbox("Start From an Example", list(EXAMPLES))
+        text = st.text_area("Query", EXAMPLES[example], height=120)
+
+        try:
+            result = query_engine.run(text)
+        except QueryError as e:
+            st.error(str(e))
+            return
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("Rows", len(result.frame))
+
+        with col2:
+            st.metric("Query Time", f"{result.elapsed_ms:.1f} ms", "cached" if result.cached else None)
+
+        with col3:
+            st.metric("Rows Scanned", result.rows_scanned)
+
+        st.dataframe(result.frame, use_container_width=True, hide_index=True)
+        st.download_button("Download Results", result.frame.to_csv(index=False),
+                           file_name="query_results.csv", mime="text/csv")
+
+        with st.expander("Query Language"):
+            st.markdown(QUERY_HELP)
+            st.dataframe(describe(query_engine), use_container_width=True, hide_index=True)
+
+    query_view()
+
+
+@page("Market Opportunities")
+def market_opportunities(data, config, rank_by):
+    import plotly.express as px
+
+    st.header("💼 Market Opportunities Analysis")
+
+    rankings = data.rankings
+
+    parameters, assumptions = capacity_assumptions()
+    throughput = data.capacity.throughput(*parameters)
+
+    # Calculate opportunity scores
+    st.subheader("Opportunity Scoring Matrix")
+
+    # Every circle, all bands side by side, with the coverage model's estimates
+    df_opportunities = data.df_circles.copy()
+    coverage = data.coverage
+    for column in ['Coverage_Band', 'Cell_Radius_km', 'Sites_Needed']:
+        df_opportunities[column] = coverage[column].to_numpy()
+    for column in ['Throughput_1800MHz', 'Throughput_3300MHz']:
+        df_opportunities[column] = throughput[column].to_numpy()
+
+    # Calculate opportunity scores (normalized)
+    df_opportunities['Coverage_Score'] = coverage['Coverage_Value'].to_numpy()  # Thousand sites saved by 800/900 MHz
+    df_opportunities['Capacity_Score'] = throughput['Capacity_Mbps'].to_numpy() / 1000  # Mid-band Gbps per cell
+    df_opportunities['Future_Score'] = throughput['Future_Mbps'].to_numpy() / 1000  # 26 GHz Gbps per cell
+    # Each score relative to the best circle, so the units do not weigh in the total
+    scores = df_opportunities[['Coverage_Score', 'Capacity_Score', 'Future_Score']]
+    df_opportunities['Total_Score'] = (scores / scores.max().replace(0, 1)).mean(axis=1)
+
+    # Opportunity matrix
+    fig_opportunity = px.scatter(df_opportunities, x='Coverage_Score', y='Capacity_Score',
+                               size='Future_Score', color='Total_Score',
+                               hover_name='State',
+                               title="Market Opportunity Matrix",
+                               labels={'Coverage_Score': 'Coverage Value (k sites saved, 800/900 MHz)',
+                                      'Capacity_Score': 'Capacity (Gbps per cell, 1800-3300 MHz)',
+                                      'Future_Score': '26 GHz Capacity (Gbps per cell)'})
+
+    st.plotly_chart(fig_opportunity, use_container_width=True)
+    st.caption("Coverage value: thousands of sites the circle's 800/900 MHz offer saves against covering the "
+               "same area at 1800 MHz (Hata path loss per terrain class, data/circle_geography.csv).")
+
+    # Top opportunities
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("🎯 Top Coverage Opportunities")
+        top_coverage = rankings.top_rows(df_opportunities, 'Coverage_Score', 5)[['State', 'Coverage_Score', 'Coverage_Band',
+                                                                                 'Cell_Radius_km', 'Sites_Needed']]
+        st.dataframe(top_coverage, use_container_width=True)
+
+    with col2:
+        st.subheader("🚀 Top Capacity Opportunities")
+        top_capacity = rankings.top_rows(df_opportunities, f'Capacity_Score ({assumptions})', 5, column='Capacity_Score')[
+            ['State', 'Capacity_Score', 'Throughput_1800MHz', 'Throughput_3300MHz']]
+        st.dataframe(top_capacity, use_container_width=True)
+
+    # Investment recommendations
+    st.subheader("💡 Investment Recommendations")
+
+    total_score_q3 = rankings.threshold(rankings.register(f'Total_Score ({assumptions})', df_opportunities, 'Total_Score'), 0.75)
+    high_value_states = df_opportunities[df_opportunities['Total_Score'] > total_score_q3]
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**High Priority States:**")
+        for state in high_value_states['State'].tolist():
+            st.write(f"• {state}")
+
+    with col2:
+        st.markdown("**Strategic Focus Areas:**")
+        st.write("• Prioritize 800/900 MHz for coverage")
+        st.write("• Target 3300 MHz for 5G capacity")
+        st.write("• Consider 26 GHz for future readiness")
+        st.write("• Focus on high-scoring states first")
+
+
+@page("Similar Circles")
+def similar_circles(data, config, rank_by):
+    st.header("🧭 Similar Circles")
+
+    similarity = data.similarity
+    bands = tuple(config['bands'])
+    circles = list(similarity.circles)
+    st.caption("Circles compared by the MHz on offer in each band, every band scaled by its largest circle. "
+               "Cosine compares the mix of bands; Euclidean the mix and the amounts.")
+
+    @st.fragment
+    def similar_view():
+        """Neighbours, matrix and clusters; reruns on its own when the references or settings change"""
+        col1, col2, col3 = st.columns([3, 1, 1])
+
+        with col1:
+            references = st.multiselect("Reference Circles", circles,
+                                        default=[circle for circle in ["Karnataka"] if circle in circles])
+
+        with col2:
+            metric = st.selectbox("Similarity", ["Cosine", "Euclidean"]).lower()
+
+        with col3:
+            n_clusters = st.select_slider("Clusters", options=list(range(2, 9)), value=N_CLUSTERS)
+
+        if references:
+            st.subheader(f"Circles Most Like {', '.join(references)}")
+            table = similarity.similar_to(references, config['top_n'], metric, bands, n_clusters)
+            st.dataframe(table, use_container_width=True, hide_index=True)
+        else:
+            st.info("Pick one or more reference circles, such as circles already won, to find the ones like them.")
+
+        # Circles of a cluster side by side, so the clusters show as blocks on the diagonal
+        labels = similarity.clusters(n_clusters, bands)
+        order = np.lexsort((similarity.circles, labels))
+        matrix = similarity.matrix(metric, bands).iloc[order, order]
+        fig = go.Figure(go.Heatmap(z=matrix.to_numpy().round(3), x=matrix.columns, y=matrix.index,
+                                   colorscale='Viridis', zmin=0, zmax=1, colorbar_title='Similarity'))
+        fig.update_layout(title=f"{metric.title()} Similarity, Circles Grouped by Cluster", height=650)
+        fig.update_xaxes(tickangle=45)
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.subheader("🧩 Clusters")
+        st.dataframe(similarity.describe_clusters(n_clusters, bands), use_container_width=True, hide_index=True)
+
+    similar_view()
+
+
+@page("Strategic Insights")
+def strategic_insights(data, config, rank_by):
+    import plotly.express as px
+
+    st.header("🎯 Strategic Insights & Recommendations")
+
+    rankings = data.rankings
+
+    # Portfolio optimization
+    st.subheader("📊 Portfolio Optimization Analysis")
+
+    @st.fragment
+    def investment_scenarios():
+        """Scenario selector and ranking; reruns on its own when the scenario changes"""
+        # Calculate total investment scenarios
+        df_strategy = data.df_circles.copy()
+        df_strategy['Coverage_Value'] = data.coverage['Coverage_Value'].to_numpy()
+
+        # Scenario analysis
+        st.subheader("📈 Investment Scenarios")
+
+        scenario = st.selectbox("Select Investment Strategy",
+                               ["Conservative (Coverage Focus)",
+                                "Balanced Portfolio",
+                                "Aggressive (5G Focus)",
+                                "Future-Ready (High Bands)"])
+
+        groups = circle_groups()
+        group = st.selectbox("Circles to Rank", list(groups))
+
+        parameters, assumptions = capacity_assumptions()
+        throughput = data.capacity.throughput(*parameters)
+        for column in ['Capacity_Mbps', 'Throughput_1800MHz', 'Throughput_3300MHz', 'Throughput_26GHz']:
+            df_strategy[column] = throughput[column].to_numpy()
+
+        if scenario == "Conservative (Coverage Focus)":
+            df_strategy['Priority_Score'] = df_strategy['Coverage_Value']  # Sites saved by 800/900 MHz
+            focus_bands = "800 MHz & 900 MHz"
+            strategy_desc = "Focus on coverage and rural penetration"
+
+        elif scenario == "Balanced Portfolio":
+            # Coverage and capacity each relative to the best circle, as a 0-100 index
+            df_strategy['Priority_Score'] = 100 * (df_strategy['Coverage_Value'] / df_strategy['Coverage_Value'].max() * 0.4 +
+                                                   df_strategy['Capacity_Mbps'] / df_strategy['Capacity_Mbps'].max() * 0.6)
+            focus_bands = "800/900 MHz & 1800-3300 MHz"
+            strategy_desc = "Balanced coverage and capacity"
+
+        elif scenario == "Aggressive (5G Focus)":
+            # Downlink Mbps per cell
+            df_strategy['Priority_Score'] = (df_strategy['Throughput_1800MHz'] * 0.4 +
+                                           df_strategy['Throughput_3300MHz'] * 0.6)
+            focus_bands = "1800 MHz & 3300 MHz"
+            strategy_desc = "5G deployment and urban capacity"
+
+        else:  # Future-Ready
+            # Downlink Mbps per cell
+            df_strategy['Priority_Score'] = (df_strategy['Throughput_3300MHz'] * 0.4 +
+                                           df_strategy['Throughput_26GHz'] * 0.6)
+            focus_bands = "3300 MHz & 26 GHz"
+            strategy_desc = "Future 5G advanced services"
+
+        # Ranked once per scenario and data version, then served from the cached order (restricted to the group)
+        top_strategy = rankings.top_rows(df_strategy, f"Priority_Score ({scenario}; {assumptions})", 10, column='Priority_Score',
+                                         among=circle_ids(groups[group]))
+        df_strategy = df_strategy[df_strategy['State'].isin(groups[group])]
+
+        # Display strategy results
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            fig_strategy = px.bar(top_strategy,
+                                 x='State', y='Priority_Score',
+                                 title=f"Top States for {scenario} Strategy"
+                                       + ("" if group == "All Circles" else f" ({group})"),
+                                 color='Priority_Score',
+                                 color_continuous_scale='viridis')
+            fig_strategy.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_strategy, use_container_width=True)
+
+        with col2:
+            st.markdown(f"""
+            **Strategy Details:**
+            - **Focus Bands:** {focus_bands}
+            - **Objective:** {strategy_desc}
+            - **Top State:** {top_strategy['State'].iloc[0]}
+            - **Score Range:** {df_strategy['Priority_Score'].min():.1f} - {df_strategy['Priority_Score'].max():.1f}
+            """)
+
+    investment_scenarios()
+
+    # Risk analysis
+    st.subheader("⚠️ Risk Assessment")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        **High Competition Risk:**
+        - Delhi (limited spectrum)
+        - Mumbai (high demand)
+        - Bangalore markets
+        """)
+
+    with col2:
+        st.markdown("""
+        **Medium Risk:**
+        - Tier-1 cities
+        - High growth states
+        - Industrial hubs
+        """)
+
+    with col3:
+        st.markdown("""
+        **Low Risk:**
+        - Rural-focused circles
+        - Northeastern states
+        - Niche frequency bands
+        """)
+
+    # Final recommendations
+    st.subheader("🏆 Final Strategic Recommendations")
+
+    recommendations = """
+    ## Key Recommendations for Spectrum Auction Strategy:
+
+    ### 1. **Priority Bands by Use Case**
+    - **Coverage Extension**: Focus on 900 MHz in rural areas
+    - **Urban Capacity**: Target 1800/2100 MHz in metro circles
+    - **5G Deployment**: Secure 3300 MHz for immediate 5G rollout
+    - **Future Readiness**: Consider 26 GHz for advanced 5G services
+
+    ### 2. **Geographic Strategy**
+    - **Tier-1 Markets**: Balanced portfolio across all bands
+    - **Tier-2 Cities**: Focus on 1800/3300 MHz for growth
+    - **Rural Areas**: Prioritize 900 MHz for coverage
+
+    ### 3. **Budget Allocation Guidelines**
+    - **30%**: Low bands (900 MHz) for coverage
+    - **40%**: Mid bands (1800/2100 MHz) for capacity
+    - **25%**: 3300 MHz for 5G
+    - **5%**: 26 GHz for future readiness
+
+    ### 4. **Risk Mitigation**
+    - Diversify across multiple bands and circles
+    - Avoid over-concentration in high-competition areas
+    - Maintain strategic reserves for opportunistic bidding
+
+    ### 5. **Timeline Considerations**
+    - **Immediate (0-6 months)**: Deploy acquired 1800/3300 MHz
+    - **Short-term (6-18 months)**: Roll out 5G services
+    - **Medium-term (1-3 years)**: Optimize network with all bands
+    - **Long-term (3+ years)**: Leverage 26 GHz for advanced services
+    """
+
+    st.markdown(recommendations)
+
+
+@st.cache_resource(max_entries=8)
+def load_replay(content, name, version):
+    """Replay of an uploaded round log against the block plan, built once per file and data version"""
+    return Replay(load_round_log(io.BytesIO(content), name), load_data_layer(version).supply)
+
+
+@page("Auction Replay")
+def auction_replay(data, config, rank_by):
+    import plotly.express as px
+
+    st.header("⏱️ Auction Replay")
+
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        log_file = st.file_uploader("Upload Round Log (CSV or JSON)", type=['csv', 'json', 'jsonl'])
+
+    with col2:
+        st.download_button("Download Template", round_log_template(data.supply).to_csv(index=False),
+                           file_name="round_log_template.csv", mime="text/csv")
+
+    if log_file is None:
+        st.info("Upload the published round-by-round results (Round, Circle, Band, Bidder, Demand_Blocks "
+                "and Price_Cr per block) to replay provisional winners, prices and excess demand.")
+        return
+
+    try:
+        replay = load_replay(log_file.getvalue(), log_file.name, data.version)
+    except (ValueError, KeyError) as e:
+        st.error(f"Could not read the round log: {e}")
+        return
+
+    rounds = replay.rounds.tolist()
+    bands = [band for band in config['bands'] if replay.supply[BANDS.index(band)].any()]
+
+    @st.fragment
+    def replay_view():
+        """Round scrubber and the state of the chosen band; reruns on its own when either changes"""
+        round_number = st.select_slider("Round", options=rounds, value=rounds[-1])
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            band = st.selectbox("Select Band", bands)
+
+        with col2:
+            our_bidder = st.selectbox("Our Bidder (excluded from competitor demand)", ["None"] + replay.bidders)
+
+        # Restored from the nearest checkpoint, so any round is as quick to reach as the next one
+        started = time.perf_counter()
+        state = replay.state(round_number)
+        jump_ms = (time.perf_counter() - started) * 1000
+        table = replay.frame(state, band, None if our_bidder == "None" else our_bidder)
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Round", f"{round_number} of {rounds[-1]}")
+
+        with col2:
+            st.metric("Cells With Excess Demand", int((state.excess > 0).sum()))
+
+        with col3:
+            st.metric("Excess Demand", f"{np.clip(state.excess, 0, None).sum():.0f} blocks")
+
+        with col4:
+            st.metric("Jump Time", f"{jump_ms:.2f} ms")
+
+        fig_history = px.line(replay.history, x='Round', y='Excess_Demand',
+                              title="Excess Demand by Round (All Bands)")
+        fig_history.add_vline(x=round_number, line_dash='dash', line_color='#d62728')
+        st.plotly_chart(fig_history, use_container_width=True)
+
+        fig_band = go.Figure()
+        fig_band.add_trace(go.Bar(name='Competitor Demand', x=table['Circle'], y=table['Competitor_Demand']))
+        fig_band.add_trace(go.Bar(name='Our Demand', x=table['Circle'],
+                                  y=table['Demand_Blocks'] - table['Competitor_Demand']))
+        fig_band.add_trace(go.Scatter(name='Blocks on Offer', x=table['Circle'], y=table['Supply_Blocks'],
+                                      mode='markers', marker_symbol='line-ew-open', marker_size=24))
+        fig_band.update_layout(barmode='stack', title=f"{band}: Demand Against Supply in Round {round_number}",
+                               yaxis_title='Blocks', height=450)
+        fig_band.update_xaxes(tickangle=45)
+        st.plotly_chart(fig_band, use_container_width=True)
+
+        st.subheader("Provisional Results by Circle")
+        st.dataframe(table.drop(columns='Band'), use_container_width=True, hide_index=True)
+
+    replay_view()
+
+
+@st.cache_resource(max_entries=1)
+def load_live_auction(version):
+    """The live auction of a data version, with its feeds running in the one server process that holds the port"""
+    return LiveAuction(load_data_layer(version).supply).start()
+
+
+@page("Live Auction")
+def live_auction(data, config, rank_by):
+    st.header("🔴 Live Auction")
+
+    auction = load_live_auction(data.version)
+    st.caption(f"Round deltas are read from files dropped into {auction.directory} and from lines sent to "
+               f"127.0.0.1:{auction.port} (python live.py drop|send FILE). The view below updates on its own, "
+               f"without rerunning the page.")
+    if not st.get_option('server.enableStaticServing'):
+        st.error("The live view needs static file serving: set enableStaticServing = true under [server] "
+                 "in .streamlit/config.toml.")
+        return
+
+    bands = [band for band in config['bands'] if auction.supply[BANDS.index(band)].any()]
+    band = st.selectbox("Select Band", bands)
+    # Polls the snapshot every LIVE_REFRESH_SECONDS and redraws in the browser (see live.py)
+    base = st.get_option('server.baseUrlPath').strip('/')
+    query = urllib.parse.urlencode({'band': band, 'refresh': LIVE_REFRESH_SECONDS})
+    components.iframe(f"{'/' + base if base else ''}/app/static/live.html?{query}", height=1100, scrolling=True)
+
+
+@st.cache_resource(max_entries=2)
+def load_candidate_portfolios(version, bands):
+    """Enumerated portfolios of the configured bands, built once per data version whatever the assumptions"""
+    data = load_data_layer(version)
+    held = np.zeros_like(data.offered)
+    most = max_acquirable(held, held, data.offered)
+    most[~np.isin(BANDS, bands)] = 0
+    _, sites = coverage_grid(*load_circle_geography())
+    return PortfolioSet(data.offered, most, load_reserve_prices(), sites, CapacityParameters('LTE', TDD_DOWNLINK_SHARE))
+
+
+# Every capacity assumption the page offers; a rescoring holds only its own objective and fronts
+@st.cache_resource(max_entries=len(MID_BAND_TECHNOLOGIES) * len(TDD_DOWNLINK_SHARES))
+def load_portfolios(version, bands, parameters):
+    """The candidate portfolios scored under a capacity assumption, with their fronts"""
+    return load_candidate_portfolios(version, bands).rescored(parameters)
+
+
+@page("Portfolio Frontier")
+def portfolio_frontier(data, config, rank_by):
+    st.header("⚖️ Portfolio Frontier")
+
+    st.markdown("Block portfolios winnable within the spectrum caps, traded off on coverage, capacity and cost. "
+                "A portfolio is on the frontier when no other one is at least as good on all three and better "
+                "on one; the investment scenarios are single points of this trade-off.")
+
+    parameters, assumptions = capacity_assumptions()
+    portfolios = load_portfolios(data.version, tuple(config['bands']), parameters)
+    if not len(portfolios):
+        st.info("No spectrum on offer in the configured bands.")
+        return
+
+    @st.fragment
+    def frontier_view():
+        """Constraint sliders and the frontier they leave; reruns on its own when a constraint changes"""
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            budget = st.slider(f"Budget ({portfolios.cost_unit})", 0.0, float(portfolios.cost.max()),
+                               float(portfolios.cost.max()))
+
+        with col2:
+            min_coverage = st.slider("Minimum Coverage (k sites saved)", 0.0, float(portfolios.coverage.max()), 0.0)
+
+        with col3:
+            min_capacity = st.slider("Minimum Capacity (Mbps per cell, all circles)", 0.0,
+                                     float(portfolios.capacity.max()), 0.0)
+
+        # Fronts are fixed by the enumeration; constraints only mask them
+        started = time.perf_counter()
+        ranked, ranks = portfolios.fronts(budget, min_coverage, min_capacity)
+        update_ms = (time.perf_counter() - started) * 1000
+        feasible = np.flatnonzero(portfolios.feasible(budget, min_coverage, min_capacity))
+        frontier = ranked[ranks == 1]
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Candidate Portfolios", f"{len(portfolios):,}")
+
+        with col2:
+            st.metric("Within Constraints", f"{len(feasible):,}")
+
+        with col3:
+            st.metric("On the Frontier", f"{len(frontier):,}")
+
+        with col4:
+            st.metric("Frontier Update", f"{update_ms:.2f} ms")
+
+        # WebGL traces keep tens of thousands of markers interactive
+        fig = go.Figure()
+        layers = [("Candidates", np.setdiff1d(feasible, frontier), 4, 0.35),
+                  ("Pareto Frontier", frontier, 9, 1.0)]
+        for name, indices, size, opacity in layers:
+            frontier_layer = name == "Pareto Frontier"
+            fig.add_trace(go.Scattergl(
+                name=name, x=portfolios.cost[indices], y=portfolios.capacity[indices], customdata=indices,
+                mode='markers', opacity=opacity,
+                marker=dict(size=size, color=portfolios.coverage[indices], colorscale='Viridis',
+                            cmin=0, cmax=float(portfolios.coverage.max()),
+                            line=dict(width=1 if frontier_layer else 0, color='#222'),
+                            showscale=not frontier_layer, colorbar=dict(title="Coverage<br>(k sites)")),
+                hovertemplate="Portfolio %{customdata}<br>Cost %{x:,.1f}<br>Capacity %{y:,.0f} Mbps"
+                              "<br>Coverage %{marker.color:.2f}k sites<extra></extra>"))
+        fig.update_layout(title=f"Coverage, Capacity and Cost of Candidate Portfolios ({assumptions})",
+                          xaxis_title=f"Cost ({portfolios.cost_unit})", yaxis_title="Capacity (Mbps per cell)",
+                          height=550, legend=dict(orientation='h', y=1.02, yanchor='bottom'))
+        st.plotly_chart(fig, use_container_width=True)
+        if not portfolios.priced:
+            st.caption("No reserve prices loaded (data/reserve_prices.csv): cost is the occupied MHz won.")
+
+        st.subheader("Frontier Portfolios")
+        st.dataframe(portfolios.describe(frontier), use_container_width=True, hide_index=True)
+
+        with st.expander("Next-best Fronts"):
+            st.dataframe(portfolios.describe(ranked[ranks > 1]), use_container_width=True, hide_index=True)
+
+    frontier_view()
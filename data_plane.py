@@ -0,0 +1,268 @@
+"""Shared-memory data plane: the dashboard tables published once, attached read-only by every server process
+
+Each data version is written once as a directory of `.npy` column files plus
+a manifest, under POSIX shared memory (/dev/shm) where available. Server
+processes memory-map the columns read-only and wrap them in DataFrames
+without copying, so the page cache holds a single copy however many
+replicas run. Text columns are dictionary-encoded and come back as
+Categoricals over the mapped codes: only the (short, sorted) dictionary is
+decoded per process.
+
+The first process to ask for a version that is not published yet builds and
+publishes it under a file lock; the others wait and attach. A data refresh is
+a new version (a digest of the workbooks, the data folder and CODE_VERSION):
+it is published once, `CURRENT` is switched atomically and
+old versions are removed (processes still mapping them keep valid views
+until they move on). Publish ahead of a rollout, or inspect what is
+published, from the command line:
+
+    python data_plane.py publish spectrum_dashboard.py
+    python data_plane.py status
+
+Set SPECTRUM_DATA_PLANE to put the data plane somewhere else.
+"""
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ingest import DATA_DIR as WORKBOOK_DIR
+from valuation import DATA_DIR as VALUATION_DATA_DIR
+
+# Bump when the code that derives the tables from the source files changes, so a new version is published
+CODE_VERSION = 2
+
+ROOT = os.environ.get('SPECTRUM_DATA_PLANE') or os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'spectrum-dashboard')
+
+# Published versions kept per name, besides the current one
+KEEP_VERSIONS = 1
+
+MANIFEST = 'manifest.json'
+
+# Content digest of every source file, with the size and mtime it was read at
+_file_digests = {}
+_file_digests_lock = threading.Lock()
+
+
+def source_files():
+    """The files the dashboard tables are derived from: the workbooks and the data folder"""
+    workbooks = [os.path.join(WORKBOOK_DIR, name) for name in os.listdir(WORKBOOK_DIR) if name.endswith('.xlsx')]
+    data = [os.path.join(VALUATION_DATA_DIR, name) for name in os.listdir(VALUATION_DATA_DIR)]
+    return sorted(path for path in workbooks + data if os.path.isfile(path))
+
+
+def _file_digest(path):
+    """SHA-1 of a file's content, read again only when its size or mtime changes"""
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    with _file_digests_lock:
+        if _file_digests.get(path, (None,))[0] == key:
+            return _file_digests[path][1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    with _file_digests_lock:
+        _file_digests[path] = (key, digest)
+    return digest
+
+
+def data_version():
+    """Version of the dashboard tables: the content of the source files and CODE_VERSION
+
+    The one version key of the dashboards: the data plane, the data layer and
+    its caches, static exports and board packs are all stamped with it.
+    """
+    digest = hashlib.sha1(f'code:{CODE_VERSION}'.encode())
+    for path in source_files():
+        digest.update(f'{os.path.relpath(path, WORKBOOK_DIR)}:{_file_digest(path)}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def _write_frame(frame, directory, prefix):
+    """Write a frame's columns as .npy files; returns its manifest entry"""
+    columns = []
+    index = frame.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        frame = frame.reset_index(names='__index__')
+    for i, (name, values) in enumerate(frame.items()):
+        file = f'{prefix}.{i}.npy'
+        entry = {'name': name, 'file': file, 'dtype': str(values.dtype)}
+        if values.dtype.kind in 'biuf':
+            np.save(os.path.join(directory, file), values.to_numpy())
+        else:
+            # Sorted, so ordering by a text column is unchanged; stored in the code width a Categorical of
+            # that many categories uses, so it can wrap the mapped codes without a copy
+            codes, categories = pd.factorize(values, sort=True, use_na_sentinel=True)
+            np.save(os.path.join(directory, file), codes.astype(_code_dtype(len(categories))))
+            entry['dictionary'] = categories.tolist()
+        columns.append(entry)
+    return {'columns': columns, 'rows': len(frame)}
+
+
+def _code_dtype(n_categories):
+    """Integer type pandas keeps the codes of a Categorical with `n_categories` in"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _read_frame(entry, directory):
+    """A frame whose columns are read-only views of the mapped files (text as Categoricals over the codes)"""
+    data = {}
+    for column in entry['columns']:
+        values = np.load(os.path.join(directory, column['file']), mmap_mode='r')
+        if 'dictionary' in column:
+            dictionary = pd.Index(column['dictionary'], dtype=None if column['dtype'] == 'object' else column['dtype'])
+            values = pd.Categorical.from_codes(values, dictionary, validate=False)
+        data[column['name']] = values
+    frame = pd.DataFrame(data, copy=False)
+    if '__index__' in frame.columns:
+        frame = frame.set_index('__index__')
+        frame.index.name = None
+    return frame
+
+
+def publish(name, version, frames, root=ROOT):
+    """Publish frames as `version` of `name` and make it current; returns the version directory"""
+    base = os.path.join(root, name)
+    target = os.path.join(base, version)
+    os.makedirs(base, exist_ok=True)
+    if not os.path.exists(target):
+        staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=base)
+        manifest = {'name': name, 'version': version,
+                    'frames': [_write_frame(frame, staging, f'frame{i}') for i, frame in enumerate(frames)]}
+        with open(os.path.join(staging, MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+        os.rename(staging, target)
+    _set_current(base, version)
+    return target
+
+
+def _set_current(base, version):
+    fd, path = tempfile.mkstemp(prefix='.current-', dir=base)
+    with os.fdopen(fd, 'w') as f:
+        f.write(version)
+    os.replace(path, os.path.join(base, 'CURRENT'))
+
+
+def current_version(name, root=ROOT):
+    """The version of `name` readers should attach (None if nothing is published)"""
+    try:
+        with open(os.path.join(root, name, 'CURRENT')) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach(name, version=None, root=ROOT):
+    """Published frames of `name` (current version by default) as read-only, zero-copy DataFrames
+
+    Raises FileNotFoundError when the version is not published.
+    """
+    version = version or current_version(name, root)
+    if version is None:
+        raise FileNotFoundError(f"Nothing published for {name!r} under {root}")
+    directory = os.path.join(root, name, version)
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    return tuple(_read_frame(entry, directory) for entry in manifest['frames'])
+
+
+@contextlib.contextmanager
+def _lock(name, root):
+    os.makedirs(os.path.join(root, name), exist_ok=True)
+    with open(os.path.join(root, name, '.lock'), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def shared_frames(name, version, build, root=ROOT):
+    """Frames of `version`, attached from the data plane; the first process to need them runs `build()`
+    (returning a tuple of DataFrames) and publishes the result while the others wait"""
+    try:
+        frames = attach(name, version, root)
+    except FileNotFoundError:
+        with _lock(name, root):
+            try:
+                frames = attach(name, version, root)
+            except FileNotFoundError:
+                publish(name, version, build(), root)
+                collect_garbage(name, root=root)
+                frames = attach(name, version, root)
+    return frames
+
+
+def collect_garbage(name, keep=KEEP_VERSIONS, root=ROOT):
+    """Remove all but the current and the `keep` most recent other versions of `name`"""
+    base = os.path.join(root, name)
+    current = current_version(name, root)
+    versions = [entry for entry in os.scandir(base)
+                if entry.is_dir() and not entry.name.startswith('.') and entry.name != current]
+    versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[keep:]:
+        # Processes still mapping these files keep valid views; the memory is freed when they let go
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def status(root=ROOT):
+    """One row per published version: name, version, whether current, frames, rows and bytes"""
+    rows = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        current = current_version(name, root)
+        for entry in os.scandir(os.path.join(root, name)):
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            with open(os.path.join(entry.path, MANIFEST)) as f:
+                manifest = json.load(f)
+            rows.append({
+                'Name': name,
+                'Version': entry.name,
+                'Current': entry.name == current,
+                'Frames': len(manifest['frames']),
+                'Rows': sum(frame['rows'] for frame in manifest['frames']),
+                'Bytes': sum(os.path.getsize(os.path.join(entry.path, file)) for file in os.listdir(entry.path)),
+            })
+    return pd.DataFrame(rows, columns=['Name', 'Version', 'Current', 'Frames', 'Rows', 'Bytes'])
+
+
+def _publish_script(script):
+    """Run a dashboard once headlessly so it publishes its current data version"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f"{script}: {at.exception[0].message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    publish_parser = commands.add_parser('publish', help="publish the current data version of dashboards")
+    publish_parser.add_argument('scripts', nargs='+')
+    commands.add_parser('status', help="list published versions")
+    args = parser.parse_args(argv)
+
+    if args.command == 'publish':
+        for script in args.scripts:
+            _publish_script(os.path.abspath(script))
+    print(f"Data plane at {ROOT}")
+    print(status().to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
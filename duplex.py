@@ -0,0 +1,118 @@
+"""Duplex-aware spectrum model: paired (FDD) versus unpaired (TDD) MHz"""
+
+import numpy as np
+import pandas as pd
+
+from circles import N_CIRCLES
+from ingest import BANDS, DUPLEX_MODES, QUANTUM_COLUMNS
+
+DUPLEX_COLUMNS = ['Paired_MHz', 'Unpaired_MHz', 'Occupied_MHz']
+
+# Paired flag per position in BANDS
+PAIRED = np.array([DUPLEX_MODES[band] == 'FDD' for band in BANDS])
+
+
+def band_index(bands):
+    """Position of each band label in BANDS (-1 for unknown bands)"""
+    return pd.Index(BANDS).get_indexer(np.asarray(bands, dtype=object))
+
+
+def block_intervals(blocks):
+    """UL and DL interval of every workbook block as parallel arrays
+
+    Unpaired blocks keep their single range in the DL arrays with NaN uplink,
+    so one row per block serves both schemes.
+    """
+    return {
+        'band': band_index(blocks['Band']),
+        'circle': blocks['Circle_ID'].to_numpy(),
+        'ul_start': blocks['UL_Start_MHz'].to_numpy(dtype=float),
+        'ul_stop': blocks['UL_Stop_MHz'].to_numpy(dtype=float),
+        'dl_start': blocks['Start_MHz'].to_numpy(dtype=float),
+        'dl_stop': blocks['Stop_MHz'].to_numpy(dtype=float),
+    }
+
+
+def interval_totals(intervals):
+    """Paired (per direction) and unpaired MHz as band x circle matrices, in one pass
+
+    A block counts as paired when it has an uplink range; its paired width is
+    the narrower of its two directions.
+    """
+    paired = ~np.isnan(intervals['ul_start'])
+    ul = np.where(paired, intervals['ul_stop'] - intervals['ul_start'], 0.0)
+    dl = intervals['dl_stop'] - intervals['dl_start']
+    known = (intervals['band'] >= 0) & (intervals['circle'] >= 0)
+    keys = intervals['band'][known] * N_CIRCLES + intervals['circle'][known]
+    size = len(BANDS) * N_CIRCLES
+    paired_mhz = np.bincount(keys, weights=np.where(paired, np.minimum(ul, dl), 0.0)[known], minlength=size)
+    unpaired_mhz = np.bincount(keys, weights=np.where(paired, 0.0, dl)[known], minlength=size)
+    return paired_mhz.reshape(len(BANDS), N_CIRCLES), unpaired_mhz.reshape(len(BANDS), N_CIRCLES)
+
+
+def largest_contiguous(intervals, tolerance=1e-6):
+    """Widest run of back-to-back blocks (DL MHz, per direction for paired bands) as a band x circle matrix
+
+    Blocks are sorted by band, circle and start; a run breaks wherever a block
+    starts more than `tolerance` MHz after the previous one stops.
+    """
+    known = (intervals['band'] >= 0) & (intervals['circle'] >= 0)
+    keys = intervals['band'][known] * N_CIRCLES + intervals['circle'][known]
+    start = intervals['dl_start'][known]
+    stop = intervals['dl_stop'][known]
+    order = np.lexsort((start, keys))
+    keys, start, stop = keys[order], start[order], stop[order]
+
+    new_run = np.ones(len(keys), dtype=bool)
+    new_run[1:] = (keys[1:] != keys[:-1]) | (start[1:] > stop[:-1] + tolerance)
+    widths = np.bincount(np.cumsum(new_run) - 1, weights=stop - start)
+    largest = np.zeros(len(BANDS) * N_CIRCLES)
+    np.maximum.at(largest, keys[new_run], widths)
+    return largest.reshape(len(BANDS), N_CIRCLES)
+
+
+def duplex_totals(summary):
+    """Split each Band/State quantum of `ingest.band_summary` into paired and unpaired MHz
+
+    Paired quanta are per direction; Occupied_MHz counts both directions and is
+    the figure that can be added up across bands.
+    """
+    paired = PAIRED[band_index(summary['Band'])]
+    quantum = summary['Quantum_MHz'].to_numpy(dtype=float)
+    return summary.assign(
+        Duplex=np.where(paired, 'FDD', 'TDD'),
+        Paired_MHz=np.where(paired, quantum, 0.0),
+        Unpaired_MHz=np.where(paired, 0.0, quantum),
+        Occupied_MHz=np.where(paired, 2 * quantum, quantum),
+    )
+
+
+def band_duplex_totals(summary):
+    """Paired, unpaired and occupied MHz per band, in BANDS order"""
+    totals = duplex_totals(summary)
+    index = band_index(totals['Band'])
+    present = np.bincount(index, minlength=len(BANDS)) > 0
+    frame = pd.DataFrame({
+        'Band': np.array(BANDS, dtype=object)[present],
+        'Duplex': np.where(PAIRED, 'FDD', 'TDD')[present],
+    })
+    for column in DUPLEX_COLUMNS:
+        frame[column] = np.bincount(index, weights=totals[column].to_numpy(), minlength=len(BANDS))[present]
+    return frame
+
+
+def with_duplex_totals(wide):
+    """Add per-circle Paired/Unpaired/Occupied MHz to the wide frame of `ingest.spectrum_by_circle`"""
+    bands = [band for band in BANDS if QUANTUM_COLUMNS[band] in wide.columns]
+    quantum = wide[[QUANTUM_COLUMNS[band] for band in bands]].to_numpy(dtype=float)
+    paired = PAIRED[band_index(bands)]
+    wide = wide.copy()
+    wide['Paired_MHz'] = quantum[:, paired].sum(axis=1)
+    wide['Unpaired_MHz'] = quantum[:, ~paired].sum(axis=1)
+    wide['Occupied_MHz'] = 2 * wide['Paired_MHz'] + wide['Unpaired_MHz']
+    return wide
+
+
+def occupied_mhz(frame, bands):
+    """Spectrum occupied by `bands` in each row of a wide frame, counting both directions of paired bands"""
+    return sum(frame[QUANTUM_COLUMNS[band]] * (2 if DUPLEX_MODES[band] == 'FDD' else 1) for band in bands)
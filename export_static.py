@@ -0,0 +1,281 @@
+"""Export every page and band view of a dashboard to a static HTML bundle
+
+Every page is rendered headlessly with Streamlit's AppTest, once per option
+of every selectbox on it, with the views spread over a pool of worker
+processes that all read the same data files. The figures are serialized into the pages once at export time and
+share a single copy of plotly.min.js, so viewing the bundle needs no
+Streamlit session or server-side compute:
+
+    python export_static.py spectrum_analysis2.py --out snapshot
+    python export_static.py spectrum_analysis6.py --out snapshot6 --workers 4 --serve 8600
+
+Open snapshot/index.html directly or serve the folder with any static file server.
+"""
+
+import argparse
+import concurrent.futures
+import html
+import json
+import os
+import re
+import sys
+import textwrap
+import time
+
+from data_plane import data_version
+
+NAV_LABEL = "Select Analysis View"
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0; display: flex; color: #31333f; }
+nav { width: 16rem; min-height: 100vh; background: #f0f2f6; padding: 1rem; box-sizing: border-box; flex-shrink: 0; }
+nav h2 { font-size: 1.1rem; }
+nav ul { list-style: none; padding-left: 0.5rem; }
+nav a { color: #31333f; text-decoration: none; }
+nav a.current { font-weight: bold; color: #1f77b4; }
+main { flex: 1; padding: 1rem 3rem; min-width: 0; }
+.row { display: flex; gap: 1rem; flex-wrap: wrap; }
+.row > div { min-width: 0; }
+.metric { padding: 0.5rem 0; }
+.metric .label { font-size: 0.9rem; }
+.metric .value { font-size: 2.2rem; }
+.metric .delta { color: #09ab3b; }
+.caption, .selection { color: #808495; font-size: 0.9rem; }
+.alert { padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0; background: #e8f0fe; }
+.alert.warning { background: #fffce7; } .alert.error { background: #ffecec; } .alert.success { background: #e8f9ee; }
+table.dataframe { border-collapse: collapse; font-size: 0.9rem; margin: 0.5rem 0; }
+table.dataframe th, table.dataframe td { border: 1px solid #e6e9ef; padding: 0.25rem 0.5rem; text-align: right; }
+.chart { width: 100%; }
+"""
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'view'
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'(?<![\w*])\*(?!\s)(.+?)\*', r'<em>\1</em>', text)
+
+
+def markdown_to_html(source):
+    """The small Markdown subset the dashboards use (headings, lists, bold, rules, raw HTML)"""
+    source = textwrap.dedent(source).strip()
+    if source.startswith('<'):
+        return source
+    out = []
+    in_list = False
+    for line in source.splitlines():
+        stripped = line.strip()
+        is_item = stripped.startswith(('- ', '• '))
+        if in_list and not is_item:
+            out.append('</ul>')
+            in_list = False
+        if not stripped:
+            continue
+        if stripped == '---':
+            out.append('<hr>')
+        elif is_item:
+            if not in_list:
+                out.append('<ul>')
+                in_list = True
+            out.append(f'<li>{_inline(stripped[2:])}</li>')
+        elif stripped.startswith('#'):
+            level = min(len(stripped) - len(stripped.lstrip('#')), 6)
+            out.append(f'<h{level}>{_inline(stripped.lstrip("#").strip())}</h{level}>')
+        else:
+            out.append(f'<p>{_inline(stripped)}</p>')
+    if in_list:
+        out.append('</ul>')
+    return '\n'.join(out)
+
+
+class _Renderer:
+    """Turns an AppTest element tree into HTML, collecting figure specs along the way"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.figures = []
+
+    def render(self, node):
+        parts = []
+        for key in sorted(getattr(node, 'children', {})):
+            parts.append(self.element(node.children[key]))
+        return '\n'.join(part for part in parts if part)
+
+    def element(self, el):
+        kind = type(el).__name__
+        if kind == 'Block':
+            if el.type == 'flex_container' or el.type == 'horizontal':
+                return f'<div class="row">{self.render(el)}</div>'
+            if el.type == 'expander':
+                return f'<details><summary>{html.escape(el.proto.expandable.label)}</summary>{self.render(el)}</details>'
+            return f'<div>{self.render(el)}</div>'
+        if kind == 'Column':
+            return f'<div style="flex: {el.proto.weight:.4f}">{self.render(el)}</div>'
+        if kind == 'Markdown':
+            return markdown_to_html(el.value)
+        if kind in ('Title', 'Header', 'Subheader'):
+            tag = {'Title': 'h1', 'Header': 'h2', 'Subheader': 'h3'}[kind]
+            return f'<{tag}>{html.escape(el.value)}</{tag}>'
+        if kind == 'Caption':
+            return f'<p class="caption">{html.escape(el.value)}</p>'
+        if kind in ('Info', 'Warning', 'Error', 'Success'):
+            return f'<div class="alert {kind.lower()}">{html.escape(el.value)}</div>'
+        if kind == 'Metric':
+            delta = f'<div class="delta">{html.escape(el.delta)}</div>' if el.delta else ''
+            return (f'<div class="metric"><div class="label">{html.escape(el.label)}</div>'
+                    f'<div class="value">{html.escape(el.value)}</div>{delta}</div>')
+        if kind == 'Dataframe':
+            config = json.loads(el.proto.columns or '{}')
+            hide_index = config.get('_index', {}).get('hidden', False)
+            return el.value.to_html(index=not hide_index, na_rep='', border=0, float_format=lambda v: f'{v:g}')
+        if kind in ('Selectbox', 'Multiselect', 'SelectSlider', 'Slider'):
+            value = el.value if isinstance(el.value, str) else ', '.join(map(str, el.value))
+            return f'<p class="selection">{html.escape(el.label)}: <strong>{html.escape(value)}</strong></p>'
+        if kind == 'UnknownElement' and el.type == 'plotly_chart':
+            figure_id = f'{self.prefix}-fig{len(self.figures)}'
+            self.figures.append((figure_id, el.proto.spec))
+            return f'<div class="chart" id="{figure_id}"></div>'
+        return ''
+
+
+def _run_view(script, page, widget_label=None, option=None):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    nav = next(box for box in at.sidebar.selectbox if box.label == NAV_LABEL)
+    nav.set_value(page).run()
+    if widget_label is not None:
+        box = next(box for box in at.main.selectbox if box.label == widget_label)
+        box.set_value(option).run()
+    if at.exception:
+        raise RuntimeError(f"{page} / {option}: {at.exception[0].message}")
+    return at
+
+
+def page_views(script, page):
+    """The views of one page: its default plus every other option of each selectbox on it"""
+    at = _run_view(script, page)
+    views = [(page, None, None)]
+    for box in at.main.selectbox:
+        views.extend((page, box.label, option) for option in box.options if option != box.value)
+    return views
+
+
+def render_view(script, page, widget_label, option):
+    """Render one view to an HTML fragment plus the figure specs it references"""
+    at = _run_view(script, page, widget_label, option)
+    renderer = _Renderer(slug(page) if option is None else f'{slug(page)}-{slug(option)}')
+    return page, option, renderer.render(at.main), renderer.figures
+
+
+def _view_path(page, option):
+    return f'{slug(page)}.html' if option is None else f'{slug(page)}--{slug(option)}.html'
+
+
+def write_view(out_dir, title, views, page, option, body, figures, version):
+    nav_items = []
+    for view_page, view_option in views:
+        label = view_page if view_option is None else f'&nbsp;&nbsp;↳ {html.escape(view_option)}'
+        current = ' class="current"' if (view_page, view_option) == (page, option) else ''
+        nav_items.append(f'<li><a href="{_view_path(view_page, view_option)}"{current}>{label}</a></li>')
+    scripts = '\n'.join(
+        f'<script>(function () {{ var f = {spec}; '
+        f'Plotly.newPlot("{figure_id}", f.data, f.layout, {{responsive: true}}); }})();</script>'
+        for figure_id, spec in figures)
+    page_title = page if option is None else f'{page}: {option}'
+    document = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)} | {html.escape(page_title)}</title>
+<script src="plotly.min.js"></script>
+<style>{STYLE}</style>
+</head>
+<body>
+<nav><h2>📊 Navigation</h2><ul>{''.join(nav_items)}</ul>
+<p class="caption">Static snapshot · data version {version} · exported {time.strftime('%Y-%m-%d %H:%M')}</p></nav>
+<main>
+{body}
+</main>
+{scripts}
+</body>
+</html>
+"""
+    with open(os.path.join(out_dir, _view_path(page, option)), 'w', encoding='utf-8') as f:
+        f.write(document)
+
+
+def discover(script):
+    """Page names and dashboard title, read from a first headless run"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    pages = list(next(box for box in at.sidebar.selectbox if box.label == NAV_LABEL).options)
+    title = next((el.value for el in at.main.markdown if '<h1' in el.value), os.path.basename(script))
+    return pages, re.sub(r'<[^>]+>', '', title).strip()
+
+
+def export(script, out_dir, workers=None):
+    """Render all views of `script` in parallel and write the bundle; returns the manifest"""
+    from plotly.offline import get_plotlyjs
+
+    script = os.path.abspath(script)
+    version = data_version()
+    started = time.perf_counter()
+    # AppTest runs the script as __main__, so every run happens in a worker process
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pages, title = pool.submit(discover, script).result()
+        targets = [view for views in pool.map(page_views, [script] * len(pages), pages) for view in views]
+        views = list(pool.map(render_view, [script] * len(targets), *zip(*targets)))
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    nav = [(page, option) for page, option, _, _ in views]
+    for page, option, body, figures in views:
+        write_view(out_dir, title, nav, page, option, body, figures, version)
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><meta http-equiv="refresh" content="0; url={_view_path(pages[0], None)}">')
+
+    manifest = {
+        'script': os.path.basename(script),
+        'data_version': version,
+        'views': [{'page': page, 'option': option, 'file': _view_path(page, option), 'figures': len(figures)}
+                  for page, option, _, figures in views],
+        'render_seconds': round(time.perf_counter() - started, 2),
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('script', help="dashboard script to export")
+    parser.add_argument('--out', default='snapshot', help="output folder")
+    parser.add_argument('--workers', type=int, help="parallel render processes (default: one per CPU)")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="serve the bundle on this port afterwards")
+    args = parser.parse_args(argv)
+
+    manifest = export(args.script, args.out, args.workers)
+    figures = sum(view['figures'] for view in manifest['views'])
+    print(f"Exported {len(manifest['views'])} views ({figures} figures) of {manifest['script']} "
+          f"to {args.out}/ in {manifest['render_seconds']} s (data version {manifest['data_version']})")
+
+    if args.serve:
+        import functools
+        import http.server
+        handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=args.out)
+        print(f"Serving on http://localhost:{args.serve}/")
+        http.server.ThreadingHTTPServer(('', args.serve), handler).serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    # Workers must find their functions under the module name: AppTest swaps out __main__ while it runs
+    import export_static
+    sys.exit(export_static.main())
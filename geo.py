@@ -0,0 +1,107 @@
+"""Schematic circle tiles and choropleth figures for the map view
+
+data/india_circles.geojson holds one hexagon tile per circle on a grid that
+only loosely follows the map of India: tiles, not boundaries or locations.
+"""
+
+import copy
+import functools
+import json
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+
+from circles import CIRCLE_NAMES, N_CIRCLES
+
+GEOJSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'india_circles.geojson')
+
+# Fill of circles without a value (a band not offered there)
+MISSING_COLOR = '#d3d3d3'
+
+
+@functools.lru_cache(maxsize=1)
+def load_circle_geojson(path=GEOJSON_PATH):
+    """Read the bundled schematic circle tiles (features carry a Circle_ID property)"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=1)
+def circle_outlines():
+    """Outline per Circle_ID as NaN-separated x/y arrays, plus a label point
+
+    Computed once and reused for every band and value set.
+    """
+    xs = [np.empty(0)] * N_CIRCLES
+    ys = [np.empty(0)] * N_CIRCLES
+    labels = np.full((N_CIRCLES, 2), np.nan)
+    for feature in load_circle_geojson()['features']:
+        circle = feature['properties']['Circle_ID']
+        geometry = feature['geometry']
+        polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+        rings = [np.asarray(ring, dtype=float) for polygon in polygons for ring in polygon]
+        gap = np.array([[np.nan, np.nan]])
+        joined = np.concatenate([part for ring in rings for part in (ring, gap)])[:-1]
+        xs[circle], ys[circle] = joined[:, 0], joined[:, 1]
+        # Label at the vertex mean of the largest ring
+        largest = max(rings, key=len)
+        labels[circle] = largest[:-1].mean(axis=0)
+    return xs, ys, labels
+
+
+@functools.lru_cache(maxsize=1)
+def _base_figure():
+    """Figure skeleton holding the geometry; only colours and hover text change per band"""
+    xs, ys, labels = circle_outlines()
+    traces = []
+    for circle in range(N_CIRCLES):
+        if not len(xs[circle]):
+            continue
+        traces.append(go.Scatter(
+            x=xs[circle], y=ys[circle], fill='toself', mode='lines',
+            line=dict(color='white', width=1), name=CIRCLE_NAMES[circle],
+            hoveron='fills', showlegend=False,
+        ).to_plotly_json())
+    drawn = ~np.isnan(labels[:, 0])
+    traces.append(go.Scatter(
+        x=labels[drawn, 0], y=labels[drawn, 1], mode='text',
+        text=[CIRCLE_NAMES[i] for i in np.flatnonzero(drawn)],
+        textfont=dict(size=9), hoverinfo='skip', showlegend=False,
+    ).to_plotly_json())
+    layout = go.Layout(
+        xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x'),
+        plot_bgcolor='rgba(0,0,0,0)', height=650, margin=dict(l=10, r=10, t=60, b=10),
+    ).to_plotly_json()
+    return {'data': traces, 'layout': layout, 'drawn': np.flatnonzero([len(x) > 0 for x in xs])}
+
+
+def circle_map_figure(values, title, colorscale='Viridis', unit='MHz', missing="not offered"):
+    """Choropleth of one value per Circle_ID over the cached outlines; NaN circles are grey, labelled `missing`"""
+    base = _base_figure()
+    values = np.asarray(values, dtype=float)
+    drawn = base['drawn']
+    present = ~np.isnan(values)
+    low, high = (float(values[present].min()), float(values[present].max())) if present.any() else (0.0, 0.0)
+    scaled = (values[drawn] - low) / (high - low) if high > low else np.zeros(len(drawn))
+    colors = sample_colorscale(colorscale, list(np.nan_to_num(scaled)))
+
+    data = [dict(trace) for trace in base['data']]
+    for trace, circle, color in zip(data, drawn, colors):
+        if present[circle]:
+            trace['fillcolor'] = color
+            trace['hovertemplate'] = f"{CIRCLE_NAMES[circle]}: {values[circle]:g} {unit}<extra></extra>"
+        else:
+            trace['fillcolor'] = MISSING_COLOR
+            trace['hovertemplate'] = f"{CIRCLE_NAMES[circle]}: {missing}<extra></extra>"
+
+    # Invisible marker trace that carries the colour bar
+    data.append(dict(
+        type='scatter', x=[None], y=[None], mode='markers', hoverinfo='skip', showlegend=False,
+        marker=dict(colorscale=colorscale, cmin=low, cmax=high, color=[low],
+                    colorbar=dict(title=unit), showscale=True),
+    ))
+    layout = copy.deepcopy(base['layout'])
+    layout['title'] = dict(text=title)
+    return go.Figure({'data': data, 'layout': layout}, skip_invalid=True)
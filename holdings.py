@@ -0,0 +1,152 @@
+"""Spectrum holdings overlay and spectrum-cap compliance of candidate bundles"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, N_CIRCLES, circle_ids
+from duplex import PAIRED, block_intervals, interval_totals
+from ingest import BANDS
+
+HOLDINGS_COLUMNS = ['Circle', 'Band', 'Held_MHz', 'Assigned_MHz']
+
+# Default caps: a licensee may hold at most this share of the spectrum pooled over a band
+# group in a circle (assigned to all operators plus on offer). Source: DoT Notice Inviting
+# Applications for the 2024 spectrum auction (8 March 2024), which keeps the caps of the 2022
+# notice: 35% overall, 50% of the sub-1 GHz bands combined, 50% of 1800/2100/2300/2500 MHz
+# combined, 40% of 3300 MHz and 40% of 26 GHz. Adjust to the notice in force.
+SPECTRUM_CAPS = {
+    'Overall': (BANDS, 0.35),
+    'Sub-1 GHz': (['800 MHz', '900 MHz'], 0.50),
+    'Mid band': (['1800 MHz', '2100 MHz', '2300 MHz', '2500 MHz'], 0.50),
+    '3300 MHz': (['3300 MHz'], 0.40),
+    '26 GHz': (['26 GHz'], 0.40),
+}
+
+# Absolute tolerance for MHz comparisons
+TOLERANCE_MHZ = 1e-6
+
+
+def normalize_band(label):
+    """Band label in BANDS form from spellings like '900', '900MHz' or '26 GHz' (None if unknown)"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(mhz|ghz)?\s*', str(label), flags=re.IGNORECASE)
+    if match is None:
+        return None
+    number, unit = match.groups()
+    band = f"{float(number):g} {'GHz' if (unit or '').lower() == 'ghz' else 'MHz'}"
+    return band if band in BANDS else None
+
+
+def holdings_template():
+    """Empty holdings table with one row per circle and band, for analysts to fill in"""
+    return pd.DataFrame({
+        'Circle': np.repeat(CIRCLE_NAMES, len(BANDS)),
+        'Band': np.tile(BANDS, N_CIRCLES),
+        'Held_MHz': 0.0,
+        'Assigned_MHz': 0.0,
+    }, columns=HOLDINGS_COLUMNS)
+
+
+def load_holdings(source, name=None):
+    """Read a holdings CSV or Parquet file into band x circle matrices (held, assigned)
+
+    `source` is a path or file-like object; `name` gives the file name when it
+    is not a path (e.g. an upload). Held_MHz is our own holding and Assigned_MHz
+    the total assigned to all operators, both per direction for paired bands.
+    Assigned_MHz is optional; without it the pool only counts our holding.
+    """
+    name = name or getattr(source, 'name', None) or str(source)
+    if os.path.splitext(name)[1].lower() in ('.parquet', '.pq'):
+        frame = pd.read_parquet(source)
+    else:
+        frame = pd.read_csv(source)
+
+    missing = [column for column in HOLDINGS_COLUMNS[:3] if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Holdings file is missing columns: {', '.join(missing)}")
+
+    circles = circle_ids(frame['Circle'])
+    bands = pd.Index(BANDS).get_indexer(frame['Band'].map(normalize_band).astype(object))
+    unknown = frame.loc[(circles < 0) | (bands < 0), ['Circle', 'Band']]
+    if len(unknown):
+        rows = ', '.join(f"{c} / {b}" for c, b in unknown.head(5).itertuples(index=False))
+        raise ValueError(f"Unknown circle or band in {len(unknown)} holdings rows: {rows}")
+
+    keys = bands * N_CIRCLES + circles
+    size = len(BANDS) * N_CIRCLES
+    held = np.bincount(keys, weights=pd.to_numeric(frame['Held_MHz']).fillna(0).to_numpy(), minlength=size)
+    assigned = np.zeros(size)
+    if 'Assigned_MHz' in frame.columns:
+        assigned = np.bincount(keys, weights=pd.to_numeric(frame['Assigned_MHz']).fillna(0).to_numpy(),
+                               minlength=size)
+    held = held.reshape(len(BANDS), N_CIRCLES)
+    return held, np.maximum(assigned.reshape(len(BANDS), N_CIRCLES), held)
+
+
+def offered_spectrum(blocks):
+    """MHz on offer per band x circle from the workbook block table (per direction for paired bands)"""
+    paired, unpaired = interval_totals(block_intervals(blocks))
+    return paired + unpaired
+
+
+def cap_weights(caps=SPECTRUM_CAPS):
+    """(cap x band) weights: band membership of each cap, doubled for paired bands so
+    FDD and TDD spectrum are counted as occupied MHz"""
+    weights = np.zeros((len(caps), len(BANDS)))
+    for i, (bands, _) in enumerate(caps.values()):
+        weights[i, pd.Index(BANDS).get_indexer(bands)] = 1.0
+    return weights * np.where(PAIRED, 2.0, 1.0)
+
+
+def cap_limits(assigned, offered, caps=SPECTRUM_CAPS):
+    """Most occupied MHz a licensee may hold under each cap, as a cap x circle matrix"""
+    share = np.array([share for _, share in caps.values()])
+    return share[:, None] * (cap_weights(caps) @ (assigned + offered))
+
+
+def cap_headroom(held, assigned, offered, bundles, caps=SPECTRUM_CAPS):
+    """Headroom under every cap after winning each bundle
+
+    `bundles` holds the MHz won per band and circle, shaped (bundle, band, circle)
+    or (band, circle) for a single bundle. Returns occupied MHz of headroom shaped
+    (bundle, cap, circle); negative values breach the cap.
+    """
+    bundles = np.asarray(bundles, dtype=float).reshape(-1, len(BANDS), N_CIRCLES)
+    after = np.einsum('kb,nbc->nkc', cap_weights(caps), held + bundles)
+    return cap_limits(assigned, offered, caps)[None] - after
+
+
+def compliant_bundles(held, assigned, offered, bundles, caps=SPECTRUM_CAPS):
+    """True for each bundle that stays within every cap and within the spectrum on offer"""
+    bundles = np.asarray(bundles, dtype=float).reshape(-1, len(BANDS), N_CIRCLES)
+    within_caps = (cap_headroom(held, assigned, offered, bundles, caps) >= -TOLERANCE_MHZ).all(axis=(1, 2))
+    within_offer = (bundles <= offered + TOLERANCE_MHZ).all(axis=(1, 2))
+    return within_caps & within_offer
+
+
+def max_acquirable(held, assigned, offered, caps=SPECTRUM_CAPS):
+    """Most MHz winnable in each band x circle on its own, limited by the offer and every cap"""
+    weights = cap_weights(caps)
+    headroom = cap_headroom(held, assigned, offered, np.zeros_like(offered), caps)[0]
+    # Each cap allows headroom / weight MHz of a member band; non-members are unconstrained
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_band = np.where(weights[:, :, None] > 0, headroom[:, None, :] / weights[:, :, None], np.inf)
+    return np.clip(np.minimum(offered, per_band.min(axis=0)), 0.0, None)
+
+
+def holdings_overlay(held, assigned, offered, bands=BANDS, caps=SPECTRUM_CAPS):
+    """Long Circle/Band table of current holding, offer, cap-limited maximum and post-auction holding"""
+    index = pd.Index(BANDS).get_indexer(bands)
+    most = max_acquirable(held, assigned, offered, caps)[index]
+    return pd.DataFrame({
+        'Circle_ID': np.tile(np.arange(N_CIRCLES), len(index)),
+        'Circle': np.tile(CIRCLE_NAMES, len(index)),
+        'Band': np.repeat(np.asarray(bands, dtype=object), N_CIRCLES),
+        'Held_MHz': held[index].ravel(),
+        'Offered_MHz': offered[index].ravel(),
+        'Max_Acquirable_MHz': most.ravel(),
+        'Post_Auction_MHz': (held[index] + most).ravel(),
+        'Full_Offer_Compliant': (most >= offered[index] - TOLERANCE_MHZ).ravel(),
+    })
@@ -0,0 +1,285 @@
+"""Block-level ingest of the DoT spectrum auction workbooks"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, align, canonical_name, circle_dimension, circle_ids
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Workbook holding the block plan for each band
+WORKBOOKS = {
+    '800 MHz': 'Spectrum-blocks-for-auction-of-800-MHz-band-2023-24.xlsx',
+    '900 MHz': 'Spectrum-blocks-for-auction-of-900-MHz-band-2023-24.xlsx',
+    '1800 MHz': 'Spectrum-blocks-for-auction-of-1800-MHz-band-2023-24.xlsx',
+    '2100 MHz': 'Spectrum-blocks-for-auction-of-2100-2300-2500-3300-MHz-and-26-GHz-bands-2023-24_revised.xlsx',
+    '2300 MHz': 'Spectrum-blocks-for-auction-of-2100-2300-2500-3300-MHz-and-26-GHz-bands-2023-24_revised.xlsx',
+    '2500 MHz': 'Spectrum-blocks-for-auction-of-2100-2300-2500-3300-MHz-and-26-GHz-bands-2023-24_revised.xlsx',
+    '3300 MHz': 'Spectrum-blocks-for-auction-of-2100-2300-2500-3300-MHz-and-26-GHz-bands-2023-24_revised.xlsx',
+    '26 GHz': 'Spectrum-blocks-for-auction-of-2100-2300-2500-3300-MHz-and-26-GHz-bands-2023-24_revised.xlsx',
+}
+
+BANDS = list(WORKBOOKS)
+
+# Size of one auctioned block (MHz, per direction for paired bands)
+BLOCK_SIZE_MHZ = {
+    '800 MHz': 1.25,
+    '900 MHz': 0.2,
+    '1800 MHz': 0.2,
+    '2100 MHz': 5.0,
+    '2300 MHz': 10.0,
+    '2500 MHz': 10.0,
+    '3300 MHz': 10.0,
+    '26 GHz': 50.0,
+}
+
+# Duplex scheme per band: FDD blocks are paired UL/DL ranges (quantum is per direction),
+# TDD blocks are single unpaired ranges
+DUPLEX_MODES = {
+    '800 MHz': 'FDD',
+    '900 MHz': 'FDD',
+    '1800 MHz': 'FDD',
+    '2100 MHz': 'FDD',
+    '2300 MHz': 'TDD',
+    '2500 MHz': 'TDD',
+    '3300 MHz': 'TDD',
+    '26 GHz': 'TDD',
+}
+
+# Column names used by the dashboard DataFrames for each band
+QUANTUM_COLUMNS = {
+    '800 MHz': 'Quantum_800MHz',
+    '900 MHz': 'Quantum_900MHz',
+    '1800 MHz': 'Quantum_1800MHz',
+    '2100 MHz': '2100MHz',
+    '2300 MHz': '2300MHz',
+    '2500 MHz': '2500MHz',
+    '3300 MHz': '3300MHz',
+    '26 GHz': '26GHz',
+}
+BLOCK_COLUMNS = {
+    '800 MHz': 'Blocks_800MHz',
+    '900 MHz': 'Blocks_900MHz',
+    '1800 MHz': 'Blocks_1800MHz',
+}
+
+BLOCK_TABLE_COLUMNS = ['Band', 'Circle_ID', 'State', 'Block', 'UL_Start_MHz', 'UL_Stop_MHz',
+                       'Start_MHz', 'Stop_MHz', 'Quantum_MHz', 'File', 'Sheet', 'Row']
+TOTALS_COLUMNS = ['Band', 'Circle_ID', 'State', 'Declared_Blocks', 'Declared_Quantum_MHz', 'File', 'Sheet', 'Row']
+
+
+def _find_column(header, prefix):
+    for i, label in enumerate(header):
+        if isinstance(label, str) and label.startswith(prefix):
+            return i
+    return None
+
+
+def _parse_circle_sheet(raw, band, file_name, sheet):
+    """Parse a one-circle-per-sheet workbook (800/900/1800 MHz)"""
+    state = canonical_name(sheet.rsplit(' (', 1)[0])
+    first = raw[0]
+    block_no = pd.to_numeric(first, errors='coerce')
+    is_block = block_no.notna().to_numpy()
+    rows = raw[is_block]
+
+    blocks = pd.DataFrame({
+        'Band': band,
+        'State': state,
+        'Block': block_no[is_block].astype(int).to_numpy(),
+        'UL_Start_MHz': pd.to_numeric(rows[1], errors='coerce').to_numpy(),
+        'UL_Stop_MHz': pd.to_numeric(rows[2], errors='coerce').to_numpy(),
+        'Start_MHz': pd.to_numeric(rows[3], errors='coerce').to_numpy(),
+        'Stop_MHz': pd.to_numeric(rows[4], errors='coerce').to_numpy(),
+        'Quantum_MHz': pd.to_numeric(rows[5], errors='coerce').to_numpy(),
+        'File': file_name,
+        'Sheet': sheet,
+        'Row': rows.index.to_numpy() + 1,
+    })
+
+    labels = first.astype(str)
+    declared_blocks = raw.loc[labels.str.startswith('Total No. of Blocks'), 1]
+    declared_quantum = raw.loc[labels.str.startswith('Total Quantum'), 1]
+    totals = pd.DataFrame({
+        'Band': [band],
+        'State': [state],
+        'Declared_Blocks': [pd.to_numeric(declared_blocks, errors='coerce').iloc[0] if len(declared_blocks) else np.nan],
+        'Declared_Quantum_MHz': [pd.to_numeric(declared_quantum, errors='coerce').iloc[0] if len(declared_quantum) else np.nan],
+        'File': [file_name],
+        'Sheet': [sheet],
+        'Row': [declared_quantum.index[0] + 1 if len(declared_quantum) else 0],
+    })
+    return blocks, totals
+
+
+def _parse_band_sheet(raw, band, file_name, sheet):
+    """Parse a one-band-per-sheet workbook (2100 MHz and above)"""
+    header = raw.iloc[0].tolist()
+    area_col = _find_column(header, 'Service Area')
+    block_col = _find_column(header, 'Block No')
+    total_col = _find_column(header, 'Total Quantum')
+    ul_start_col = _find_column(header, 'Uplink Frequency Start')
+    ul_stop_col = _find_column(header, 'Uplink Frequency Stop')
+    start_col = _find_column(header, 'Downlink Frequency Start')
+    stop_col = _find_column(header, 'Downlink Frequency Stop')
+    if start_col is None:
+        start_col = _find_column(header, 'Start')
+        stop_col = _find_column(header, 'Stop')
+
+    body = raw.iloc[1:]
+    block_no = pd.to_numeric(body[block_col], errors='coerce')
+    body = body[block_no.notna().to_numpy()]
+    block_no = block_no[block_no.notna()]
+    area = body[area_col].ffill().map(canonical_name)
+
+    start = pd.to_numeric(body[start_col], errors='coerce').to_numpy()
+    stop = pd.to_numeric(body[stop_col], errors='coerce').to_numpy()
+    if ul_start_col is not None:
+        ul_start = pd.to_numeric(body[ul_start_col], errors='coerce').to_numpy()
+        ul_stop = pd.to_numeric(body[ul_stop_col], errors='coerce').to_numpy()
+    else:
+        ul_start = np.full(len(body), np.nan)
+        ul_stop = np.full(len(body), np.nan)
+
+    blocks = pd.DataFrame({
+        'Band': band,
+        'State': area.to_numpy(),
+        'Block': block_no.astype(int).to_numpy(),
+        'UL_Start_MHz': ul_start,
+        'UL_Stop_MHz': ul_stop,
+        'Start_MHz': start,
+        'Stop_MHz': stop,
+        'Quantum_MHz': stop - start,
+        'File': file_name,
+        'Sheet': sheet,
+        'Row': body.index.to_numpy() + 1,
+    })
+
+    # The declared total sits on the first row of each service area
+    first_rows = body[body[area_col].notna().to_numpy()]
+    first_blocks = blocks[body[area_col].notna().to_numpy()]
+    totals = pd.DataFrame({
+        'Band': band,
+        'State': first_blocks['State'].to_numpy(),
+        # These sheets carry no "Total No. of Blocks" figure of their own
+        'Declared_Blocks': np.nan,
+        'Declared_Quantum_MHz': pd.to_numeric(first_rows[total_col], errors='coerce').to_numpy(),
+        'File': file_name,
+        'Sheet': sheet,
+        'Row': first_blocks['Row'].to_numpy(),
+    })
+    return blocks, totals
+
+
+def load_block_table(data_dir=DATA_DIR):
+    """Read every workbook into one block table and a table of declared totals"""
+    block_frames = []
+    total_frames = []
+    for file_name in dict.fromkeys(WORKBOOKS.values()):
+        sheets = pd.read_excel(os.path.join(data_dir, file_name), sheet_name=None, header=None)
+        file_bands = [band for band, name in WORKBOOKS.items() if name == file_name]
+        for sheet, raw in sheets.items():
+            if len(file_bands) == 1:
+                blocks, totals = _parse_circle_sheet(raw, file_bands[0], file_name, sheet)
+            elif sheet in file_bands:
+                blocks, totals = _parse_band_sheet(raw, sheet, file_name, sheet)
+            else:
+                continue
+            block_frames.append(blocks)
+            total_frames.append(totals)
+
+    blocks = pd.concat(block_frames, ignore_index=True)
+    totals = pd.concat(total_frames, ignore_index=True)
+    blocks['Circle_ID'] = circle_ids(blocks['State'])
+    totals['Circle_ID'] = circle_ids(totals['State'])
+    return blocks[BLOCK_TABLE_COLUMNS], totals[TOTALS_COLUMNS]
+
+
+def band_tables(blocks):
+    """The dashboard's per-band tables, summed from the workbook block table
+
+    One table each for 800, 900 and 1800 MHz (blocks listed and quantum of
+    every circle the band is offered in) and one for 2100 MHz and above
+    (quantum of every circle any of them is offered in, 0 where a band is
+    not), each in Circle_ID order with the circle key attached.
+    """
+    blocks = blocks[blocks['Circle_ID'] >= 0]
+    listed = blocks.groupby(['Band', 'Circle_ID'])
+    counts = listed['Block'].size()
+    # Sums of decimal block sizes, without the binary rounding noise
+    quantum = listed['Quantum_MHz'].sum().round(6)
+    names = np.array(CIRCLE_NAMES, dtype=object)
+    tables = []
+    for band in BLOCK_COLUMNS:
+        ids = quantum.loc[band].index.to_numpy()
+        tables.append(pd.DataFrame({
+            'State': names[ids],
+            BLOCK_COLUMNS[band]: counts.loc[band].to_numpy(),
+            QUANTUM_COLUMNS[band]: quantum.loc[band].to_numpy(),
+            'Circle_ID': ids,
+        }))
+    high = [band for band in BANDS if band not in BLOCK_COLUMNS]
+    wide = quantum[quantum.index.isin(high, level=0)].unstack(0, fill_value=0.0)
+    wide = wide.reindex(columns=high, fill_value=0.0).sort_index()
+    df_high = pd.DataFrame({'State': names[wide.index.to_numpy()]})
+    for band in high:
+        mhz = wide[band].to_numpy()
+        # Bands of whole-MHz blocks are shown in whole MHz
+        df_high[QUANTUM_COLUMNS[band]] = mhz.astype(np.int64) if (mhz % 1 == 0).all() else mhz
+    df_high['Circle_ID'] = wide.index.to_numpy()
+    return tuple(tables) + (df_high,)
+
+
+def _circle_id_column(df):
+    if 'Circle_ID' in df.columns:
+        return df['Circle_ID'].to_numpy()
+    return circle_ids(df['State'])
+
+
+def band_summary(df_900, df_1800, df_high, df_800=None):
+    """Stack the dashboard's per-band DataFrames into one long Band/State table"""
+    frames = []
+    per_band = {'900 MHz': df_900, '1800 MHz': df_1800}
+    if df_800 is not None:
+        per_band['800 MHz'] = df_800
+    for band in BANDS:
+        if band in per_band:
+            df = per_band[band]
+            frames.append(pd.DataFrame({
+                'Band': band,
+                'Circle_ID': _circle_id_column(df),
+                'State': df['State'].to_numpy(),
+                'Blocks': df[BLOCK_COLUMNS[band]].to_numpy(dtype=float),
+                'Quantum_MHz': df[QUANTUM_COLUMNS[band]].to_numpy(dtype=float),
+            }))
+        elif QUANTUM_COLUMNS[band] in df_high.columns:
+            frames.append(pd.DataFrame({
+                'Band': band,
+                'Circle_ID': _circle_id_column(df_high),
+                'State': df_high['State'].to_numpy(),
+                'Blocks': np.nan,
+                'Quantum_MHz': df_high[QUANTUM_COLUMNS[band]].to_numpy(dtype=float),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def spectrum_by_circle(df_900, df_1800, df_high, df_800=None):
+    """One row per canonical circle with every band's blocks and quantum side by side
+
+    Each band table is scattered into place by its integer Circle_ID, so no
+    string joins are needed; circles a band does not offer get 0.
+    """
+    wide = circle_dimension().rename(columns={'Circle': 'State'}).reset_index()
+    per_band = {'800 MHz': df_800, '900 MHz': df_900, '1800 MHz': df_1800}
+    for band in BANDS:
+        df = per_band.get(band, df_high)
+        if df is None or QUANTUM_COLUMNS[band] not in df.columns:
+            continue
+        ids = _circle_id_column(df)
+        known = ids >= 0
+        if band in BLOCK_COLUMNS:
+            wide[BLOCK_COLUMNS[band]] = align(ids[known], df[BLOCK_COLUMNS[band]].to_numpy()[known])
+        wide[QUANTUM_COLUMNS[band]] = align(ids[known], df[QUANTUM_COLUMNS[band]].to_numpy()[known])
+    return wide
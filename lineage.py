@@ -0,0 +1,136 @@
+"""Lineage of the circle cube: the workbook file, sheet and rows behind every band x circle value
+
+Each cell of the cube (a band in a circle) comes from a run of blocks in the
+DoT workbooks. The lineage index keeps them as integer arrays only, in CSR
+layout: block positions sorted by (band, circle, sheet, row) and an offset
+array with one entry per cell, so the blocks of a cell are one slice and the
+blocks of a whole band are one slice too. Source sheets are a small table of
+(file, sheet) pairs referenced by an int16 code; rows are int32. Nothing is
+kept per value as a Python object, and a trace of any figure is a handful of
+slices and one pass that folds consecutive rows into ranges.
+
+Measure what the index costs next to the tables it describes:
+
+    python lineage.py                 # exit status 1 above the budget
+    python lineage.py --budget 0.05
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, N_CIRCLES
+from duplex import band_index
+from ingest import BANDS
+
+N_CELLS = len(BANDS) * N_CIRCLES
+
+# Most memory the lineage index may take, as a share of the tables it describes
+MEMORY_BUDGET = 0.10
+
+TRACE_COLUMNS = ['Band', 'Circle', 'File', 'Sheet', 'First_Row', 'Last_Row', 'Blocks', 'Quantum_MHz']
+
+
+class Lineage:
+    """Workbook rows behind every band x circle cell of the cube, from the block table"""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        band, circle = band_index(blocks['Band']), blocks['Circle_ID'].to_numpy()
+        cell = band * N_CIRCLES + circle
+        source, sources = pd.factorize(pd.MultiIndex.from_arrays([blocks['File'], blocks['Sheet']]))
+        row = blocks['Row'].to_numpy()
+        # Blocks of unknown bands or circles are left out
+        known = (band >= 0) & (circle >= 0)
+        order = np.flatnonzero(known)[np.lexsort((row[known], source[known], cell[known]))]
+
+        self.sources = list(sources)
+        self.block = order.astype(np.int32)
+        self.source = source[order].astype(np.int16)
+        self.row = row[order].astype(np.int32)
+        self.offsets = np.searchsorted(cell[order], np.arange(N_CELLS + 1)).astype(np.int32)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the index arrays"""
+        return self.block.nbytes + self.source.nbytes + self.row.nbytes + self.offsets.nbytes
+
+    def positions(self, bands=None, circles=None):
+        """Positions in the index of the blocks behind the given bands and circles (all when None)"""
+        bands = range(len(BANDS)) if bands is None else band_index(bands)
+        if circles is None:
+            # A band's cells are adjacent, so the whole band is one slice
+            slices = [(self.offsets[b * N_CIRCLES], self.offsets[(b + 1) * N_CIRCLES]) for b in bands]
+        else:
+            circles = np.asarray(circles, dtype=int)
+            cells = (np.asarray(bands)[:, None] * N_CIRCLES + circles[None, :]).ravel()
+            slices = zip(self.offsets[cells], self.offsets[cells + 1])
+        return np.concatenate([np.arange(start, stop) for start, stop in slices] or [np.empty(0, dtype=int)])
+
+    def rows(self, bands=None, circles=None):
+        """The block-table rows behind the given bands and circles, with their file, sheet and row"""
+        return self.blocks.iloc[self.block[self.positions(bands, circles)]].reset_index(drop=True)
+
+    def trace(self, bands=None, circles=None):
+        """Source of the given bands and circles as ranges of consecutive workbook rows, one per
+        band, circle and sheet run, with the blocks and MHz each range holds"""
+        positions = self.positions(bands, circles)
+        if not len(positions):
+            return pd.DataFrame(columns=TRACE_COLUMNS)
+        block, source, row = self.block[positions], self.source[positions], self.row[positions]
+        cell = np.searchsorted(self.offsets, positions, side='right') - 1
+        # A range ends where the cell or sheet changes or a row is skipped
+        starts = np.flatnonzero(np.r_[True, (np.diff(cell) != 0) | (np.diff(source) != 0) | (np.diff(row) != 1)])
+        ends = np.r_[starts[1:], len(positions)] - 1
+        quantum = np.add.reduceat(self.blocks['Quantum_MHz'].to_numpy(dtype=float)[block], starts)
+        files = [self.sources[code][0] for code in source[starts]]
+        sheets = [self.sources[code][1] for code in source[starts]]
+        return pd.DataFrame({
+            'Band': np.array(BANDS, dtype=object)[cell[starts] // N_CIRCLES],
+            'Circle': np.array(CIRCLE_NAMES, dtype=object)[cell[starts] % N_CIRCLES],
+            'File': files,
+            'Sheet': sheets,
+            'First_Row': row[starts],
+            'Last_Row': row[ends],
+            'Blocks': ends - starts + 1,
+            'Quantum_MHz': quantum.round(4),
+        }, columns=TRACE_COLUMNS)
+
+
+def table_bytes(frames):
+    """Memory held by DataFrames, counting the text they reference"""
+    return sum(int(frame.memory_usage(deep=True).sum()) for frame in frames)
+
+
+def benchmark(tables):
+    """Bytes of the tables, of the lineage index arrays and of everything building the index allocates"""
+    tracemalloc.start()
+    lineage = Lineage(tables[5])
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table_bytes(tables), lineage.nbytes, allocated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--budget', type=float, default=MEMORY_BUDGET,
+                        help="largest allowed overhead as a share of the tables (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    # The tables the dashboard publishes: base tables, cube, block table and declared totals
+    from dashboard import build_tables
+    tables = build_tables()
+    tables_bytes, index_bytes, allocated = benchmark(tables)
+    overhead = allocated / tables_bytes
+    print(f"blocks:          {len(tables[5]):,}")
+    print(f"tables:          {tables_bytes / 1024:,.1f} KiB")
+    print(f"index arrays:    {index_bytes / 1024:,.1f} KiB")
+    print(f"lineage (total): {allocated / 1024:,.1f} KiB = {overhead:.1%} of the tables (budget {args.budget:.0%})")
+    return 0 if overhead <= args.budget else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,471 @@
+"""Auction-day live mode: round deltas from a local feed applied incrementally to the auction cube
+
+During the auction each round's provisional results arrive as a delta: rows
+of the round-log format (see replay.py) for the bids that changed,
+
+    Round, Circle, Band, Bidder, Demand_Blocks, Price_Cr
+
+The server process picks deltas up from two local feeds:
+
+    file drop   CSV/JSON/JSON-lines files written to LIVE_DIR (moved to
+                applied/ or rejected/ once read; write elsewhere and
+                rename, or use `python live.py drop`)
+    socket      one delta per line on 127.0.0.1:LIVE_PORT, a JSON array of
+                rows or {"bids": [...]} (`python live.py send`)
+
+A `LiveAuction` keeps the state as arrays over bidder x band x circle and
+the aggregate cube (demand, excess demand, price, increment and provisional
+value per band x circle). A delta scatters its rows into place and
+recomputes the aggregates of only the cells it touches, then rewrites the
+snapshot static/live.json with only the bands it touched serialized again.
+Only the server process that holds the socket port runs the feeds.
+
+Sessions do not rerun the script to see a round. The Live Auction page
+embeds static/live.html, which polls the snapshot through Streamlit's static
+file serving every LIVE_REFRESH_SECONDS (a few KB per band) and redraws in
+the browser when the version moved. A new round costs the server one file
+write however many sessions are open, and a poll costs a static file
+response; a Streamlit rerun per session and poll would take more than a
+core at 50 sessions.
+
+Measure update-to-screen latency against a headless server:
+
+    python live.py bench --sessions 50 --rounds 10
+
+Set SPECTRUM_LIVE_DIR and SPECTRUM_LIVE_PORT to move the feeds.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import random
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, N_CIRCLES, circle_ids
+from data_plane import ROOT as DATA_PLANE_ROOT
+from duplex import band_index
+from ingest import BANDS, load_block_table
+from replay import LOG_COLUMNS, load_round_log, round_log_frame, round_log_records, supply_blocks
+
+LIVE_DIR = os.environ.get('SPECTRUM_LIVE_DIR') or os.path.join(DATA_PLANE_ROOT, 'live')
+LIVE_PORT = int(os.environ.get('SPECTRUM_LIVE_PORT', 8765))
+# Served by Streamlit as app/static/ when server.enableStaticServing is on
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+SNAPSHOT_NAME = 'live.json'
+
+# Seconds between a browser's checks of the snapshot
+LIVE_REFRESH_SECONDS = 0.25
+# Seconds between scans of the drop directory
+POLL_SECONDS = 0.05
+# Feed errors kept for display
+MAX_ERRORS = 20
+
+LOG_EXTENSIONS = ('.csv', '.json', '.jsonl', '.ndjson')
+
+LiveState = collections.namedtuple('LiveState', [
+    'version',     # deltas applied so far
+    'round',       # latest round seen (None before the first delta)
+    'aggregate',   # band x circle: blocks demanded by all bidders
+    'excess',      # band x circle: aggregate demand minus blocks on offer
+    'price',       # band x circle: price per block (₹ Cr, NaN before the first bid)
+    'increment',   # band x circle: price change made by the cell's last priced delta
+    'value',       # band x circle: provisional value (₹ Cr) of cells whose demand fits supply
+    'changed',     # band x circle: cells the last delta touched
+    'received',    # time.time() the last delta arrived
+    'applied',     # time.time() it was applied
+])
+
+
+# The auction whose feeds this process last started
+_started = []
+_started_lock = threading.Lock()
+
+
+class LiveAuction:
+    """Auction state fed by round deltas, with the aggregate cube updated cell by cell
+
+    `supply` is the band x circle array of blocks on offer (see
+    `replay.supply_blocks`). Every change is published to `static_dir`.
+    """
+
+    def __init__(self, supply, directory=LIVE_DIR, port=LIVE_PORT, static_dir=STATIC_DIR):
+        self.supply = np.asarray(supply, dtype=float)
+        self.directory = directory
+        self.port = port
+        self.snapshot_path = os.path.join(static_dir, SNAPSHOT_NAME)
+        self.feeding = False
+        self.bidders = []
+        self.errors = collections.deque(maxlen=MAX_ERRORS)
+        self._demand = np.zeros((0,) + self.supply.shape)
+        self._aggregate = np.zeros(self.supply.shape)
+        self._price = np.full(self.supply.shape, np.nan)
+        self._increment = np.zeros(self.supply.shape)
+        self._value = np.zeros(self.supply.shape)
+        self._changed = np.zeros(self.supply.shape, dtype=bool)
+        self._round = None
+        self._received = self._applied = None
+        self.version = 0
+        # Serialized state of every band, and the bands changed since the last snapshot
+        self._bands = {}
+        self._dirty = set(range(len(BANDS)))
+        self._feeds = []
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+
+    def apply(self, log, received=None):
+        """Apply one delta (a frame of LOG_COLUMNS); later rows win. Returns the cells it touched"""
+        log = round_log_frame(log)
+        received = time.time() if received is None else received
+        band = band_index(log['Band'])
+        circle = circle_ids(log['Circle'])
+        with self._lock:
+            new = [name for name in dict.fromkeys(log['Bidder']) if name not in self.bidders]
+            if new:
+                self.bidders += new
+                self._demand = np.concatenate([self._demand, np.zeros((len(new),) + self.supply.shape)])
+            bidder = pd.Index(self.bidders).get_indexer(log['Bidder'])
+            self._demand[bidder, band, circle] = log['Demand_Blocks'].to_numpy(dtype=float)
+            prices = log['Price_Cr'].to_numpy(dtype=float)
+            priced = ~np.isnan(prices)
+            before = self._price[band[priced], circle[priced]]
+            self._price[band[priced], circle[priced]] = prices[priced]
+            self._increment[band[priced], circle[priced]] = np.nan_to_num(prices[priced] - before)
+
+            # Only the touched cells are re-aggregated
+            cells = np.unique(band * N_CIRCLES + circle)
+            b, c = np.divmod(cells, N_CIRCLES)
+            aggregate = self._demand[:, b, c].sum(axis=0)
+            self._aggregate[b, c] = aggregate
+            cleared = aggregate <= self.supply[b, c]
+            self._value[b, c] = np.where(cleared, np.nan_to_num(aggregate * self._price[b, c]), 0.0)
+            # Last delta's cells are cleared in the bands it marked, so those are re-serialized too
+            self._dirty.update(np.flatnonzero(self._changed.any(axis=1)))
+            self._dirty.update(b)
+            self._changed[:] = False
+            self._changed[b, c] = True
+
+            latest = int(log['Round'].max())
+            self._round = latest if self._round is None else max(self._round, latest)
+            self._received, self._applied = received, time.time()
+            self.version += 1
+        self.publish()
+        return len(cells)
+
+    def _state(self):
+        return LiveState(self.version, self._round, self._aggregate.copy(), self._aggregate - self.supply,
+                         self._price.copy(), self._increment.copy(), self._value.copy(), self._changed.copy(),
+                         self._received, self._applied)
+
+    def state(self):
+        """Copy of the current state"""
+        with self._lock:
+            return self._state()
+
+    def frame(self, state, band):
+        """Per circle state of one band (circles with blocks on offer or demand)"""
+        i = BANDS.index(band)
+        circles = np.flatnonzero((self.supply[i] > 0) | (state.aggregate[i] > 0))
+        return pd.DataFrame({
+            'Circle': np.array(CIRCLE_NAMES, dtype=object)[circles],
+            'Supply_Blocks': self.supply[i, circles],
+            'Demand_Blocks': state.aggregate[i, circles],
+            'Excess_Demand': state.excess[i, circles],
+            'Price_Cr': state.price[i, circles],
+            'Increment_Cr': state.increment[i, circles],
+            'Provisional_Value_Cr': state.value[i, circles],
+            'Updated': state.changed[i, circles],
+        })
+
+    def publish(self):
+        """Write the current state to the snapshot, serializing only the bands changed since the last one"""
+        with self._publish_lock:
+            with self._lock:
+                state = self._state()
+                dirty, self._dirty = self._dirty, set()
+                errors = list(self.errors)
+            for i in dirty:
+                table = self.frame(state, BANDS[i])
+                self._bands[BANDS[i]] = {column: [None if value != value else value for value in table[column].tolist()]
+                                         for column in table.columns}
+            snapshot = {
+                'version': state.version,
+                'round': state.round,
+                'received': state.received,
+                'applied': state.applied,
+                'excess_cells': int((state.excess > 0).sum()),
+                'value': float(state.value.sum()),
+                'refresh': LIVE_REFRESH_SECONDS,
+                'errors': errors,
+                'bands': self._bands,
+            }
+            # Written alongside and renamed, so a poll never reads half a snapshot
+            directory = os.path.dirname(self.snapshot_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=directory, prefix='.live-', suffix='.json')
+            with os.fdopen(fd, 'w') as target:
+                json.dump(snapshot, target, separators=(',', ':'))
+            os.replace(temporary, self.snapshot_path)
+
+    def error(self, source, message):
+        self.errors.append(f"{time.strftime('%H:%M:%S')} {source}: {message}")
+        if self.feeding:
+            self.publish()
+
+    def start(self):
+        """Start the file-drop and socket feeds, unless another process already holds the socket port
+
+        One auction feeds per process: the feeds of the one started before (an
+        older data version) are stopped first, freeing the port.
+        """
+        with _started_lock:
+            if _started and _started[0] is not self:
+                _started.pop().close()
+            _started[:] = [self]
+        try:
+            server = SocketFeed(self)
+        except OSError:
+            # That process feeds the snapshot every session reads
+            return self
+        os.makedirs(self.directory, exist_ok=True)
+        self.feeding = True
+        self.publish()
+        threading.Thread(target=server.serve_forever, name='live-socket', daemon=True).start()
+        drop = FileDropFeed(self)
+        drop.start()
+        self._feeds = [server, drop]
+        return self
+
+    def close(self):
+        """Stop the feeds"""
+        for feed in self._feeds:
+            feed.shutdown()
+        self._feeds = []
+
+
+class FileDropFeed(threading.Thread):
+    """Applies round-log files dropped into the live directory, oldest name first"""
+
+    def __init__(self, auction, poll=POLL_SECONDS):
+        super().__init__(name='live-drop', daemon=True)
+        self.auction = auction
+        self.poll = poll
+        self._stopped = threading.Event()
+
+    def run(self):
+        directory = self.auction.directory
+        for folder in ('applied', 'rejected'):
+            os.makedirs(os.path.join(directory, folder), exist_ok=True)
+        while not self._stopped.is_set():
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if name.startswith('.') or not name.lower().endswith(LOG_EXTENSIONS) or not os.path.isfile(path):
+                    continue
+                folder = 'applied'
+                try:
+                    self.auction.apply(load_round_log(path), received=os.path.getmtime(path))
+                except Exception as e:
+                    # Whatever is wrong with one file, the feed goes on with the next
+                    self.auction.error(name, e)
+                    folder = 'rejected'
+                try:
+                    os.replace(path, os.path.join(directory, folder, name))
+                except OSError as e:
+                    self.auction.error(name, e)
+            self._stopped.wait(self.poll)
+
+    def shutdown(self):
+        self._stopped.set()
+
+
+class _DeltaHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        auction = self.server.auction
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            received = time.time()
+            try:
+                auction.apply(pd.DataFrame.from_records(round_log_records(json.loads(line))), received=received)
+                reply = b'ok\n'
+            except Exception as e:
+                auction.error('socket', e)
+                reply = f'error: {e}\n'.encode()
+            self.wfile.write(reply)
+
+
+class SocketFeed(socketserver.ThreadingTCPServer):
+    """Applies the deltas sent to 127.0.0.1 on the auction's port, one JSON array of rows per line"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, auction):
+        self.auction = auction
+        super().__init__(('127.0.0.1', auction.port), _DeltaHandler)
+
+    def shutdown(self):
+        super().shutdown()
+        self.server_close()
+
+
+def drop(path, directory=LIVE_DIR):
+    """Place a round-log file in the drop directory atomically (written alongside, then renamed)"""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.time_ns()}_{os.path.basename(path)}"
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.')
+    with os.fdopen(fd, 'wb') as target, open(path, 'rb') as source:
+        shutil.copyfileobj(source, target)
+    os.replace(temporary, os.path.join(directory, name))
+    return name
+
+
+def send(rows, port=LIVE_PORT, timeout=5.0):
+    """Send one delta (records of LOG_COLUMNS) to the socket feed; returns the server's reply"""
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as connection:
+        connection.sendall(json.dumps(rows).encode() + b'\n')
+        connection.shutdown(socket.SHUT_WR)
+        return connection.makefile().readline().strip()
+
+
+def bench_delta(round_number, supply, rng):
+    """A synthetic delta: new demand and prices in a few band x circle cells"""
+    bands, circles = np.nonzero(supply)
+    pick = rng.choice(len(bands), size=min(6, len(bands)), replace=False)
+    return [{'Round': round_number, 'Circle': CIRCLE_NAMES[circles[i]], 'Band': BANDS[bands[i]],
+             'Bidder': f"Bidder {'ABC'[rng.integers(3)]}",
+             'Demand_Blocks': int(rng.integers(0, 2 * supply[bands[i], circles[i]] + 1)),
+             'Price_Cr': round(float(100 + round_number * rng.random()), 2)} for i in pick]
+
+
+async def poll_snapshot(host, port, seen, interval):
+    """Poll app/static/live.json as the live page does, recording when each round first arrives"""
+    connection = None
+    while True:
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(host, port)
+            reader, writer = connection
+            writer.write(f"GET /app/static/{SNAPSHOT_NAME} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            status = (await reader.readline()).split()[1]
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+            if status == b'200':
+                seen.setdefault(json.loads(body)['round'], time.time())
+        except (OSError, IndexError, asyncio.IncompleteReadError):
+            # The snapshot was replaced while being sent; the browser's fetch fails too and tries again
+            if connection is not None:
+                connection[1].close()
+            connection = None
+        await asyncio.sleep(interval)
+
+
+async def run_bench(url, port, supply, sessions, rounds, interval, seed, pid=None):
+    """Open `sessions` sessions on the Live Auction page, send `rounds` deltas and time each one to every
+    screen; returns the latencies, the updates that never arrived and the server's CPU share meanwhile
+
+    Each session polls the snapshot the way its browser would; the script renders only on navigation.
+    """
+    from load_test import NAV_LABEL, Session, _read_proc
+    rng = np.random.default_rng(seed)
+    host, server_port = url.split('://')[1].split(':')
+
+    opened = []
+    for number in range(sessions):
+        session = Session(url, number, 0, random.Random(seed + number))
+        await session.open()
+        await session.set(session.widgets[NAV_LABEL], "Live Auction")
+        opened.append(session)
+
+    seen = {session.number: {} for session in opened}
+    pollers = [asyncio.create_task(poll_snapshot(host, int(server_port), seen[session.number], LIVE_REFRESH_SECONDS))
+               for session in opened]
+    sent = {}
+    await asyncio.sleep(1.0)
+    _, cpu_before = _read_proc(pid) if pid else (None, None)
+    started = time.perf_counter()
+    for round_number in range(1, rounds + 1):
+        sent[round_number] = time.time()
+        reply = await asyncio.to_thread(send, bench_delta(round_number, supply, rng), port)
+        if reply != 'ok':
+            sys.exit(f"Live feed rejected the delta: {reply}")
+        await asyncio.sleep(interval)
+    _, cpu_after = _read_proc(pid) if pid else (None, None)
+    cpu_share = (cpu_after - cpu_before) / (time.perf_counter() - started) if cpu_before is not None else None
+    for task in pollers:
+        task.cancel()
+    await asyncio.gather(*pollers, return_exceptions=True)
+    for session in opened:
+        await session.close()
+
+    latencies = np.array([seen[number][key] - sent[key] for number in seen for key in sent if key in seen[number]])
+    missed = sessions * rounds - len(latencies)
+    return latencies, missed, cpu_share
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    drop_parser = commands.add_parser('drop', help="place a round-log file in the drop directory")
+    drop_parser.add_argument('file')
+    drop_parser.add_argument('--dir', default=LIVE_DIR)
+    send_parser = commands.add_parser('send', help="send a round-log file to the socket feed as one delta")
+    send_parser.add_argument('file')
+    send_parser.add_argument('--port', type=int, default=LIVE_PORT)
+    bench_parser = commands.add_parser('bench', help="time deltas to every screen of a headless server")
+    bench_parser.add_argument('--script', default='spectrum_dashboard.py')
+    bench_parser.add_argument('--sessions', type=int, default=50)
+    bench_parser.add_argument('--rounds', type=int, default=10)
+    bench_parser.add_argument('--interval', type=float, default=2.0, help="seconds between deltas")
+    bench_parser.add_argument('--port', type=int, default=8598, help="port for the server started by the benchmark")
+    bench_parser.add_argument('--budget', type=float, default=1.0, help="p95 latency target (s)")
+    bench_parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == 'drop':
+        print(drop(args.file, args.dir))
+        return 0
+    if args.command == 'send':
+        log = load_round_log(args.file)
+        print(send(json.loads(log[LOG_COLUMNS].to_json(orient='records')), args.port))
+        return 0
+
+    from load_test import start_server
+    supply = supply_blocks(load_block_table()[0])
+    feed_port = args.port + 1
+    os.environ['SPECTRUM_LIVE_PORT'] = str(feed_port)
+    os.environ['SPECTRUM_LIVE_DIR'] = tempfile.mkdtemp(prefix='spectrum-live-')
+    server = start_server(args.script, args.port)
+    try:
+        latencies, missed, cpu_share = asyncio.run(run_bench(f'ws://localhost:{args.port}', feed_port, supply,
+                                                             args.sessions, args.rounds, args.interval, args.seed,
+                                                             server.pid))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(os.environ['SPECTRUM_LIVE_DIR'], ignore_errors=True)
+    if not len(latencies):
+        sys.exit("No update reached any session")
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{args.sessions} sessions, {args.rounds} deltas: update-to-screen p50 {p50:.0f} ms   p95 {p95:.0f} ms   "
+          f"p99 {p99:.0f} ms   max {latencies.max() * 1000:.0f} ms   missed {missed}")
+    if cpu_share is not None:
+        print(f"server CPU: {cpu_share:.0%} of one core")
+    return 0 if missed == 0 and p95 <= args.budget * 1000 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
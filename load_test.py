@@ -0,0 +1,341 @@
+"""Headless load test for the dashboards: scripted analyst sessions over Streamlit's websocket
+
+Each simulated session talks to the server exactly like a browser tab does:
+it opens /_stcore/stream, renders the app, then walks every page of the
+"Select Analysis View" sidebar and steps through every selectbox, multiselect
+and select_slider on it. Widgets inside a fragment rerun only that fragment,
+as in the browser. Run it against either script:
+
+    python load_test.py spectrum_analysis2.py --sessions 10
+    python load_test.py spectrum_analysis6.py --sessions 25 --rounds 2 --think 0.5
+    python load_test.py --url ws://localhost:8501 --pid 12345 --sessions 10
+
+Reports rerun latency percentiles, throughput, server CPU per rerun and
+server memory per connected session. Needs the `websockets` package, which
+recent Streamlit releases install alongside themselves.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+NAV_LABEL = "Select Analysis View"
+WIDGET_TYPES = ('selectbox', 'multiselect', 'slider')
+
+# How many circles the scripted multiselect keeps selected at a time
+MULTISELECT_SIZE = 4
+
+
+def _proto():
+    """Streamlit's wire messages; imported lazily so --help works anywhere"""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    return BackMsg, ForwardMsg
+
+
+def _connect():
+    try:
+        from websockets.asyncio.client import connect
+    except ImportError:
+        sys.exit("load_test.py needs the 'websockets' package: pip install websockets")
+    return connect
+
+
+class Widget:
+    """What a session knows about one rendered input widget"""
+
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.id = proto.id
+        self.label = proto.label
+        self.options = list(proto.options)
+        self.fragment_id = fragment_id
+
+
+class Session:
+    """One simulated browser tab"""
+
+    def __init__(self, url, number, think, rng):
+        self.url = url
+        self.number = number
+        self.think = think
+        self.rng = rng
+        self.ws = None
+        self.page_script_hash = ''
+        self.widgets = {}
+        self.values = {}
+        self.latencies = []
+        # Seconds from each rerun to its first element on screen
+        self.paints = []
+        self.kinds = []
+        self.errors = 0
+
+    async def open(self):
+        self.ws = await _connect()(f"{self.url}/_stcore/stream", subprotocols=['streamlit'],
+                                   max_size=None, open_timeout=60)
+        await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _widget_states(self):
+        BackMsg, _ = _proto()
+        msg = BackMsg()
+        for widget_id, (kind, value) in self.values.items():
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            if kind == 'selectbox':
+                state.string_value = value
+            else:
+                state.string_array_value.data.extend(value)
+        return msg
+
+    async def rerun(self, fragment_id=''):
+        """Send one rerun and wait for the script (or fragment) to finish; returns seconds"""
+        _, ForwardMsg = _proto()
+        msg = self._widget_states()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        if not fragment_id:
+            # A full run re-renders every widget; fragment runs only replace their own
+            self.widgets = {}
+
+        started = time.perf_counter()
+        painted = None
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await self.ws.recv())
+            kind = reply.WhichOneof('type')
+            if kind == 'new_session':
+                self.page_script_hash = reply.new_session.page_script_hash
+            elif kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                if painted is None:
+                    painted = time.perf_counter() - started
+                element = reply.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    self.errors += 1
+                elif element_type in WIDGET_TYPES:
+                    widget = Widget(element_type, getattr(element, element_type), reply.delta.fragment_id)
+                    self.widgets[widget.label] = widget
+            elif kind == 'script_finished':
+                if reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                if reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        elapsed = time.perf_counter() - started
+        self.latencies.append(elapsed)
+        self.paints.append(elapsed if painted is None else painted)
+        self.kinds.append('fragment' if fragment_id else 'full')
+        return elapsed
+
+    async def set(self, widget, value):
+        """Change one widget the way a user would and time the resulting rerun"""
+        if self.think:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think))
+        if widget.kind == 'selectbox':
+            self.values[widget.id] = ('selectbox', value)
+        else:
+            self.values[widget.id] = (widget.kind, list(value))
+        await self.rerun(widget.fragment_id)
+
+    async def explore_page(self):
+        """Step through every option of every widget on the current page"""
+        labels = [label for label in self.widgets if label != NAV_LABEL]
+        for label in labels:
+            widget = self.widgets.get(label)
+            if widget is None:
+                continue
+            if widget.kind == 'multiselect':
+                # Rotate through the circles a few at a time
+                options = widget.options
+                for start in range(0, len(options), MULTISELECT_SIZE):
+                    await self.set(widget, options[start:start + MULTISELECT_SIZE])
+            elif widget.kind == 'slider' and not widget.options:
+                continue
+            else:
+                for option in widget.options[1:] + widget.options[:1]:
+                    await self.set(widget, [option] if widget.kind == 'slider' else option)
+
+    async def run(self, rounds):
+        await self.open()
+        nav = self.widgets[NAV_LABEL]
+        for _ in range(rounds):
+            for page in nav.options:
+                await self.set(nav, page)
+                await self.explore_page()
+
+
+def _read_proc(pid):
+    """Resident memory (bytes) and CPU seconds used by a process, from /proc"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmRSS:'))
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        return rss, cpu
+    except (OSError, StopIteration):
+        return None, None
+
+
+def start_server(script, port):
+    """Launch a headless Streamlit server for `script` and wait until it is healthy"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script, '--server.headless', 'true',
+         '--server.port', str(port), '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"Streamlit exited with code {server.returncode} while starting {script}")
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    sys.exit(f"Streamlit did not become healthy on port {port} within 60 s")
+
+
+async def run_load(url, sessions, rounds, think, ramp, pid, seed):
+    """Warm the caches with one session, then run `sessions` concurrent ones"""
+    warmup = Session(url, -1, 0, random.Random(seed))
+    await warmup.run(1)
+    await warmup.close()
+
+    rss_before, cpu_before = _read_proc(pid) if pid else (None, None)
+    peak_rss = rss_before
+    stop = asyncio.Event()
+
+    async def sample_memory():
+        nonlocal peak_rss
+        while not stop.is_set():
+            rss, _ = _read_proc(pid)
+            if rss is not None:
+                peak_rss = max(peak_rss, rss)
+            await asyncio.sleep(0.1)
+
+    async def one(number):
+        await asyncio.sleep(ramp * number / max(sessions, 1))
+        session = Session(url, number, think, random.Random(seed + number))
+        try:
+            await session.run(rounds)
+        finally:
+            await session.close()
+        return session
+
+    sampler = asyncio.create_task(sample_memory()) if pid else None
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(n) for n in range(sessions)), return_exceptions=True)
+    wall = time.perf_counter() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+    _, cpu_after = _read_proc(pid) if pid else (None, None)
+
+    finished = [r for r in results if isinstance(r, Session)]
+    failed = [r for r in results if not isinstance(r, Session)]
+    latencies = np.array([t for s in finished for t in s.latencies])
+    kinds = np.array([k for s in finished for k in s.kinds])
+    report = {
+        'url': url,
+        'sessions': sessions,
+        'failed_sessions': len(failed),
+        'script_errors': sum(s.errors for s in finished),
+        'reruns': int(len(latencies)),
+        'fragment_reruns': int((kinds == 'fragment').sum()),
+        'wall_s': wall,
+        'throughput_reruns_per_s': len(latencies) / wall if wall else 0.0,
+    }
+    for kind, subset in (('all', latencies), ('full', latencies[kinds == 'full']),
+                         ('fragment', latencies[kinds == 'fragment'])):
+        if len(subset):
+            p50, p95, p99 = np.percentile(subset, [50, 95, 99]) * 1000
+            report[f'{kind}_ms'] = {'p50': p50, 'p95': p95, 'p99': p99, 'max': subset.max() * 1000}
+    if rss_before is not None:
+        report['server_rss_mb'] = rss_before / 2**20
+        report['peak_rss_mb'] = peak_rss / 2**20
+        report['rss_per_session_mb'] = (peak_rss - rss_before) / 2**20 / max(sessions, 1)
+    if cpu_before is not None and len(latencies):
+        report['server_cpu_ms_per_rerun'] = (cpu_after - cpu_before) * 1000 / len(latencies)
+    if failed:
+        report['first_failure'] = repr(failed[0])
+    return report
+
+
+def print_report(name, report):
+    print(f"\n=== {name}: {report['sessions']} sessions ===")
+    print(f"reruns:         {report['reruns']} ({report['fragment_reruns']} fragment) in {report['wall_s']:.1f} s")
+    print(f"throughput:     {report['throughput_reruns_per_s']:.1f} reruns/s")
+    for kind in ('all', 'full', 'fragment'):
+        if f'{kind}_ms' in report:
+            ms = report[f'{kind}_ms']
+            print(f"latency {kind + ':':<9} p50 {ms['p50']:7.1f} ms   p95 {ms['p95']:7.1f} ms   "
+                  f"p99 {ms['p99']:7.1f} ms   max {ms['max']:7.1f} ms")
+    if 'server_cpu_ms_per_rerun' in report:
+        print(f"server CPU:     {report['server_cpu_ms_per_rerun']:.1f} ms per rerun")
+    if 'rss_per_session_mb' in report:
+        print(f"server memory:  {report['server_rss_mb']:.0f} MB idle, {report['peak_rss_mb']:.0f} MB peak, "
+              f"{report['rss_per_session_mb']:.2f} MB per session")
+    if report['failed_sessions'] or report['script_errors']:
+        print(f"failures:       {report['failed_sessions']} sessions, {report['script_errors']} script errors")
+        if 'first_failure' in report:
+            print(f"                {report['first_failure']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('scripts', nargs='*', help="dashboard scripts to serve and test, one after another")
+    parser.add_argument('--sessions', type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument('--rounds', type=int, default=1, help="times each session walks every page")
+    parser.add_argument('--think', type=float, default=0.0, help="mean pause between interactions (s)")
+    parser.add_argument('--ramp', type=float, default=1.0, help="seconds over which sessions connect")
+    parser.add_argument('--port', type=int, default=8599, help="port for servers started by this tool")
+    parser.add_argument('--url', help="test an already running server instead, e.g. ws://localhost:8501")
+    parser.add_argument('--pid', type=int, help="server process id for CPU/memory figures with --url")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the reports to this file")
+    args = parser.parse_args(argv)
+    if not args.scripts and not args.url:
+        parser.error("give at least one script or --url")
+
+    reports = {}
+    if args.url:
+        url = args.url.rstrip('/').replace('http://', 'ws://').replace('https://', 'wss://')
+        reports[url] = asyncio.run(run_load(url, args.sessions, args.rounds, args.think,
+                                            args.ramp, args.pid, args.seed))
+        print_report(url, reports[url])
+    for script in args.scripts:
+        server = start_server(script, args.port)
+        try:
+            reports[script] = asyncio.run(run_load(f'ws://localhost:{args.port}', args.sessions, args.rounds,
+                                                   args.think, args.ramp, server.pid, args.seed))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        print_report(script, reports[script])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 1 if any(r['failed_sessions'] or r['script_errors'] for r in reports.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
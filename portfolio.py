@@ -0,0 +1,224 @@
+"""Candidate block portfolios and their Pareto frontier over coverage, capacity and cost
+
+A portfolio is the MHz won in each band and circle. The enumerator draws
+tens of thousands of them from the lots a bidder can actually win (the
+cap-limited maximum of every band x circle, see `holdings.max_acquirable`),
+each lot taken whole, in part (whole blocks only) or not at all, with the
+number of lots per portfolio spread from one to as many as the caps allow. Every
+portfolio is scored on three objectives at once, as arrays over portfolios:
+
+    coverage   thousands of sites its 800/900 MHz saves (`coverage.sites_saved`)
+    capacity   downlink Mbps per cell summed over circles (`capacity.band_efficiency`)
+    cost       reserve-price outlay in ₹ crore, or occupied MHz while no
+               reserve prices are loaded (data/reserve_prices.csv)
+
+Non-dominated sorting peels the frontier off in fronts with a block sweep
+in NumPy: in lexicographic order a portfolio can only be dominated by one
+before it, and only a front member needs checking against, so every block
+is compared with the front found so far and with itself.
+
+Constraints are floors and ceilings on the objectives themselves (a budget,
+a minimum coverage, a minimum capacity). Whatever dominates a feasible
+portfolio is at least as good on every objective and so feasible too: a
+portfolio's front is the same with or without the constraints. Tightening
+or loosening them only masks the precomputed fronts, without sorting again.
+"""
+
+import collections
+import copy
+
+import numpy as np
+import pandas as pd
+
+from capacity import band_efficiency
+from circles import N_CIRCLES
+from coverage import SUB_GHZ_BANDS, sites_saved
+from duplex import PAIRED
+from holdings import compliant_bundles
+from ingest import BANDS, BLOCK_SIZE_MHZ
+
+# Portfolios drawn per enumeration
+N_CANDIDATES = 20000
+# Shares of a lot a portfolio may take (rounded down to whole blocks)
+LOT_SHARES = (0.5, 1.0)
+# Largest share of all lots one portfolio is drawn with; past about a quarter
+# the group caps rule out nearly every draw
+MAX_DENSITY = 0.3
+# Fronts ranked by the non-dominated sort; portfolios beyond them rank 0
+MAX_FRONTS = 3
+# Portfolios compared at once in the sweep
+SWEEP_BLOCK = 1024
+# Rounds of draws made to find enough cap-compliant portfolios
+MAX_DRAWS = 20
+
+Lots = collections.namedtuple('Lots', ['band', 'circle', 'mhz'])
+
+
+def portfolio_lots(most):
+    """Band, circle and winnable MHz of every lot in a band x circle matrix of acquirable MHz"""
+    band, circle = np.nonzero(most > 0)
+    return Lots(band, circle, most[band, circle])
+
+
+def enumerate_portfolios(lots, n=N_CANDIDATES, shares=LOT_SHARES, max_density=MAX_DENSITY, seed=0):
+    """`n` random portfolios as MHz won per lot, shaped (portfolio, lot)
+
+    Each portfolio takes every lot with its own probability, drawn uniformly
+    up to `max_density`, so small and large portfolios are equally
+    represented; a lot taken gets one of `shares` of its MHz in whole blocks.
+    """
+    rng = np.random.default_rng(seed)
+    block = np.array([BLOCK_SIZE_MHZ[band] for band in BANDS])[lots.band]
+    density = rng.random((n, 1)) * max_density
+    taken = rng.random((n, len(lots.mhz))) < density
+    share = np.asarray(shares)[rng.integers(len(shares), size=(n, len(lots.mhz)))]
+    return np.where(taken, np.floor(share * lots.mhz / block + 1e-9) * block, 0.0)
+
+
+def as_bundles(lots, won):
+    """MHz won per lot as (portfolio, band, circle) bundles"""
+    bundles = np.zeros((len(won), len(BANDS), N_CIRCLES))
+    bundles[:, lots.band, lots.circle] = won
+    return bundles
+
+
+def compliant_portfolios(lots, offered, n=N_CANDIDATES, seed=0):
+    """`n` distinct, non-empty portfolios (fewer if the draws run dry) that stay within every cap
+
+    Lots are each winnable alone, but several bands of a cap group can add up
+    past it, so draws are repeated until enough portfolios pass.
+    """
+    held = np.zeros_like(offered)
+    found = np.empty((0, len(lots.mhz)))
+    for attempt in range(MAX_DRAWS):
+        won = enumerate_portfolios(lots, n, seed=(seed, attempt))
+        won = won[won.any(axis=1)]
+        won = won[compliant_bundles(held, held, offered, as_bundles(lots, won))]
+        found = np.unique(np.concatenate([found, won]), axis=0)
+        if len(found) >= n:
+            break
+    # Drawing order rather than the sorted order of np.unique
+    return found[np.random.default_rng(seed).permutation(len(found))[:n]]
+
+
+def _dominated_by(points, others, earlier=None):
+    """Whether each of `points` is dominated by any of `others` that precedes it in lexicographic
+    order (all of them by default, else where the points x others mask `earlier` is set)
+
+    Nothing that precedes a point is worse on the first objective, so only the rest are compared.
+    """
+    if not len(others):
+        return np.zeros(len(points), dtype=bool)
+    # One points x others plane per objective keeps the temporaries two-dimensional
+    no_worse = np.ones((len(points), len(others)), dtype=bool) if earlier is None else earlier.copy()
+    better = others[None, :, 0] < points[:, None, 0]
+    for k in range(1, points.shape[1]):
+        no_worse &= others[None, :, k] <= points[:, None, k]
+        better |= others[None, :, k] < points[:, None, k]
+    return (no_worse & better).any(axis=1)
+
+
+def pareto_front(objectives, block=SWEEP_BLOCK):
+    """Indexes of the non-dominated rows of `objectives` (portfolio x objective, all minimized)"""
+    objectives = np.asarray(objectives, dtype=float)
+    order = np.lexsort(objectives.T[::-1])
+    front = np.empty(0, dtype=int)
+    for start in range(0, len(order), block):
+        candidates = order[start:start + block]
+        candidates = candidates[~_dominated_by(objectives[candidates], objectives[front])]
+        earlier = np.tri(len(candidates), k=-1, dtype=bool)
+        candidates = candidates[~_dominated_by(objectives[candidates], objectives[candidates], earlier)]
+        front = np.concatenate([front, candidates])
+    return np.sort(front)
+
+
+def pareto_ranks(objectives, max_fronts=MAX_FRONTS, block=SWEEP_BLOCK):
+    """Front of every row (1 for the frontier, 2 for the next, ...; 0 beyond `max_fronts`)"""
+    objectives = np.asarray(objectives, dtype=float)
+    ranks = np.zeros(len(objectives), dtype=int)
+    remaining = np.arange(len(objectives))
+    for rank in range(1, max_fronts + 1):
+        if not len(remaining):
+            break
+        front = remaining[pareto_front(objectives[remaining], block)]
+        ranks[front] = rank
+        remaining = remaining[ranks[remaining] == 0]
+    return ranks
+
+
+class PortfolioSet:
+    """Enumerated cap-compliant portfolios of one data version and capacity assumption, with their fronts
+
+    `prices` is the band x circle reserve-price matrix (₹ Cr per MHz); when any
+    lot has no price, cost falls back to occupied MHz for every portfolio.
+    Other capacity assumptions rescore the same portfolios (`rescored`).
+    """
+
+    def __init__(self, offered, most, prices, sites, parameters, n=N_CANDIDATES, seed=0):
+        self.lots = portfolio_lots(most)
+        self.won = won = compliant_portfolios(self.lots, offered, n, seed)
+
+        price = prices[self.lots.band, self.lots.circle]
+        self.priced = bool(len(price)) and not np.isnan(price).any()
+        self.cost_unit = '₹ Cr' if self.priced else 'occupied MHz'
+        if not self.priced:
+            price = np.where(PAIRED, 2.0, 1.0)[self.lots.band]
+
+        position = pd.Index(SUB_GHZ_BANDS).get_indexer(np.array(BANDS, dtype=object)[self.lots.band])
+        sub_ghz = position >= 0
+        sub_ghz_mhz = np.zeros((len(won), len(SUB_GHZ_BANDS), N_CIRCLES))
+        sub_ghz_mhz[:, position[sub_ghz], self.lots.circle[sub_ghz]] = won[:, sub_ghz]
+        saved, _ = sites_saved(sub_ghz_mhz, sites)
+
+        self.coverage = saved.max(axis=1).sum(axis=1)
+        self.cost = won @ price
+        self._score(parameters)
+
+    def _score(self, parameters):
+        self.parameters = parameters
+        self.capacity = self.won @ band_efficiency(parameters)[self.lots.band]
+        self.ranks = pareto_ranks(np.column_stack([-self.coverage, -self.capacity, self.cost]))
+        self._ranked = np.flatnonzero(self.ranks > 0)
+
+    def rescored(self, parameters):
+        """The same portfolios under other capacity assumptions: the enumeration, coverage and cost are
+        shared, only capacity and the fronts are worked out again"""
+        scored = copy.copy(self)
+        scored._score(parameters)
+        return scored
+
+    def __len__(self):
+        return len(self.won)
+
+    def feasible(self, budget=np.inf, min_coverage=0.0, min_capacity=0.0):
+        """Mask of the portfolios within the budget and meeting both minimums"""
+        return (self.cost <= budget) & (self.coverage >= min_coverage) & (self.capacity >= min_capacity)
+
+    def fronts(self, budget=np.inf, min_coverage=0.0, min_capacity=0.0):
+        """Indexes and ranks of the ranked portfolios meeting the constraints (a mask, no re-sort)"""
+        ranked = self._ranked
+        keep = ((self.cost[ranked] <= budget) & (self.coverage[ranked] >= min_coverage)
+                & (self.capacity[ranked] >= min_capacity))
+        return ranked[keep], self.ranks[ranked[keep]]
+
+    def describe(self, indices):
+        """Objectives, size and MHz per band of the given portfolios, cheapest first"""
+        indices = np.asarray(indices, dtype=int)
+        won = self.won[indices]
+        per_band = np.zeros((len(indices), len(BANDS)))
+        np.add.at(per_band.T, self.lots.band, won.T)
+        bands = [' · '.join(f"{band.replace(' MHz', '').replace(' ', '')}: {mhz:g}"
+                            for band, mhz in zip(BANDS, row) if mhz > 0) for row in per_band.round(2)]
+        circles = (won > 0) @ np.eye(N_CIRCLES, dtype=int)[self.lots.circle] > 0
+        frame = pd.DataFrame({
+            'Portfolio': indices,
+            'Front': self.ranks[indices],
+            'Coverage_k_Sites': self.coverage[indices].round(3),
+            'Capacity_Mbps': self.capacity[indices].round(1),
+            'Cost': self.cost[indices].round(2),
+            'Lots': (won > 0).sum(axis=1),
+            'Circles': circles.sum(axis=1),
+            'MHz_by_Band': bands,
+        })
+        return frame.sort_values(['Cost', 'Portfolio'], ignore_index=True)
+
@@ -0,0 +1,129 @@
+"""Background prefetch of the views a user is likely to open next
+
+Users mostly go from the Executive Summary to Band-wise Analysis and then
+step through the bands in order. A `Prefetcher` learns those transitions per
+server process, seeded with that default order, and builds the likely next
+views in a background thread while the current page is being read. Pages
+then fetch their view from the prefetcher: a hit skips the work, a view still
+being built is waited for rather than started again.
+
+Prefetch work is capped at a share of one CPU (PREFETCH_CPU_SHARE, default
+0.25): the worker idles between builds long enough to stay within it.
+"""
+
+import collections
+import concurrent.futures
+import os
+import threading
+import time
+
+CPU_SHARE = float(os.environ.get('PREFETCH_CPU_SHARE', 0.25))
+# Views prefetched after each visit
+LOOKAHEAD = 2
+# Built views kept per prefetcher
+CACHE_SIZE = 64
+
+
+class Prefetcher:
+    """Cache of built views, filled ahead of time from predicted navigation
+
+    `build(view)` returns a view's result; `sequence` lists the prefetchable
+    views in their usual order (the last wraps round to the first). Views are
+    any hashable keys, e.g. (page, band).
+    """
+
+    def __init__(self, build, sequence, cpu_share=CPU_SHARE, lookahead=LOOKAHEAD, cache_size=CACHE_SIZE):
+        if not 0 < cpu_share <= 1:
+            raise ValueError(f"cpu_share must be in (0, 1], got {cpu_share}")
+        self.build = build
+        self.sequence = list(sequence)
+        self.cpu_share = cpu_share
+        self.lookahead = lookahead
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._results = collections.OrderedDict()
+        self._pending = {}
+        self._building = set()
+        self._resume_at = 0.0
+        self._transitions = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+
+    def default_next(self, view):
+        """The view that usually follows `view`: the next in sequence, or the first from any other page"""
+        if view in self.sequence:
+            return self.sequence[(self.sequence.index(view) + 1) % len(self.sequence)]
+        return self.sequence[0] if self.sequence else None
+
+    def predict(self, view):
+        """Likely next prefetchable views, most likely first: observed transitions, then the default order"""
+        with self._lock:
+            observed = [nxt for nxt, _ in self._transitions[view].most_common() if nxt in self.sequence]
+        predicted = []
+        for candidate in observed + [self.default_next(view)]:
+            if candidate is not None and candidate != view and candidate not in predicted:
+                predicted.append(candidate)
+        # Past the known transitions, keep walking the usual order
+        while len(predicted) < self.lookahead and predicted and self.default_next(predicted[-1]) not in predicted + [view]:
+            predicted.append(self.default_next(predicted[-1]))
+        return predicted[:self.lookahead]
+
+    def visit(self, previous, view):
+        """Record a move from `previous` to `view` and prefetch what is likely to come next"""
+        if previous is not None and previous != view:
+            with self._lock:
+                self._transitions[previous][view] += 1
+        self.prefetch(self.predict(view))
+
+    def prefetch(self, views):
+        """Queue background builds of the views not already built or being built"""
+        with self._lock:
+            for view in views:
+                if view not in self._results and view not in self._pending:
+                    self._pending[view] = self._pool.submit(self._prefetch, view)
+
+    def get(self, view):
+        """A view's result: cached, awaited if a prefetch is building it, otherwise built now"""
+        with self._lock:
+            if view in self._results:
+                self._results.move_to_end(view)
+                self.hits += 1
+                return self._results[view]
+            future = self._pending.get(view) if view in self._building else None
+        if future is not None:
+            self.hits += 1
+            return future.result()
+        self.misses += 1
+        result = self.build(view)
+        self._store(view, result)
+        return result
+
+    def _store(self, view, result):
+        with self._lock:
+            self._results[view] = result
+            self._results.move_to_end(view)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+    def _prefetch(self, view):
+        # Idle until the previous builds are within the CPU share; a page that needs a queued
+        # view meanwhile builds it itself
+        time.sleep(max(self._resume_at - time.perf_counter(), 0.0))
+        with self._lock:
+            if view in self._results:
+                self._pending.pop(view, None)
+                return self._results[view]
+            self._building.add(view)
+        started = time.perf_counter()
+        started_cpu = time.thread_time()
+        try:
+            result = self.build(view)
+            self._store(view, result)
+            return result
+        finally:
+            used = time.thread_time() - started_cpu
+            self._resume_at = started + used / self.cpu_share
+            with self._lock:
+                self._building.discard(view)
+                self._pending.pop(view, None)
@@ -0,0 +1,669 @@
+"""Ad-hoc queries over the workbook block table and the per-circle cube
+
+A small filter/aggregate language for one-off analyst questions:
+
+    circles where Contiguous_1800MHz >= 10 and 3300MHz >= 50
+    circles where Region in ('North', 'East') select State, Quantum_900MHz order by Quantum_900MHz desc limit 5
+    blocks where Band = '26 GHz' group by State select count(*) as blocks, sum(Quantum_MHz) as mhz
+
+Clauses come in this order, all optional after the table name:
+`where <condition>`, `group by <columns>`, `select <columns or aggregates>`,
+`order by <column> [asc|desc], ...` and `limit <n>`. Conditions combine
+comparisons (=, ==, !=, <, <=, >, >=, ≥, ≤, ≠), `[not] in (...)`, arithmetic,
+`and`, `or`, `not` and parentheses. Aggregates are count, sum, min, max and
+mean. Column names are case-insensitive, and so are result column names,
+which must be distinct; string literals take single or double quotes and
+`limit` takes a whole number.
+
+Tables are held column by column. The `where` clause is split into its
+`and` terms, which run cheapest first on the rows that survived the earlier
+terms: equality on a partition column reads its precomputed row list instead
+of scanning, and derived columns (such as the contiguous spectrum per band,
+worked out from the block plan) are only materialized when a query reaches
+them. Results are cached per query and data version, and every query runs
+under a time budget checked between stages.
+"""
+
+import collections
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from duplex import band_index, block_intervals, largest_contiguous
+from holdings import offered_spectrum
+from ingest import BANDS, QUANTUM_COLUMNS
+
+# Seconds a query may run before it is abandoned
+TIME_BUDGET_S = 2.0
+# Most query results kept per engine
+CACHE_SIZE = 128
+
+# Example questions shown on the Ad-hoc Query page
+EXAMPLES = {
+    "Contiguous 1800 MHz and 3300 MHz": "circles where Contiguous_1800MHz >= 10 and 3300MHz >= 50\n"
+                                        "select State, Contiguous_1800MHz, Quantum_1800MHz, 3300MHz\n"
+                                        "order by Contiguous_1800MHz desc",
+    "Sub-1 GHz in Category B and C": "circles where Category in ('B', 'C') and Quantum_900MHz > 0\n"
+                                     "select State, Category, Quantum_900MHz, Contiguous_900MHz\n"
+                                     "order by Quantum_900MHz desc",
+    "26 GHz blocks per region": "blocks where Band = '26 GHz'\ngroup by Region\n"
+                                "select count(*) as Blocks, sum(Quantum_MHz) as MHz\norder by MHz desc",
+    "Fragmented 1800 MHz offers": "circles where Quantum_1800MHz - Contiguous_1800MHz > 2\n"
+                                  "select State, Quantum_1800MHz, Contiguous_1800MHz\n"
+                                  "order by Quantum_1800MHz desc limit 10",
+}
+
+AGGREGATES = {'count': 'count', 'sum': 'sum', 'min': 'min', 'max': 'max', 'mean': 'mean', 'avg': 'mean'}
+KEYWORDS = {'from', 'where', 'group', 'by', 'select', 'order', 'asc', 'desc', 'limit', 'as',
+            'and', 'or', 'not', 'in'}
+COMPARISONS = {'=': '==', '==': '==', '!=': '!=', '≠': '!=', '<': '<', '<=': '<=', '≤': '<=',
+               '>': '>', '>=': '>=', '≥': '>='}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<number>\d+(?:\.\d+)?(?![A-Za-z_0-9.]))
+    | (?P<string>'[^']*'|"[^"]*")
+    | (?P<name>[A-Za-z_0-9]+|`[^`]+`)
+    | (?P<op><=|>=|==|!=|[=<>≤≥≠()\[\],*+\-/])
+    )""", re.VERBOSE)
+
+
+class QueryError(ValueError):
+    """A query that cannot be parsed or does not match the tables"""
+
+
+class QueryTimeout(QueryError):
+    """A query that ran past its time budget"""
+
+
+QueryResult = collections.namedtuple('QueryResult', ['frame', 'elapsed_ms', 'cached', 'rows_scanned'])
+
+
+def _suffix(band):
+    return QUANTUM_COLUMNS[band].replace('Quantum_', '')
+
+
+def tokenize(text):
+    """Split query text into (kind, value) tokens; keywords come out lower-cased as kind 'keyword'"""
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise QueryError(f"Unexpected character at position {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value)
+        elif kind == 'string':
+            value = value[1:-1]
+        elif kind == 'name' and value.startswith('`'):
+            value = value[1:-1]
+        elif kind == 'name' and value.lower() in KEYWORDS:
+            kind, value = 'keyword', value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a nested-tuple query plan"""
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def accept(self, kind, value=None):
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind, value=None):
+        if not self.accept(kind, value):
+            found = self.peek()[1]
+            raise QueryError(f"Expected {value or kind} but found {'end of query' if found is None else repr(found)}")
+        return self.tokens[self.position - 1][1]
+
+    def query(self):
+        self.accept('keyword', 'from')
+        plan = {'table': self.expect('name').lower(), 'where': None, 'group': [], 'select': [],
+                'order': [], 'limit': None}
+        if self.accept('keyword', 'where'):
+            plan['where'] = self.condition()
+        if self.accept('keyword', 'group'):
+            self.expect('keyword', 'by')
+            plan['group'] = self.names()
+        if self.accept('keyword', 'select'):
+            plan['select'] = self.items()
+        if self.accept('keyword', 'order'):
+            self.expect('keyword', 'by')
+            plan['order'] = [self.order_key()]
+            while self.accept('op', ','):
+                plan['order'].append(self.order_key())
+        if self.accept('keyword', 'limit'):
+            limit = self.expect('number')
+            if limit != int(limit):
+                raise QueryError(f"limit needs a whole number of rows, not {limit:g}")
+            plan['limit'] = int(limit)
+        if self.peek()[0] is not None:
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return plan
+
+    def names(self):
+        names = [self.expect('name')]
+        while self.accept('op', ','):
+            names.append(self.expect('name'))
+        return names
+
+    def items(self):
+        items = [self.item()]
+        while self.accept('op', ','):
+            items.append(self.item())
+        return items
+
+    def item(self):
+        name = self.expect('name')
+        if self.peek() == ('op', '('):
+            if name.lower() not in AGGREGATES:
+                raise QueryError(f"Unknown aggregate {name!r}; use one of {', '.join(sorted(AGGREGATES))}")
+            self.take()
+            column = None if self.accept('op', '*') else self.expect('name')
+            self.expect('op', ')')
+            if column is None and name.lower() != 'count':
+                raise QueryError(f"{name}(*) is not supported; name a column")
+            label = f"{name.lower()}({column or '*'})"
+            alias = self.expect('name') if self.accept('keyword', 'as') else label
+            return ('agg', name.lower(), column, alias)
+        alias = self.expect('name') if self.accept('keyword', 'as') else name
+        return ('column', name, alias)
+
+    def order_key(self):
+        name = self.expect('name')
+        if self.accept('keyword', 'desc'):
+            return (name, False)
+        self.accept('keyword', 'asc')
+        return (name, True)
+
+    def condition(self):
+        terms = [self.conjunction()]
+        while self.accept('keyword', 'or'):
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else ('or', terms)
+
+    def conjunction(self):
+        terms = [self.negation()]
+        while self.accept('keyword', 'and'):
+            terms.append(self.negation())
+        return terms[0] if len(terms) == 1 else ('and', terms)
+
+    def negation(self):
+        if self.accept('keyword', 'not'):
+            return ('not', self.negation())
+        return self.predicate()
+
+    def predicate(self):
+        left = self.sum()
+        kind, value = self.peek()
+        if kind == 'op' and value in COMPARISONS:
+            self.take()
+            return ('cmp', COMPARISONS[value], left, self.sum())
+        negate = kind == 'keyword' and value == 'not' and self.peek(1) == ('keyword', 'in')
+        if negate:
+            self.take()
+        if self.accept('keyword', 'in'):
+            closing = ']' if self.accept('op', '[') else (self.expect('op', '(') and ')')
+            values = [self.literal()]
+            while self.accept('op', ','):
+                values.append(self.literal())
+            self.expect('op', closing)
+            return ('in', left, values, negate)
+        return left
+
+    def literal(self):
+        kind, value = self.take()
+        if kind == 'op' and value == '-':
+            return -self.expect('number')
+        if kind not in ('number', 'string'):
+            raise QueryError(f"Expected a number or string but found {value!r}")
+        return value
+
+    def sum(self):
+        node = self.product()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            node = ('arith', self.take()[1], node, self.product())
+        return node
+
+    def product(self):
+        node = self.atom()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            node = ('arith', self.take()[1], node, self.atom())
+        return node
+
+    def atom(self):
+        kind, value = self.take()
+        if kind == 'op' and value == '(':
+            node = self.condition()
+            self.expect('op', ')')
+            return node
+        if kind == 'op' and value == '-':
+            return ('arith', '-', ('lit', 0.0), self.atom())
+        if kind in ('number', 'string'):
+            return ('lit', value)
+        if kind == 'name':
+            return ('col', value)
+        raise QueryError(f"Unexpected {'end of query' if value is None else repr(value)}")
+
+
+def parse(text):
+    """Parse query text into a plan (a dict of clauses); raises QueryError"""
+    if not text or not text.strip():
+        raise QueryError("The query is empty")
+    return _Parser(text).query()
+
+
+def _columns_in(node):
+    """Column names referenced by an expression"""
+    if node is None or node[0] == 'lit':
+        return set()
+    if node[0] == 'col':
+        return {node[1]}
+    if node[0] in ('and', 'or'):
+        return set().union(*map(_columns_in, node[1]))
+    if node[0] == 'not':
+        return _columns_in(node[1])
+    if node[0] == 'in':
+        return _columns_in(node[1])
+    return _columns_in(node[2]) | _columns_in(node[3])
+
+
+class Table:
+    """A table held as one numpy array per column
+
+    `derived` maps column names to functions of the table that build the
+    column on first use. `partition_by` columns get a row list per value so
+    equality filters on them skip the scan. Tables are shared by every session,
+    so materializing is locked.
+    """
+
+    def __init__(self, name, frame, derived=None, partition_by=(), default_columns=None):
+        self.name = name
+        self.size = len(frame)
+        self.columns = {column: frame[column].to_numpy() for column in frame.columns}
+        self.stored = list(frame.columns)
+        self.derived = dict(derived or {})
+        self.default_columns = list(default_columns or frame.columns)
+        self._names = {column.casefold(): column for column in list(self.columns) + list(self.derived)}
+        self._lock = threading.Lock()
+        self.partitions = {}
+        for column in partition_by:
+            codes, values = pd.factorize(self.columns[column], sort=True)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            self.partitions[column] = {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(values)}
+
+    @property
+    def names(self):
+        """Every column name, stored and derived"""
+        # Declared order, whichever derived columns earlier queries happened to materialize
+        return self.stored + [name for name in self.derived if name not in self.stored]
+
+    def resolve(self, name):
+        """Canonical spelling of a column name (case-insensitive)"""
+        column = self._names.get(name.casefold())
+        if column is None:
+            raise QueryError(f"Unknown column {name!r} in table {self.name!r}")
+        return column
+
+    def is_stored(self, name):
+        """Whether a column is stored rather than derived (materialized or not, so plans do not depend on
+        earlier queries)"""
+        return self.resolve(name) in self.stored
+
+    def column(self, name):
+        """A column's values for every row, materializing derived columns on first use"""
+        column = self.resolve(name)
+        with self._lock:
+            if column not in self.columns:
+                self.columns[column] = np.asarray(self.derived[column](self))
+            return self.columns[column]
+
+
+def _circle_column(matrix_of, band):
+    """Derived cube column: one band row of a band x circle matrix, taken at the cube's Circle_IDs"""
+    index = band_index([band])[0]
+    return lambda table: matrix_of()[index][table.columns['Circle_ID']]
+
+
+def cube_table(cube, blocks):
+    """The per-circle cube as a query table, with contiguous and offered MHz per band derived from `blocks`"""
+    matrices = {}
+
+    def matrix(name, build):
+        def get():
+            if name not in matrices:
+                matrices[name] = build(block_intervals(blocks) if name == 'contiguous' else blocks)
+            return matrices[name]
+        return get
+
+    contiguous = matrix('contiguous', largest_contiguous)
+    offered = matrix('offered', offered_spectrum)
+    derived = {}
+    for band in BANDS:
+        derived[f'Contiguous_{_suffix(band)}'] = _circle_column(contiguous, band)
+        derived[f'Offered_{_suffix(band)}'] = _circle_column(offered, band)
+    defaults = [column for column in ['Circle_ID', 'State', 'Category', 'Region'] if column in cube.columns]
+    return Table('circles', cube, derived, partition_by=['Category', 'Region', 'Metro'], default_columns=defaults)
+
+
+def blocks_table(blocks, cube):
+    """The workbook block table as a query table, with each circle's Category and Region joined on"""
+    frame = blocks.copy()
+    dimension = cube.set_index('Circle_ID')
+    for column in ['Category', 'Metro', 'Region']:
+        if column in dimension.columns:
+            frame[column] = dimension[column].reindex(frame['Circle_ID']).to_numpy()
+    return Table('blocks', frame, partition_by=['Band', 'State', 'Circle_ID'],
+                 default_columns=[column for column in blocks.columns if column not in ('File', 'Sheet', 'Row')])
+
+
+class QueryEngine:
+    """Runs queries over the `circles` cube and the `blocks` table, with a result cache
+
+    The cache is keyed on the parsed plan (so spacing and keyword case do not
+    matter) and the data version (see data_plane.data_version) of the inputs.
+    One engine serves every session of a process, so the cache is locked.
+    """
+
+    def __init__(self, cube, blocks, version, time_budget=TIME_BUDGET_S, cache_size=CACHE_SIZE):
+        self.tables = {'circles': cube_table(cube, blocks), 'blocks': blocks_table(blocks, cube)}
+        self.version = version
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def query(self, text):
+        """Run a query and return its result as a DataFrame"""
+        return self.run(text).frame
+
+    def run(self, text, time_budget=None):
+        """Run a query; returns a QueryResult (frame, elapsed_ms, cached, rows_scanned)
+
+        Raises QueryError for bad queries and QueryTimeout when the budget
+        (seconds, default the engine's) runs out.
+        """
+        started = time.perf_counter()
+        plan = _canonical(parse(text), self._table)
+        key = (repr(plan), self.version)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            frame, scanned = cached
+            return QueryResult(frame.copy(), (time.perf_counter() - started) * 1000, True, scanned)
+
+        deadline = started + (self.time_budget if time_budget is None else time_budget)
+        frame, scanned = self._execute(plan, deadline)
+        with self._lock:
+            self._cache[key] = (frame, scanned)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return QueryResult(frame.copy(), (time.perf_counter() - started) * 1000, False, scanned)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _table(self, name):
+        if name not in self.tables:
+            raise QueryError(f"Unknown table {name!r}; query {' or '.join(self.tables)}")
+        return self.tables[name]
+
+    def _execute(self, plan, deadline):
+        table = self._table(plan['table'])
+        rows, scanned = self._filter(table, plan['where'], deadline)
+        _check(deadline)
+
+        grouped = bool(plan['group']) or any(item[0] == 'agg' for item in plan['select'])
+        _check_output_names(table, plan, grouped)
+        if grouped:
+            frame = self._aggregate(table, rows, plan)
+        else:
+            items = plan['select'] or [('column', name, name) for name in
+                                       _default_columns(table, plan['where'])]
+            frame = pd.DataFrame({(table.resolve(name) if alias == name else alias): table.column(name)[rows]
+                                  for _, name, alias in items})
+        _check(deadline)
+
+        if plan['order']:
+            keys = []
+            for name, ascending in plan['order']:
+                column = _output_column(frame, name)
+                if column is None:
+                    if grouped:
+                        raise QueryError(f"Cannot order by {name!r}: it is not in the result")
+                    column = f'__order_{len(keys)}'
+                    frame[column] = table.column(name)[rows]
+                keys.append((column, ascending))
+            frame = frame.sort_values([column for column, _ in keys], ascending=[a for _, a in keys],
+                                      kind='stable', na_position='last')
+            frame = frame.drop(columns=[column for column, _ in keys if column.startswith('__order_')])
+        if plan['limit'] is not None:
+            frame = frame.head(plan['limit'])
+        return frame.reset_index(drop=True), scanned
+
+    def _filter(self, table, condition, deadline):
+        """Row positions passing `condition`, evaluating its `and` terms cheapest first
+
+        Returns (rows, rows_scanned) where rows_scanned counts row reads by
+        terms that could not use a partition.
+        """
+        rows = np.arange(table.size)
+        if condition is None:
+            return rows, 0
+        terms = condition[1] if condition[0] == 'and' else [condition]
+        for name in set().union(*map(_columns_in, terms)):
+            table.resolve(name)
+        # Partition lookups first, then terms over stored columns, derived columns last
+        cost = lambda term: (0 if _partition_lookup(table, term) is not None else
+                             1 if all(table.is_stored(name) for name in _columns_in(term)) else 2)
+        scanned = 0
+        for term in sorted(terms, key=cost):
+            if not len(rows):
+                break
+            _check(deadline)
+            lookup = _partition_lookup(table, term)
+            if lookup is not None:
+                rows = np.intersect1d(rows, lookup, assume_unique=True)
+                continue
+            scanned += len(rows)
+            rows = rows[_boolean(_evaluate(term, table, rows), rows)]
+        return rows, scanned
+
+    def _aggregate(self, table, rows, plan):
+        keys = [table.resolve(name) for name in plan['group']]
+        aggregates = [item for item in plan['select'] if item[0] == 'agg']
+        for item in plan['select']:
+            if item[0] == 'column' and table.resolve(item[1]) not in keys:
+                raise QueryError(f"{item[1]!r} must be grouped or aggregated")
+        if not aggregates:
+            aggregates = [('agg', 'count', None, 'count(*)')]
+
+        needed = dict.fromkeys(keys + [table.resolve(column) for _, _, column, _ in aggregates if column])
+        # Indexed by row so a bare count(*), which reads no column, still sees every row
+        frame = pd.DataFrame({column: table.column(column)[rows] for column in needed}, index=range(len(rows)))
+        for _, function, column, _ in aggregates:
+            if column and function != 'count' and not pd.api.types.is_numeric_dtype(frame[table.resolve(column)]):
+                raise QueryError(f"{function}({column}) needs a numeric column")
+        if not keys and not len(frame):
+            # An aggregate over no rows is still one row
+            return pd.DataFrame({alias: [0 if function == 'count' else np.nan]
+                                 for _, function, _, alias in aggregates})
+        grouped = frame.groupby(keys or np.zeros(len(frame), dtype=int), sort=True)
+        result = pd.DataFrame({
+            alias: grouped.size() if column is None else grouped[table.resolve(column)].agg(AGGREGATES[function])
+            for _, function, column, alias in aggregates
+        })
+        result = result.reset_index() if keys else result.reset_index(drop=True)
+        if not plan['select']:
+            return result
+        selected = [table.resolve(item[1]) if item[0] == 'column' else item[3] for item in plan['select']]
+        return result[[key for key in keys if key not in selected] + selected]
+
+
+def _canonical(plan, tables):
+    """The plan with every column name in its canonical spelling, so equivalent queries share a cache entry"""
+    table = tables(plan['table'])
+
+    def expression(node):
+        if node is None or node[0] == 'lit':
+            return node
+        if node[0] == 'col':
+            return ('col', table.resolve(node[1]))
+        if node[0] in ('and', 'or'):
+            return (node[0], [expression(term) for term in node[1]])
+        if node[0] == 'not':
+            return ('not', expression(node[1]))
+        if node[0] == 'in':
+            return ('in', expression(node[1]), node[2], node[3])
+        return (node[0], node[1], expression(node[2]), expression(node[3]))
+
+    def item(item):
+        if item[0] == 'agg':
+            _, function, column, alias = item
+            return ('agg', function, column and table.resolve(column), alias)
+        _, name, alias = item
+        return ('column', table.resolve(name), table.resolve(name) if alias == name else alias)
+
+    select = [item(entry) for entry in plan['select']]
+    aliases = {entry[-1].casefold(): entry[-1] for entry in select}
+    return dict(plan, where=expression(plan['where']),
+                group=[table.resolve(name) for name in plan['group']],
+                select=select,
+                order=[(aliases.get(name.casefold()) or table.resolve(name), ascending)
+                       for name, ascending in plan['order']])
+
+
+def _check(deadline):
+    if time.perf_counter() > deadline:
+        raise QueryTimeout("The query ran past its time budget; narrow it with a where clause or a limit")
+
+
+def _default_columns(table, condition):
+    """Identity columns plus every column the condition reads"""
+    columns = list(table.default_columns)
+    for name in sorted(_columns_in(condition), key=str.casefold):
+        if table.resolve(name) not in columns:
+            columns.append(table.resolve(name))
+    return columns
+
+
+def _check_output_names(table, plan, grouped):
+    """Raise QueryError if two result columns would share a name (compared as `order by` compares them)"""
+    names = [table.resolve(item[1]) if item[0] == 'column' and (grouped or item[2] == item[1]) else item[-1]
+             for item in plan['select']]
+    if grouped:
+        names += [key for key in map(table.resolve, plan['group']) if key not in names]
+    seen = set()
+    for name in names:
+        if name.casefold() in seen:
+            raise QueryError(f"Duplicate result column {name!r}; give each column a distinct alias")
+        seen.add(name.casefold())
+
+
+def _output_column(frame, name):
+    lookup = {str(column).casefold(): column for column in frame.columns}
+    return lookup.get(name.casefold())
+
+
+def _partition_lookup(table, term):
+    """Rows of a partitioned column matching an equality or `in` term (None if the term can't use one)"""
+    if term[0] == 'cmp' and term[1] == '==':
+        sides = [term[2], term[3]]
+        columns = [side for side in sides if side[0] == 'col']
+        literals = [side for side in sides if side[0] == 'lit']
+        if len(columns) != 1 or len(literals) != 1:
+            return None
+        column, values = columns[0][1], [literals[0][1]]
+    elif term[0] == 'in' and not term[3] and term[1][0] == 'col':
+        column, values = term[1][1], term[2]
+    else:
+        return None
+    column = table.resolve(column)
+    if column not in table.partitions:
+        return None
+    partition = table.partitions[column]
+    matches = [partition[value] for value in _coerce(values, partition) if value in partition]
+    return np.sort(np.concatenate(matches)) if matches else np.array([], dtype=np.int64)
+
+
+def _coerce(values, partition):
+    """Literal values in the type of a partition's keys (numbers parse as floats)"""
+    sample = next(iter(partition), None)
+    if isinstance(sample, (int, np.integer)):
+        return [int(value) for value in values if isinstance(value, float) and value.is_integer()]
+    return values
+
+
+def _evaluate(node, table, rows):
+    """Evaluate an expression over the given rows of a table"""
+    kind = node[0]
+    if kind == 'lit':
+        return node[1]
+    if kind == 'col':
+        return table.column(node[1])[rows]
+    if kind == 'and':
+        return np.logical_and.reduce([_boolean(_evaluate(term, table, rows), rows) for term in node[1]])
+    if kind == 'or':
+        return np.logical_or.reduce([_boolean(_evaluate(term, table, rows), rows) for term in node[1]])
+    if kind == 'not':
+        return ~_boolean(_evaluate(node[1], table, rows), rows)
+    if kind == 'in':
+        values = _evaluate(node[1], table, rows)
+        member = pd.Series(values).isin(node[2]).to_numpy()
+        return ~member if node[3] else member
+
+    left, right = _evaluate(node[2], table, rows), _evaluate(node[3], table, rows)
+    try:
+        if kind == 'arith':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.true_divide}[node[1]](
+                    np.asarray(left, dtype=float), np.asarray(right, dtype=float))
+        result = {'==': np.equal, '!=': np.not_equal, '<': np.less, '<=': np.less_equal,
+                  '>': np.greater, '>=': np.greater_equal}[node[1]](left, right)
+    except (TypeError, ValueError):
+        raise QueryError(f"Cannot apply {node[1]!r} to a text and a number; quote text values") from None
+    return _boolean(result, rows)
+
+
+def _boolean(values, rows):
+    values = np.asarray(values)
+    if values.ndim == 0:
+        values = np.full(len(rows), values)
+    if values.dtype != bool:
+        raise QueryError("Expected a condition (a comparison), not a value")
+    return values
+
+
+def describe(engine):
+    """Tables and columns available to queries, as a DataFrame for the help panel"""
+    return pd.DataFrame([
+        {'Table': name, 'Column': column, 'Derived': column in table.derived}
+        for name, table in engine.tables.items() for column in table.names
+    ])
@@ -0,0 +1,133 @@
+"""Precomputed ranking indexes over the per-circle cube for top-N, percentile and rank lookups"""
+
+import collections
+import threading
+
+import numpy as np
+import pandas as pd
+
+from circles import align
+
+# Page metrics (not cube columns) kept per index, least recently used dropped first; enough for every
+# page score under every capacity assumption and scenario
+MAX_REGISTERED = 64
+
+
+class RankIndex:
+    """Stable argsort of every numeric cube column, built once per data version
+
+    Rows are Circle_IDs (the cube's row positions). Metrics that are not cube
+    columns, such as page-specific scores, are ranked the first time they are
+    requested and cached under their name, which must name everything the
+    values depend on: registering a name again with different values raises
+    ValueError. At most `max_registered` such metrics are kept. Orders match
+    `nlargest`/`nsmallest` with keep='first': ties keep Circle_ID order and
+    NaNs never rank. One index is shared by every session, so it is locked.
+    """
+
+    def __init__(self, cube, version, max_registered=MAX_REGISTERED):
+        # Data version (see data_plane.data_version) the rankings are valid for
+        self.version = version
+        self.size = len(cube)
+        self.max_registered = max_registered
+        self._values = {}
+        self._orders = {}
+        # Metrics that are not cube columns, least recently used first
+        self._registered = collections.OrderedDict()
+        self._lock = threading.Lock()
+        for column in cube.select_dtypes('number').columns:
+            self._values[column] = cube[column].to_numpy(dtype=float)
+            self._order(column, False)
+
+    def values(self, metric, values=None):
+        """Metric values per Circle_ID; `values` (array or callable) registers a new metric"""
+        with self._lock:
+            return self._metric(metric, values)
+
+    def _metric(self, metric, values=None):
+        # Called with the lock held
+        if metric in self._registered:
+            self._registered.move_to_end(metric)
+        elif metric not in self._values:
+            if values is None:
+                raise KeyError(f"Unknown metric: {metric!r}")
+            values = values() if callable(values) else values
+            self._add(metric, np.asarray(values, dtype=float))
+        return self._values[metric]
+
+    def _add(self, metric, data):
+        # Called with the lock held
+        self._values[metric] = data
+        self._registered[metric] = None
+        while len(self._registered) > self.max_registered:
+            dropped, _ = self._registered.popitem(last=False)
+            del self._values[dropped]
+            for ascending in (False, True):
+                self._orders.pop((dropped, ascending), None)
+
+    def _order(self, metric, ascending, values=None):
+        """Circle_IDs of the ranked (non-NaN) rows best first, every row's 0-based rank, and the values"""
+        key = (metric, ascending)
+        with self._lock:
+            data = self._metric(metric, values)
+            if key not in self._orders:
+                order = np.argsort(data if ascending else -data, kind='stable')
+                valid = int((~np.isnan(data)).sum())
+                ranks = np.empty(self.size, dtype=np.int64)
+                ranks[order] = np.arange(self.size)
+                self._orders[key] = (order[:valid], ranks)
+            return self._orders[key] + (data,)
+
+    def register(self, metric, frame, column=None):
+        """Rank a column of a Circle_ID-keyed frame as `metric`; raises ValueError if `metric` already
+        holds different values"""
+        data = align(frame['Circle_ID'].to_numpy(), frame[column or metric].to_numpy(dtype=float), fill=np.nan)
+        with self._lock:
+            if metric not in self._values:
+                self._add(metric, data)
+            elif not np.array_equal(self._metric(metric), data, equal_nan=True):
+                raise ValueError(f"Metric {metric!r} is already ranked with different values; "
+                                 f"name what the values depend on")
+        return metric
+
+    def top(self, metric, n, among=None, ascending=False, values=None):
+        """Circle_IDs of the `n` best rows, optionally only those in `among`"""
+        order, _, _ = self._order(metric, ascending, values)
+        if among is not None:
+            member = np.zeros(self.size, dtype=bool)
+            member[np.asarray(among)] = True
+            order = order[member[order]]
+        return order[:n]
+
+    def threshold(self, metric, q, among=None, values=None):
+        """The `q` quantile of the metric (linear interpolation, as `Series.quantile`)"""
+        order, _, data = self._order(metric, True, values)
+        if among is not None:
+            member = np.zeros(self.size, dtype=bool)
+            member[np.asarray(among)] = True
+            order = order[member[order]]
+        if not len(order):
+            return np.nan
+        ordered = data[order]
+        position = q * (len(ordered) - 1)
+        low = int(np.floor(position))
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    def rank_of(self, metric, circle, ascending=False, values=None):
+        """1-based rank of a Circle_ID among all circles"""
+        _, ranks, _ = self._order(metric, ascending, values)
+        return int(ranks[circle]) + 1
+
+    def rows(self, frame, circles):
+        """Rows of a Circle_ID-keyed frame for the given Circle_IDs, in that order"""
+        return frame.iloc[pd.Index(frame['Circle_ID']).get_indexer(circles)]
+
+    def top_rows(self, frame, metric, n, column=None, ascending=False, among=None):
+        """`frame.nlargest(n, column)` (or nsmallest) served from the cached order of `metric`, optionally
+        only over the frame's rows whose Circle_ID is in `among`"""
+        self.register(metric, frame, column)
+        circles = frame['Circle_ID'].to_numpy()
+        if among is not None:
+            circles = np.intersect1d(circles, among)
+        return self.rows(frame, self.top(metric, n, circles, ascending))
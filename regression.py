@@ -0,0 +1,278 @@
+"""Golden-output regression harness for the dashboards
+
+Every page of each dashboard is run headlessly with Streamlit's AppTest: its
+default view, then each option of every selectbox and select slider (main
+area and sidebar) and a fixed set of selections for each multiselect. All
+metrics, tables and figure data of each view are captured and compared with
+the baselines stored in golden/. Pages are spread over a pool of worker
+processes, so the full matrix takes about as long as the slowest page:
+
+    python regression.py                      # check every dashboard against golden/
+    python regression.py --update             # record new baselines after an intended change
+    python regression.py spectrum_dashboard.py --workers 8
+    python regression.py --compare            # report where the two legacy variants disagree
+
+The exit status is 1 when any view differs from its baseline.
+"""
+
+import argparse
+import base64
+import concurrent.futures
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from export_static import NAV_LABEL, ROOT
+
+# The unified dashboard and the two legacy entry points, now configs of it (spectrum_analysis*.toml)
+SCRIPTS = ['spectrum_dashboard.py', 'spectrum_analysis2.py', 'spectrum_analysis6.py']
+VARIANTS = ['spectrum_analysis2.py', 'spectrum_analysis6.py']
+GOLDEN_DIR = os.path.join(ROOT, 'golden')
+
+# Metrics whose values are timings rather than results
+VOLATILE_METRICS = {"Query Time", "Jump Time", "Frontier Update"}
+# Significant digits kept for floats, so baselines survive harmless rounding noise
+DIGITS = 9
+# Trace fields holding figure data
+TRACE_FIELDS = ['type', 'name', 'x', 'y', 'z', 'values', 'labels', 'text', 'customdata', 'locations', 'base']
+# Trace arrays and table rows longer than this are stored as their length and a digest, so baselines stay small
+# (the Portfolio Frontier's hundreds of frontier portfolios among them; every other list is shorter)
+MAX_STORED_POINTS = 100
+
+
+def multiselect_cases(options):
+    """Selections tried for a multiselect: the first four options and all of them"""
+    return [list(options[:4]), list(options)]
+
+
+def _round(value):
+    if isinstance(value, float):
+        return value if not np.isfinite(value) else float(f'{value:.{DIGITS}g}')
+    if isinstance(value, list):
+        return [_round(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _round(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value):
+    """Plotly's base64 typed arrays ({'dtype', 'bdata', 'shape'}) as plain lists"""
+    if isinstance(value, dict) and 'bdata' in value and 'dtype' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+        if 'shape' in value:
+            array = array.reshape([int(n) for n in str(value['shape']).split(',')])
+        return array.tolist()
+    if isinstance(value, dict):
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _digest(value):
+    if isinstance(value, list) and len(value) > MAX_STORED_POINTS:
+        return {'points': len(value), 'sha1': hashlib.sha1(json.dumps(value).encode()).hexdigest()}
+    return value
+
+
+def _figure(spec):
+    figure = json.loads(spec)
+    title = figure.get('layout', {}).get('title', {})
+    return {
+        'title': title.get('text') if isinstance(title, dict) else title,
+        'traces': [{field: _digest(_round(_decode(trace[field]))) for field in TRACE_FIELDS if field in trace}
+                   for trace in figure.get('data', [])],
+    }
+
+
+def capture(at, sidebar=False):
+    """Metrics, tables and figure data of a finished run's main area (and sidebar), in page order"""
+    if at.exception:
+        return [{'exception': at.exception[0].message}]
+    out = []
+    areas = [at.main, at.sidebar] if sidebar else [at.main]
+    for metric in [metric for area in areas for metric in area.metric]:
+        volatile = metric.label in VOLATILE_METRICS
+        out.append({'metric': metric.label, 'value': None if volatile else metric.value,
+                    'delta': None if volatile else metric.delta})
+    for table in [table for area in areas for table in list(area.dataframe) + list(area.table)]:
+        frame = table.value
+        out.append({'table': [str(column) for column in frame.columns],
+                    'rows': _digest(_round(json.loads(frame.to_json(orient='values', double_precision=15))))})
+    for chart in [chart for area in areas for chart in area.get('plotly_chart')]:
+        out.append({'figure': _figure(chart.proto.spec)})
+    return out
+
+
+def _widgets(at):
+    """(kind, label, values to try) for every widget that changes a page's numbers"""
+    widgets = []
+    for box in list(at.sidebar.selectbox) + list(at.main.selectbox):
+        if box.label != NAV_LABEL:
+            widgets.append(('selectbox', box.label, [option for option in box.options if option != box.value]))
+    for slider in at.select_slider:
+        widgets.append(('select_slider', slider.label, [option for option in slider.options if option != slider.value]))
+    for box in at.multiselect:
+        widgets.append(('multiselect', box.label, multiselect_cases(box.options)))
+    return widgets
+
+
+def _widget(at, kind, label):
+    return next(widget for widget in getattr(at, kind) if widget.label == label)
+
+
+def run_page(script, page):
+    """Captures of every view of one page, keyed 'page' or 'page | widget = value'"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # A fresh data layer per page, so no view depends on what the worker ran before
+    st.cache_resource.clear()
+    at = AppTest.from_file(script, default_timeout=120).run()
+    _widget(at, 'selectbox', NAV_LABEL).set_value(page).run()
+    # The sidebar is the same on every view of a page; capture it once
+    views = {page: capture(at, sidebar=True)}
+    for kind, label, values in _widgets(at):
+        default = _widget(at, kind, label).value
+        for value in values:
+            _widget(at, kind, label).set_value(value).run()
+            views[f'{page} | {label} = {value}'] = capture(at)
+        _widget(at, kind, label).set_value(default).run()
+    return views
+
+
+def pages(script):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    return list(_widget(at, 'selectbox', NAV_LABEL).options)
+
+
+def run_all(scripts, workers=None):
+    """Captures of every view of each script, {script: {view: captures}}, one worker per page"""
+    # AppTest runs the script as __main__, so every run happens in a worker process
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        paths = {script: os.path.join(ROOT, script) for script in scripts}
+        page_lists = dict(zip(scripts, pool.map(pages, paths.values())))
+        jobs = [(script, page) for script in scripts for page in page_lists[script]]
+        results = {script: {} for script in scripts}
+        for (script, _), views in zip(jobs, pool.map(run_page, [paths[s] for s, _ in jobs], [p for _, p in jobs])):
+            results[script].update(views)
+    return results
+
+
+def golden_path(script):
+    return os.path.join(GOLDEN_DIR, os.path.splitext(os.path.basename(script))[0] + '.json')
+
+
+def diff(expected, actual, limit=5):
+    """Readable differences between two capture sets (at most `limit` per view)"""
+    messages = []
+    for view in expected.keys() - actual.keys():
+        messages.append(f"{view}: view no longer produced")
+    for view in actual.keys() - expected.keys():
+        messages.append(f"{view}: new view (no baseline)")
+    for view in sorted(expected.keys() & actual.keys()):
+        before, after = expected[view], actual[view]
+        found = []
+        if len(before) != len(after):
+            found.append(f"{len(before)} elements before, {len(after)} now")
+        for i, (old, new) in enumerate(zip(before, after)):
+            if old != new:
+                kind = next(iter(new))
+                found.append(f"element {i} ({kind} {new[kind] if kind != 'figure' else new[kind]['title']!r}) "
+                             f"changed:\n      was {json.dumps(old, ensure_ascii=False)[:200]}"
+                             f"\n      now {json.dumps(new, ensure_ascii=False)[:200]}")
+        messages.extend(f"{view}: {message}" for message in found[:limit])
+    return messages
+
+
+def _element_key(element):
+    kind = next(iter(element))
+    if kind == 'figure':
+        return ('figure', element['figure']['title'])
+    if kind == 'table':
+        return ('table', tuple(element['table']))
+    return (kind, element[kind])
+
+
+def compare_variants(results):
+    """Elements both dashboards render in the same view (same metric label, figure title or table
+    columns) whose numbers disagree, as {element: [views]}; also returns how many were compared"""
+    first, second = (results[script] for script in VARIANTS)
+    disagreeing = {}
+    compared = 0
+    for view in sorted(first.keys() & second.keys()):
+        theirs = {}
+        for element in second[view]:
+            theirs.setdefault(_element_key(element), element)
+        for element in first[view]:
+            key = _element_key(element)
+            if key in theirs:
+                compared += 1
+                if element != theirs[key]:
+                    disagreeing.setdefault(f'{key[0]} {key[1]!r}', []).append(view)
+    return disagreeing, compared
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('scripts', nargs='*', default=SCRIPTS, help="dashboards to run (default: all)")
+    parser.add_argument('--update', action='store_true', help="record the current output as the new baselines")
+    parser.add_argument('--compare', action='store_true', help="also list shared views where the variants disagree")
+    parser.add_argument('--workers', type=int, help="parallel processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    scripts = [os.path.basename(script) for script in args.scripts]
+    if args.compare:
+        scripts += [script for script in VARIANTS if script not in scripts]
+
+    started = time.perf_counter()
+    results = run_all(scripts, args.workers)
+    elapsed = time.perf_counter() - started
+    views = sum(len(captures) for captures in results.values())
+
+    failures = 0
+    for script, captures in results.items():
+        path = golden_path(script)
+        crashed = [view for view, elements in captures.items() if elements and 'exception' in elements[0]]
+        for view in crashed:
+            print(f"{script}: {view} raised {captures[view][0]['exception']}")
+        if crashed and args.update:
+            print(f"{script}: not recording baselines while views raise")
+            failures += 1
+            continue
+        if args.update:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(captures, f, indent=1, ensure_ascii=False, sort_keys=True)
+            print(f"{script}: recorded {len(captures)} views to {os.path.relpath(path, ROOT)}")
+            continue
+        if not os.path.exists(path):
+            print(f"{script}: no baseline; run with --update to record one")
+            failures += 1
+            continue
+        with open(path, encoding='utf-8') as f:
+            expected = json.load(f)
+        messages = diff(expected, json.loads(json.dumps(captures)))
+        failures += bool(messages)
+        print(f"{script}: {len(captures)} views, " + (f"{len(messages)} differences" if messages else "all match"))
+        for message in messages:
+            print(f"  {message}")
+
+    if args.compare:
+        disagreeing, compared = compare_variants(results)
+        print(f"Variants disagree on {sum(map(len, disagreeing.values()))} of {compared} elements they both render:")
+        for element, where in disagreeing.items():
+            print(f"  {element} in {len(where)} views, e.g. {where[0]}")
+    print(f"Ran {views} views in {elapsed:.1f} s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    # Workers must find their functions under the module name: AppTest swaps out __main__ while it runs
+    import regression
+    sys.exit(regression.main())
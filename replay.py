@@ -0,0 +1,228 @@
+"""Round-by-round replay of a spectrum auction against the block plan
+
+DoT publishes the result of every auction round; saved as a local CSV or
+JSON round log with one row per round, band, circle and bidder:
+
+    Round, Circle, Band, Bidder, Demand_Blocks, Price_Cr
+
+(`Price_Cr` is the round's price per block in ₹ crore). A row sets the
+bidder's demand and the cell's price from that round on, so a log may list
+every bid each round or only the ones that changed.
+
+The replay holds auction state as arrays over bidder x band x circle and
+applies each round as one scatter of its rows. Per band and circle it tracks
+aggregate and competitor demand against the blocks on offer (excess demand),
+the price increment on the previous round and the provisional winners: the
+bidders holding demand in a cell whose demand no longer exceeds supply.
+
+State is checkpointed every `checkpoint_every` rounds on the first pass, so
+jumping to any round restores the nearest earlier checkpoint and applies at
+most `checkpoint_every - 1` rounds: the cost of a jump does not grow with
+the round number.
+"""
+
+import collections
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from circles import CIRCLE_NAMES, N_CIRCLES, circle_ids
+from duplex import band_index
+from holdings import normalize_band
+from ingest import BANDS
+
+LOG_COLUMNS = ['Round', 'Circle', 'Band', 'Bidder', 'Demand_Blocks', 'Price_Cr']
+
+# Rounds between stored checkpoints
+CHECKPOINT_EVERY = 16
+
+N_CELLS = len(BANDS) * N_CIRCLES
+
+RoundState = collections.namedtuple('RoundState', [
+    'round',        # round number
+    'demand',       # bidder x band x circle: blocks each bidder demands
+    'price',        # band x circle: price per block (₹ Cr, NaN before the first bid)
+    'increment',    # band x circle: price change on the previous round
+    'aggregate',    # band x circle: blocks demanded by all bidders
+    'excess',       # band x circle: aggregate demand minus blocks on offer
+    'provisional',  # bidder x band x circle: blocks provisionally won
+])
+
+
+def supply_blocks(blocks):
+    """Blocks on offer per band x circle from the workbook block table"""
+    keys = band_index(blocks['Band']) * N_CIRCLES + blocks['Circle_ID'].to_numpy()
+    return np.bincount(keys, minlength=N_CELLS).reshape(len(BANDS), N_CIRCLES)
+
+
+def round_log_template(supply):
+    """First-round log with a row per band and circle on offer, for analysts to fill in"""
+    bands, circles = np.nonzero(supply)
+    return pd.DataFrame({
+        'Round': 1,
+        'Circle': np.array(CIRCLE_NAMES, dtype=object)[circles],
+        'Band': np.array(BANDS, dtype=object)[bands],
+        'Bidder': 'Bidder A',
+        'Demand_Blocks': 0,
+        'Price_Cr': np.nan,
+    }, columns=LOG_COLUMNS)
+
+
+def load_round_log(source, name=None):
+    """Read a round log (CSV, JSON records or JSON lines) into a frame of LOG_COLUMNS
+
+    `source` is a path or file-like object; `name` gives the file name when it
+    is not a path (e.g. an upload). Circles and bands accept the usual aliases
+    and spellings.
+    """
+    name = name or getattr(source, 'name', None) or str(source)
+    extension = os.path.splitext(name)[1].lower()
+    if extension in ('.json', '.jsonl', '.ndjson'):
+        if extension == '.json':
+            if hasattr(source, 'read'):
+                records = json.load(source)
+            else:
+                with open(source, encoding='utf-8') as f:
+                    records = json.load(f)
+            frame = pd.DataFrame.from_records(round_log_records(records))
+        else:
+            frame = pd.read_json(source, lines=True)
+    else:
+        frame = pd.read_csv(source)
+    return round_log_frame(frame)
+
+
+def round_log_records(records):
+    """Rows of a parsed JSON round log (a list of objects, or an object with a `bids` list); raises
+    ValueError for anything else"""
+    if isinstance(records, dict):
+        records = records.get('bids')
+    if not isinstance(records, list) or not all(isinstance(row, dict) for row in records):
+        raise ValueError("A JSON round log must be a list of objects or an object with a 'bids' list of objects")
+    return records
+
+
+def round_log_frame(frame):
+    """Round-log rows as a frame of LOG_COLUMNS with canonical bands; raises ValueError for bad rows"""
+    missing = [column for column in LOG_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Round log is missing columns: {', '.join(missing)}")
+    if not len(frame):
+        raise ValueError("Round log has no rows")
+
+    frame = frame[LOG_COLUMNS].copy()
+    frame['Band'] = frame['Band'].map(normalize_band)
+    unknown = frame.loc[(circle_ids(frame['Circle']) < 0) | frame['Band'].isna(), ['Circle', 'Band']]
+    if len(unknown):
+        rows = ', '.join(f"{c} / {b}" for c, b in unknown.head(5).itertuples(index=False))
+        raise ValueError(f"Unknown circle or band in {len(unknown)} round-log rows: {rows}")
+    for column in ['Round', 'Demand_Blocks', 'Price_Cr']:
+        frame[column] = pd.to_numeric(frame[column], errors='raise')
+    frame['Bidder'] = frame['Bidder'].astype(str).str.strip()
+    return frame
+
+
+class Replay:
+    """Auction state after every round of a round log, with constant-cost jumps between rounds
+
+    `supply` is the band x circle array of blocks on offer (see
+    `supply_blocks`).
+    """
+
+    def __init__(self, log, supply, checkpoint_every=CHECKPOINT_EVERY):
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be at least 1, got {checkpoint_every}")
+        self.supply = np.asarray(supply)
+        self.checkpoint_every = checkpoint_every
+        self.rounds = np.unique(log['Round'].to_numpy())
+        self.bidders = sorted(log['Bidder'].unique())
+
+        # Bid rows as flat (bidder, band, circle) indexes, grouped by round with an offset array
+        position = np.searchsorted(self.rounds, log['Round'].to_numpy())
+        order = np.argsort(position, kind='stable')
+        cell = (band_index(log['Band']) * N_CIRCLES + circle_ids(log['Circle']))[order]
+        bidder = pd.Index(self.bidders).get_indexer(log['Bidder'])[order]
+        self._offsets = np.searchsorted(position[order], np.arange(len(self.rounds) + 1))
+        self._bids = bidder * N_CELLS + cell
+        self._cells = cell
+        self._demand = log['Demand_Blocks'].to_numpy(dtype=float)[order]
+        self._prices = log['Price_Cr'].to_numpy(dtype=float)[order]
+
+        # First pass: every round once, checkpointing as we go, plus the per-round history
+        demand = np.zeros(len(self.bidders) * N_CELLS)
+        price = np.full(N_CELLS, np.nan)
+        previous = price.copy()
+        self._checkpoints = []
+        history = []
+        for i in range(len(self.rounds)):
+            previous = self._apply(i, demand, price)
+            if i % checkpoint_every == 0:
+                self._checkpoints.append((demand.copy(), price.copy(), previous.copy()))
+            state = self._state(i, demand, price, previous)
+            won = state.provisional.sum(axis=0)
+            history.append((self.rounds[i], np.clip(state.excess, 0, None).sum(), int((state.excess > 0).sum()),
+                            np.nansum(won * state.price)))
+        self.history = pd.DataFrame(history, columns=['Round', 'Excess_Demand', 'Cells_With_Excess',
+                                                      'Provisional_Value_Cr'])
+
+    def _apply(self, i, demand, price):
+        """Apply round position `i` in place; returns the prices before it"""
+        previous = price.copy()
+        rows = slice(self._offsets[i], self._offsets[i + 1])
+        demand[self._bids[rows]] = self._demand[rows]
+        priced = rows.start + np.flatnonzero(~np.isnan(self._prices[rows]))
+        price[self._cells[priced]] = self._prices[priced]
+        return previous
+
+    def _state(self, i, demand, price, previous):
+        shape = (len(self.bidders), len(BANDS), N_CIRCLES)
+        demand = demand.reshape(shape)
+        price = price.reshape(shape[1:])
+        aggregate = demand.sum(axis=0)
+        excess = aggregate - self.supply
+        # A cell whose demand fits the blocks on offer has cleared at this round's price, for now
+        provisional = np.where(excess <= 0, demand, 0)
+        return RoundState(self.rounds[i], demand, price, price - previous.reshape(shape[1:]),
+                          aggregate, excess, provisional)
+
+    def state(self, round_number):
+        """Auction state after `round_number`, restored from the nearest earlier checkpoint"""
+        i = int(np.searchsorted(self.rounds, round_number))
+        if i == len(self.rounds) or self.rounds[i] != round_number:
+            raise KeyError(f"Round {round_number} is not in the log (rounds {self.rounds[0]}-{self.rounds[-1]})")
+        checkpoint = i // self.checkpoint_every
+        demand, price, previous = (array.copy() for array in self._checkpoints[checkpoint])
+        for j in range(checkpoint * self.checkpoint_every + 1, i + 1):
+            previous = self._apply(j, demand, price)
+        return self._state(i, demand, price, previous)
+
+    def competitor_demand(self, state, bidder=None):
+        """Band x circle demand of every bidder except `bidder` (all bidders when None)"""
+        if bidder is None:
+            return state.aggregate
+        return state.aggregate - state.demand[self.bidders.index(bidder)]
+
+    def frame(self, state, band=None, bidder=None):
+        """Per band and circle state as a table: supply, demand, competitor demand, excess demand,
+        price, increment and provisional winners (cells with blocks on offer or demand)"""
+        bands, circles = np.nonzero((self.supply > 0) | (state.aggregate > 0))
+        if band is not None:
+            keep = bands == BANDS.index(band)
+            bands, circles = bands[keep], circles[keep]
+        names = np.array(self.bidders, dtype=object)
+        winners = [', '.join(names[state.provisional[:, b, c] > 0]) for b, c in zip(bands, circles)]
+        price, increment = state.price[bands, circles], state.increment[bands, circles]
+        return pd.DataFrame({
+            'Band': np.array(BANDS, dtype=object)[bands],
+            'Circle': np.array(CIRCLE_NAMES, dtype=object)[circles],
+            'Supply_Blocks': self.supply[bands, circles],
+            'Demand_Blocks': state.aggregate[bands, circles],
+            'Competitor_Demand': self.competitor_demand(state, bidder)[bands, circles],
+            'Excess_Demand': state.excess[bands, circles],
+            'Price_Cr': price,
+            'Increment_Cr': increment,
+            'Increment_Pct': np.round(100 * increment / (price - increment), 2),
+            'Provisional_Winners': winners,
+        })
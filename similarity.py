@@ -0,0 +1,232 @@
+"""Circles with a similar spectrum-availability profile: similarity matrices, clusters and nearest neighbours
+
+A circle's profile is its vector of MHz on offer per band from the circle
+cube, each band scaled by its largest circle so the 26 GHz thousands do not
+drown out the 800 MHz units. Two similarities are kept over those vectors:
+
+    cosine      the mix of bands, whatever the amounts (zero for a circle
+                with nothing on offer)
+    euclidean   1 / (1 + distance): the mix and the amounts together
+
+Both circle x circle matrices come from one matrix product each, and every
+row is sorted once, so nearest neighbours are a slice of a precomputed
+order. Clusters are k-means in NumPy (k-means++ seeding, best of a few
+restarts, fixed seed), so the same data version always gives the same
+groups. Everything is memoized per band selection; the data layer holds one
+`CircleSimilarity` per data version.
+
+Time the neighbour lookup:
+
+    python similarity.py                  # exit status 1 above the budget
+    python similarity.py --circle Karnataka --budget 20
+"""
+
+import argparse
+import collections
+import sys
+import threading
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from circles import circle_id
+from ingest import BANDS, QUANTUM_COLUMNS
+
+METRICS = ('cosine', 'euclidean')
+N_CLUSTERS = 5
+# k-means restarts kept and iterations per restart
+KMEANS_RESTARTS = 10
+KMEANS_ITERATIONS = 100
+# Most microseconds a neighbour lookup may take
+LOOKUP_BUDGET_US = 50
+
+Profiles = collections.namedtuple('Profiles', [
+    'bands',       # bands of the vectors
+    'vectors',     # circle x band: MHz scaled by each band's largest circle
+    'similarity',  # metric -> circle x circle similarity
+    'order',       # metric -> circle x circle: every row's circles, most similar first (itself excluded)
+])
+
+Neighbours = collections.namedtuple('Neighbours', ['circles', 'similarity'])
+
+
+def scaled_column(band):
+    """Column holding a band's MHz scaled by its largest circle"""
+    return f"Scaled_{QUANTUM_COLUMNS[band].replace('Quantum_', '')}"
+
+
+def band_vectors(mhz):
+    """Circle x band MHz scaled per band to [0, 1] by the band's largest circle"""
+    top = mhz.max(axis=0)
+    return mhz / np.where(top > 0, top, 1.0)
+
+
+def similarity_matrices(vectors):
+    """Cosine and euclidean (1 / (1 + distance)) circle x circle similarity of band vectors"""
+    norms = np.linalg.norm(vectors, axis=1)
+    unit = vectors / np.where(norms > 0, norms, 1.0)[:, None]
+    cosine = np.clip(unit @ unit.T, 0.0, 1.0)
+    squared = norms ** 2
+    distance = np.sqrt(np.maximum(squared[:, None] + squared[None, :] - 2 * vectors @ vectors.T, 0.0))
+    return {'cosine': cosine, 'euclidean': 1.0 / (1.0 + distance)}
+
+
+def neighbour_order(similarity):
+    """Every row's other circles, most similar first (ties by circle order)"""
+    n = len(similarity)
+    # A circle is not its own neighbour, so it sorts last
+    ranked = np.where(np.eye(n, dtype=bool), -np.inf, similarity)
+    return np.argsort(-ranked, axis=1, kind='stable')[:, :n - 1]
+
+
+def kmeans(vectors, n_clusters=N_CLUSTERS, restarts=KMEANS_RESTARTS, iterations=KMEANS_ITERATIONS, seed=0):
+    """Cluster of every vector, numbered by decreasing size, from the restart with the least inertia"""
+    n_clusters = min(n_clusters, len(vectors))
+    rng = np.random.default_rng(seed)
+    best, best_inertia = None, np.inf
+    for _ in range(restarts):
+        # k-means++: each next centre drawn in proportion to its squared distance from the nearest one
+        centres = vectors[[rng.integers(len(vectors))]]
+        for _ in range(1, n_clusters):
+            nearest = ((vectors[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+            if not nearest.sum():
+                break
+            centres = np.vstack([centres, vectors[rng.choice(len(vectors), p=nearest / nearest.sum())]])
+        for _ in range(iterations):
+            labels = ((vectors[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+            moved = np.array([vectors[labels == k].mean(axis=0) if (labels == k).any() else centres[k]
+                              for k in range(len(centres))])
+            if np.allclose(moved, centres):
+                break
+            centres = moved
+        inertia = ((vectors - centres[labels]) ** 2).sum()
+        if inertia < best_inertia - 1e-12:
+            best, best_inertia = labels, inertia
+    # Largest cluster first, ties by first circle
+    sizes = np.bincount(best, minlength=best.max() + 1)
+    first = np.array([np.flatnonzero(best == k)[0] if sizes[k] else len(best) for k in range(len(sizes))])
+    renumber = np.empty(len(sizes), dtype=int)
+    renumber[np.lexsort((first, -sizes))] = np.arange(len(sizes))
+    return renumber[best]
+
+
+class CircleSimilarity:
+    """Band-profile similarity, neighbours and clusters of the circles of one cube, memoized per band selection"""
+
+    def __init__(self, cube):
+        self.circles = cube['State'].to_numpy(dtype=object)
+        self._ids = cube['Circle_ID'].to_numpy()
+        self._mhz = {band: cube[QUANTUM_COLUMNS[band]].to_numpy(dtype=float) for band in BANDS
+                     if QUANTUM_COLUMNS[band] in cube.columns}
+        self._profiles = {}
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def profiles(self, bands=None):
+        """Vectors, similarity matrices and neighbour orders over `bands` (all bands of the cube by default)"""
+        bands = tuple(self._mhz if bands is None else (band for band in bands if band in self._mhz))
+        with self._lock:
+            if bands in self._profiles:
+                return self._profiles[bands]
+        vectors = band_vectors(np.column_stack([self._mhz[band] for band in bands]))
+        similarity = similarity_matrices(vectors)
+        profiles = Profiles(bands, vectors, similarity,
+                            {metric: neighbour_order(matrix) for metric, matrix in similarity.items()})
+        with self._lock:
+            self._profiles[bands] = profiles
+        return profiles
+
+    def position(self, circle):
+        """Row of a circle (name or alias) in the cube; raises ValueError for unknown circles"""
+        positions = np.flatnonzero(self._ids == circle_id(circle))
+        if not len(positions):
+            raise ValueError(f"Unknown circle {circle!r}")
+        return positions[0]
+
+    def nearest(self, circle, k=5, metric='cosine', bands=None):
+        """The `k` circles most similar to `circle` and their similarity (a slice of precomputed orders)"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity {metric!r}; expected one of {list(METRICS)}")
+        profiles = self.profiles(bands)
+        row = self.position(circle)
+        order = profiles.order[metric][row, :k]
+        return Neighbours(self.circles[order], profiles.similarity[metric][row, order])
+
+    def similar_to(self, circles, k=10, metric='cosine', bands=None, n_clusters=N_CLUSTERS):
+        """Circles most like a set of reference circles, by their mean similarity to the set, with the
+        reference each is closest to, its cluster (from 1) and its scaled band vector"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity {metric!r}; expected one of {list(METRICS)}")
+        profiles = self.profiles(bands)
+        rows = [self.position(circle) for circle in circles]
+        similarity = profiles.similarity[metric]
+        score = similarity[rows].mean(axis=0)
+        candidates = np.setdiff1d(np.arange(len(self.circles)), rows)
+        order = candidates[np.argsort(-score[candidates], kind='stable')[:k]]
+        frame = pd.DataFrame({
+            'Circle': self.circles[order],
+            'Similarity': score[order].round(4),
+            'Most_Like': self.circles[np.asarray(rows)[similarity[np.ix_(rows, order)].argmax(axis=0)]],
+            'Cluster': self.clusters(n_clusters, bands)[order] + 1,
+        })
+        for band, column in zip(profiles.bands, profiles.vectors.T):
+            frame[scaled_column(band)] = column[order].round(3)
+        return frame
+
+    def matrix(self, metric='cosine', bands=None):
+        """Circle x circle similarity as a frame labelled by circle"""
+        return pd.DataFrame(self.profiles(bands).similarity[metric], index=self.circles, columns=self.circles)
+
+    def describe_clusters(self, n_clusters=N_CLUSTERS, bands=None):
+        """One row per cluster: its circles and its mean scaled band vector"""
+        profiles = self.profiles(bands)
+        labels = self.clusters(n_clusters, bands)
+        frame = pd.DataFrame({
+            'Cluster': np.arange(labels.max() + 1) + 1,
+            'Circles': [', '.join(self.circles[labels == k]) for k in range(labels.max() + 1)],
+            'Count': np.bincount(labels),
+        })
+        for band, column in zip(profiles.bands, profiles.vectors.T):
+            frame[scaled_column(band)] = (np.bincount(labels, weights=column) / frame['Count']).round(3)
+        return frame
+
+    def clusters(self, n_clusters=N_CLUSTERS, bands=None, seed=0):
+        """k-means cluster (from 0, largest first) of every circle's band vector"""
+        profiles = self.profiles(bands)
+        key = (profiles.bands, n_clusters, seed)
+        with self._lock:
+            if key in self._clusters:
+                return self._clusters[key]
+        labels = kmeans(profiles.vectors, n_clusters, seed=seed)
+        with self._lock:
+            self._clusters[key] = labels
+        return labels
+
+
+def lookup_microseconds(similarity, circle, k=5, metric='cosine', number=20000):
+    """Mean microseconds of one `nearest` call on warm profiles"""
+    similarity.nearest(circle, k, metric)
+    return timeit.timeit(lambda: similarity.nearest(circle, k, metric), number=number) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--circle', default='Karnataka')
+    parser.add_argument('-k', type=int, default=5, help="neighbours per lookup")
+    parser.add_argument('--budget', type=float, default=LOOKUP_BUDGET_US,
+                        help="largest allowed lookup time (µs, default %(default)s)")
+    args = parser.parse_args(argv)
+
+    from dashboard import build_tables
+    similarity = CircleSimilarity(build_tables()[4])
+    for metric in METRICS:
+        neighbours = similarity.nearest(args.circle, args.k, metric)
+        print(f"{metric:<10} " + ', '.join(f"{name} ({value:.3f})" for name, value in zip(*neighbours)))
+    elapsed = max(lookup_microseconds(similarity, args.circle, args.k, metric) for metric in METRICS)
+    print(f"lookup: {elapsed:.1f} µs (budget {args.budget:g} µs)")
+    return 0 if elapsed <= args.budget else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
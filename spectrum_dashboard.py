@@ -0,0 +1,64 @@
+import pathlib
+
+import streamlit as st
+
+from dashboard import PAGES, load_config, load_data_layer, visit
+from data_plane import data_version
+from valuation import rank_options
+
+STYLESHEET = pathlib.Path(__file__).with_name('static') / 'dashboard.css'
+
+
+def main(config):
+    """Draw the dashboard a config describes (see dashboard.py)"""
+    # Set page configuration
+    st.set_page_config(
+        page_title=config['title'],
+        page_icon="📡",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # Header styling, kept in static/dashboard.css
+    st.markdown(f"<style>{STYLESHEET.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
+
+    # Main title
+    st.markdown(f'<h1 class="main-header">📡 {config["title"]}</h1>', unsafe_allow_html=True)
+    st.markdown("---")
+
+    # One data layer per data version and server process, shared by every page and session
+    data = load_data_layer(data_version())
+    prefetcher = data.prefetcher(config['bands'], config['features']['prefetch'])
+
+    # Sidebar for navigation
+    st.sidebar.title("📊 Navigation")
+    page = st.sidebar.selectbox("Select Analysis View", config['pages'])
+
+    # Ranking used by every page's top-circle tables (value rankings only once their data files are filled in)
+    rank_by = st.sidebar.selectbox("Rank Circles By", rank_options(data.df_circles))
+
+    # Start building the views this page usually leads to
+    visit(prefetcher, (page,))
+
+    # Data validation results
+    if config['features']['validation']:
+        with st.sidebar.expander(f"🧪 Data Validation ({len(data.validation_report)} issues)"):
+            if data.validation_report.empty:
+                st.write("All ingest checks passed.")
+            else:
+                st.dataframe(data.validation_report, use_container_width=True, hide_index=True)
+
+    PAGES[page](data, config, rank_by)
+
+    # Footer
+    st.markdown("---")
+    st.markdown(f"""
+    <div style='text-align: center; color: #666; padding: 1rem;'>
+        📡 {config['title']} | Strategic Decision Support Tool
+    </div>
+    """, unsafe_allow_html=True)
+
+
+if __name__ == '__main__':
+    # Pages, bands and features of this deployment (dashboard.toml or SPECTRUM_DASHBOARD_CONFIG)
+    main(load_config())
@@ -0,0 +1,109 @@
+"""Startup cost of the dashboard: what its imports take and how soon a new session sees the Executive Summary
+
+Two measurements, both of a cold interpreter:
+
+    imports      `python -X importtime` of the modules the dashboard script
+                 loads, after Streamlit itself (which every script pays for),
+                 summed by top-level package
+    first paint  a headless server per run: seconds from a session's first
+                 rerun to its first element on screen and to the finished
+                 Executive Summary, for the first session of the process (which
+                 runs the imports and builds the data layer) and for the next one
+
+    python startup.py                        # exit status 1 above the target
+    python startup.py --runs 5 --target 0.8
+    python startup.py --imports-only
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Modules the dashboard script imports, after streamlit
+APP_MODULES = ('dashboard', 'dashboard_pages')
+# Seconds from a new process's first session to its first element on screen
+FIRST_PAINT_TARGET = 1.0
+# Packages an Executive Summary session should not have imported
+DEFERRED = ('plotly.express', 'plotly.subplots')
+
+
+def import_profile(modules=APP_MODULES):
+    """Self import time (s) of every top-level package the modules load past Streamlit, and the modules loaded"""
+    code = f"import streamlit; import {', '.join(modules)}; import sys; print(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True)
+    lines = [line.split('|') for line in result.stderr.splitlines() if line.startswith('import time:')][1:]
+    # Streamlit's own imports end with its top-level entry
+    start = next(i for i, line in enumerate(lines) if line[2].rstrip() == ' streamlit') + 1
+    packages = collections.Counter()
+    for self_us, _, name in lines[start:]:
+        packages[name.strip().split('.')[0]] += int(self_us.split(':')[1]) / 1e6
+    return packages, set(result.stdout.split())
+
+
+async def _sessions(url):
+    from load_test import Session
+    paints = []
+    for number in range(2):
+        session = Session(url, number, 0, random.Random(number))
+        await session.open()
+        paints.append((session.paints[0], session.latencies[0]))
+        await session.close()
+    return paints
+
+
+def first_paint(script, port, runs):
+    """(first paint, finished) seconds of the first and second session of `runs` fresh servers, shaped
+    (run, session, 2), and each server's seconds to report healthy"""
+    from load_test import start_server
+    paints, ready = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        server = start_server(script, port)
+        ready.append(time.perf_counter() - started)
+        try:
+            paints.append(asyncio.run(_sessions(f'ws://localhost:{port}')))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    return np.array(paints), np.array(ready)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--script', default='spectrum_dashboard.py')
+    parser.add_argument('--runs', type=int, default=3, help="fresh servers to start (medians are reported)")
+    parser.add_argument('--port', type=int, default=8597)
+    parser.add_argument('--target', type=float, default=FIRST_PAINT_TARGET,
+                        help="largest allowed first paint of a new process (s, default %(default)s)")
+    parser.add_argument('--top', type=int, default=8, help="packages listed in the import profile")
+    parser.add_argument('--imports-only', action='store_true')
+    args = parser.parse_args(argv)
+
+    packages, loaded = import_profile()
+    print(f"imports past streamlit: {sum(packages.values()) * 1000:,.0f} ms")
+    for name, seconds in packages.most_common(args.top):
+        print(f"    {name:<16} {seconds * 1000:7.1f} ms")
+    eager = [name for name in DEFERRED if name in loaded]
+    if eager:
+        print(f"imported at startup but meant to be deferred: {', '.join(eager)}")
+    if args.imports_only:
+        return 1 if eager else 0
+
+    paints, ready = first_paint(args.script, args.port, args.runs)
+    (cold_paint, cold_done), (warm_paint, warm_done) = np.median(paints, axis=0)
+    print(f"server healthy:  {np.median(ready):.2f} s")
+    print(f"first session:   first paint {cold_paint:.2f} s   Executive Summary {cold_done:.2f} s")
+    print(f"next session:    first paint {warm_paint:.2f} s   Executive Summary {warm_done:.2f} s")
+    print(f"target:          first paint of a new process within {args.target:.2f} s")
+    return 0 if cold_paint <= args.target and not eager else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Ad-hoc query engine over the bundled workbooks (run with `python -m pytest`)"""
+
+import pytest
+
+from dashboard import build_tables
+from query import QueryEngine, describe
+
+
+@pytest.fixture(scope='module')
+def tables():
+    *_, cube, blocks, _ = build_tables()
+    return cube, blocks
+
+
+@pytest.fixture
+def engine(tables):
+    return QueryEngine(*tables, version='test')
+
+
+def test_ungrouped_count_is_the_grouped_total(engine, tables):
+    total = engine.query("blocks select count(*)")['count(*)'].tolist()
+    grouped = engine.query("blocks group by Band select Band, count(*)")['count(*)'].sum()
+    assert total == [grouped] == [len(tables[1])]
+
+
+def test_count_over_no_rows_is_zero(engine):
+    assert engine.query("blocks where Band = 'no such band' select count(*)")['count(*)'].tolist() == [0]
+
+
+def test_column_reference_ignores_materialized_columns(engine):
+    before = describe(engine)
+    engine.query("circles where Contiguous_1800MHz >= 10 select State, Offered_3300MHz")
+    assert describe(engine).equals(before)
+
+
+def test_rows_scanned_ignores_materialized_columns(tables):
+    text = "circles where Contiguous_1800MHz >= 10 and Quantum_900MHz > 0 select State"
+    fresh = QueryEngine(*tables, version='test').run(text)
+    warmed = QueryEngine(*tables, version='test')
+    warmed.query("circles select Contiguous_1800MHz")
+    assert warmed.run(text).rows_scanned == fresh.rows_scanned
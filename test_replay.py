@@ -0,0 +1,23 @@
+"""Round-log loading for the Auction Replay (run with `python -m pytest`)"""
+
+import io
+
+import pytest
+
+from replay import LOG_COLUMNS, load_round_log
+
+
+def test_header_only_csv_is_rejected():
+    with pytest.raises(ValueError, match="no rows"):
+        load_round_log(io.BytesIO(f"{','.join(LOG_COLUMNS)}\n".encode()), 'rounds.csv')
+
+
+def test_empty_json_log_is_rejected():
+    with pytest.raises(ValueError):
+        load_round_log(io.BytesIO(b'{"bids": []}'), 'rounds.json')
+
+
+def test_one_round_loads():
+    log = load_round_log(io.BytesIO(f"{','.join(LOG_COLUMNS)}\n".encode() + b'1,Delhi,800 MHz,A,2,10.5\n'),
+                         'rounds.csv')
+    assert log['Round'].tolist() == [1]
@@ -0,0 +1,45 @@
+"""Ingest validation against the bundled workbooks (run with `python -m pytest`)"""
+
+import pytest
+
+from dashboard import build_tables
+from ingest import band_summary
+from validation import validate_spectrum_data
+
+
+@pytest.fixture(scope='module')
+def tables():
+    df_800, df_900, df_1800, df_high, _, blocks, totals = build_tables()
+    return band_summary(df_900, df_1800, df_high, df_800=df_800), blocks, totals
+
+
+def reconciliation(report):
+    return report[report['Check'] == 'Reconciliation']
+
+
+def test_bundled_tables_reconcile(tables):
+    assert reconciliation(validate_spectrum_data(*tables)).empty
+
+
+def test_dashboard_value_off_the_declared_total_is_reported(tables):
+    summary, blocks, totals = tables
+    summary = summary.copy()
+    summary.loc[0, 'Quantum_MHz'] += 1.25
+    found = reconciliation(validate_spectrum_data(summary, blocks, totals))
+    assert found[['Band', 'State']].values.tolist() == [summary.loc[0, ['Band', 'State']].tolist()]
+
+
+def test_declared_total_off_the_listed_blocks_is_reported(tables):
+    summary, blocks, totals = tables
+    totals = totals.copy()
+    totals.loc[0, 'Declared_Quantum_MHz'] += 5
+    found = reconciliation(validate_spectrum_data(summary, blocks, totals))
+    assert found[['Band', 'State']].values.tolist() == [totals.loc[0, ['Band', 'State']].tolist()]
+
+
+def test_declared_circle_missing_from_the_dashboard_is_reported(tables):
+    summary, blocks, totals = tables
+    dropped = summary.iloc[0]
+    report = validate_spectrum_data(summary.iloc[1:], blocks, totals)
+    names = report[(report['Check'] == 'State names') & (report['Severity'] == 'error')]
+    assert names[['Band', 'State']].values.tolist() == [[dropped['Band'], dropped['State']]]
@@ -0,0 +1,65 @@
+"""Reserve-price valuation and the value rankings, on filled-in price and population files (run with
+`python -m pytest`)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from circles import CIRCLE_NAMES, N_CIRCLES
+from dashboard import build_tables
+from ingest import BANDS
+from ranking import RankIndex
+from valuation import (RUPEES_PER_CRORE, load_circle_population, load_reserve_prices, rank_options, top_circles,
+                       with_valuation)
+
+# Fixture figures: ₹ Cr per MHz by band and circle, and population per circle, chosen so no ranking is in Circle_ID order
+PRICES = np.array([[(circle * 7 + band) % 11 + 1.0 for circle in range(N_CIRCLES)] for band in range(len(BANDS))])
+POPULATION = np.array([((circle * 5) % 13 + 1) * 1e6 for circle in range(N_CIRCLES)])
+
+
+@pytest.fixture(scope='module')
+def tables(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('valuation')
+    pd.DataFrame([{'Circle': CIRCLE_NAMES[circle], 'Band': band, 'Reserve_Price_Cr_per_MHz': PRICES[b, circle]}
+                  for b, band in enumerate(BANDS) for circle in range(N_CIRCLES)]
+                 ).to_csv(directory / 'reserve_prices.csv', index=False)
+    pd.DataFrame({'Circle': CIRCLE_NAMES, 'Population': POPULATION, 'Subscribers': POPULATION / 2}
+                 ).to_csv(directory / 'circle_population.csv', index=False)
+    df_800, df_900, df_1800, df_high, cube, _, _ = build_tables()
+    cube = with_valuation(cube, load_reserve_prices(directory / 'reserve_prices.csv'),
+                          *load_circle_population(directory / 'circle_population.csv'))
+    return {'900 MHz': df_900, '1800 MHz': df_1800}, cube
+
+
+def test_value_rankings_hidden_without_prices(tables):
+    _, cube = tables
+    unpriced = with_valuation(cube, np.full(PRICES.shape, np.nan), POPULATION, POPULATION / 2)
+    assert rank_options(unpriced) == ['Quantum (MHz)']
+
+
+def test_value_rankings_offered_once_priced(tables):
+    _, cube = tables
+    assert rank_options(cube) == ['Quantum (MHz)', 'Reserve Outlay (₹ Cr)', '₹ per MHz-pop']
+    assert rank_options(with_valuation(cube, PRICES, np.full(N_CIRCLES, np.nan), POPULATION)) == [
+        'Quantum (MHz)', 'Reserve Outlay (₹ Cr)']
+
+
+@pytest.mark.parametrize('band', ['900 MHz', '1800 MHz'])
+def test_value_rankings_order(tables, band):
+    band_tables, cube = tables
+    df = band_tables[band]
+    quantum = df[f"Quantum_{band.replace(' ', '')}"].to_numpy(dtype=float)
+    price = PRICES[BANDS.index(band)][df['Circle_ID']]
+    rankings = RankIndex(cube, 'test')
+    columns = ['Circle_ID', 'State']
+
+    outlay = top_circles(df, band, 5, 'Reserve Outlay (₹ Cr)', rankings, columns)
+    expected = df.assign(value=price * quantum).sort_values('value', ascending=False, kind='stable').head(5)
+    assert outlay['Circle_ID'].tolist() == expected['Circle_ID'].tolist()
+    assert outlay.iloc[:, -1].to_numpy() == pytest.approx(expected['value'].to_numpy())
+
+    per_pop = top_circles(df, band, 5, '₹ per MHz-pop', rankings, columns)
+    value = price * RUPEES_PER_CRORE / POPULATION[df['Circle_ID']]
+    expected = df.assign(value=value).sort_values('value', kind='stable').head(5)
+    assert per_pop['Circle_ID'].tolist() == expected['Circle_ID'].tolist()
+    assert per_pop.iloc[:, -1].to_numpy() == pytest.approx(expected['value'].to_numpy())
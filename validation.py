@@ -0,0 +1,197 @@
+"""Vectorized schema validation and reconciliation of the spectrum data at ingest"""
+
+import numpy as np
+import pandas as pd
+
+from ingest import BLOCK_SIZE_MHZ, DUPLEX_MODES
+
+REPORT_COLUMNS = ['Check', 'Severity', 'Band', 'State', 'Detail']
+
+# Absolute tolerance for MHz comparisons (workbook values are decimal fractions)
+TOLERANCE_MHZ = 1e-6
+
+
+def _columns(frame):
+    """Pull every column out as a NumPy array once, so checks avoid pandas indexing"""
+    return {name: frame[name].to_numpy() for name in frame.columns}
+
+
+def _issues(check, severity, cols, rows, detail):
+    """Report rows for the rows of `cols` selected by `rows` (mask or positions)"""
+    return (check, severity, cols['Band'][rows], cols['State'][rows], detail)
+
+
+def _group_keys(*tables):
+    """Integer Band/State key per row, shared across `tables`, and the key count"""
+    band = np.concatenate([t['Band'] for t in tables]).astype(object)
+    state = np.concatenate([t['State'] for t in tables]).astype(object)
+    band_codes, band_labels = pd.factorize(band)
+    state_codes, state_labels = pd.factorize(state)
+    keys = band_codes.astype(np.int64) * len(state_labels) + state_codes
+    bounds = np.cumsum([0] + [len(t['Band']) for t in tables])
+    return [keys[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])], len(band_labels) * len(state_labels)
+
+
+def _sorted_by(keys, values):
+    """Order rows by group key then value; also flag rows sharing a group with their predecessor"""
+    order = np.lexsort((values, keys))
+    sorted_keys = keys[order]
+    return order, sorted_keys[1:] == sorted_keys[:-1]
+
+
+def check_dashboard_arithmetic(summary):
+    """Quantum must equal blocks x block size in the dashboard tables"""
+    size = summary['Block_Size_MHz']
+    expected = summary['Blocks'] * size
+    bad = ~np.isnan(expected) & ~np.isclose(summary['Quantum_MHz'], expected, atol=TOLERANCE_MHZ)
+    detail = [f"Quantum {q:g} MHz != {b:g} blocks x {s:g} MHz = {e:g} MHz"
+              for q, b, s, e in zip(summary['Quantum_MHz'][bad], summary['Blocks'][bad], size[bad], expected[bad])]
+    return [_issues('Block arithmetic', 'error', summary, bad, detail)]
+
+
+def check_workbook_totals(blocks, totals, block_keys, total_keys, n_keys):
+    """Declared "Total No. of Blocks" / "Total Quantum (MHz)" must match the blocks listed"""
+    listed_b = np.bincount(block_keys, minlength=n_keys)[total_keys].astype(float)
+    listed_q = np.bincount(block_keys, weights=blocks['Quantum_MHz'], minlength=n_keys)[total_keys]
+
+    declared_q = totals['Declared_Quantum_MHz']
+    bad_q = ~np.isclose(declared_q, listed_q, atol=TOLERANCE_MHZ)
+    quantum_detail = [f"{sheet} row {row}: declared {d:g} MHz, blocks sum to {l:g} MHz"
+                      for sheet, row, d, l in zip(totals['Sheet'][bad_q], totals['Row'][bad_q],
+                                                  declared_q[bad_q], listed_q[bad_q])]
+
+    declared_b = totals['Declared_Blocks']
+    bad_b = ~np.isnan(declared_b) & (declared_b != listed_b)
+    block_detail = [f"{sheet}: declared {d:g} blocks, {l:g} listed"
+                    for sheet, d, l in zip(totals['Sheet'][bad_b], declared_b[bad_b], listed_b[bad_b])]
+
+    # Every block should be exactly one block size wide
+    width = blocks['Stop_MHz'] - blocks['Start_MHz']
+    size = blocks['Block_Size_MHz']
+    bad_w = (~np.isclose(width, size, atol=TOLERANCE_MHZ) |
+             ~np.isclose(blocks['Quantum_MHz'], size, atol=TOLERANCE_MHZ))
+    width_detail = [f"{sheet} row {row}: block {n} is {w:g} MHz wide, expected {s:g} MHz"
+                    for sheet, row, n, w, s in zip(blocks['Sheet'][bad_w], blocks['Row'][bad_w],
+                                                   blocks['Block'][bad_w], width[bad_w], size[bad_w])]
+
+    return [_issues('Workbook total', 'error', totals, bad_q, quantum_detail),
+            _issues('Workbook total', 'error', totals, bad_b, block_detail),
+            _issues('Block arithmetic', 'error', blocks, bad_w, width_detail)]
+
+
+def check_frequency_order(blocks, block_keys):
+    """Stop must exceed start, and blocks must ascend in frequency by block number"""
+    start = blocks['Start_MHz']
+    ul_start = blocks['UL_Start_MHz']
+    bad = ~(blocks['Stop_MHz'] > start) | (~np.isnan(ul_start) & ~(blocks['UL_Stop_MHz'] > ul_start))
+    inverted_detail = [f"{sheet} row {row}: block {n} has stop <= start"
+                       for sheet, row, n in zip(blocks['Sheet'][bad], blocks['Row'][bad], blocks['Block'][bad])]
+
+    order, same_group = _sorted_by(block_keys, blocks['Block'])
+    descending = order[1:][same_group & (np.diff(start[order]) < 0)]
+    unordered_detail = [f"{sheet} row {row}: block {n} starts below the previous block"
+                        for sheet, row, n in zip(blocks['Sheet'][descending], blocks['Row'][descending],
+                                                 blocks['Block'][descending])]
+
+    return [_issues('Frequency order', 'error', blocks, bad, inverted_detail),
+            _issues('Frequency order', 'warning', blocks, descending, unordered_detail)]
+
+
+def _overlaps(blocks, block_keys, start_col, stop_col, label):
+    present = np.flatnonzero(~np.isnan(blocks[start_col]))
+    start = blocks[start_col][present]
+    stop = blocks[stop_col][present]
+    order, same_group = _sorted_by(block_keys[present], start)
+
+    # Running maximum of stop within each group catches overlaps with any earlier block;
+    # the per-group offset keeps one group's maximum from leaking into the next
+    group_id = np.cumsum(np.r_[True, ~same_group])
+    offset = group_id * (np.max(stop) + 1.0 if len(stop) else 1.0)
+    prev_stop = np.maximum.accumulate(stop[order] + offset) - offset
+    clash = same_group & (start[order][1:] < prev_stop[:-1] - TOLERANCE_MHZ)
+    rows = present[order[1:][clash]]
+    detail = [f"{sheet} row {row}: {label} {s:g}-{e:g} MHz overlaps an earlier block"
+              for sheet, row, s, e in zip(blocks['Sheet'][rows], blocks['Row'][rows],
+                                          blocks[start_col][rows], blocks[stop_col][rows])]
+    return _issues('Block overlap', 'error', blocks, rows, detail)
+
+
+def check_overlaps(blocks, block_keys):
+    """No two blocks of the same band may overlap within a circle"""
+    return [_overlaps(blocks, block_keys, 'Start_MHz', 'Stop_MHz', 'range'),
+            _overlaps(blocks, block_keys, 'UL_Start_MHz', 'UL_Stop_MHz', 'uplink')]
+
+
+def check_duplex_scheme(blocks):
+    """FDD blocks need an uplink range paired with the downlink; TDD blocks must not have one"""
+    has_uplink = ~np.isnan(blocks['UL_Start_MHz'])
+    fdd = blocks['Duplex'] == 'FDD'
+    bad = fdd != has_uplink
+    detail = [f"{sheet} row {row}: {mode} block {n} {'has no' if mode == 'FDD' else 'has an'} uplink range"
+              for sheet, row, n, mode in zip(blocks['Sheet'][bad], blocks['Row'][bad],
+                                             blocks['Block'][bad], blocks['Duplex'][bad])]
+    return [_issues('Duplex scheme', 'error', blocks, bad, detail)]
+
+
+def check_state_consistency(summary, totals, summary_keys, total_keys, n_keys):
+    """Reconcile circles and quanta between the dashboard tables and the totals the workbooks declare
+
+    The dashboard tables are sums over the listed blocks, so they are checked
+    against the sheets' own "Total Quantum" figures rather than those blocks.
+    """
+    declared_mhz = np.bincount(total_keys, weights=totals['Declared_Quantum_MHz'], minlength=n_keys)
+    declared = np.bincount(total_keys, minlength=n_keys) > 0
+    shown = np.zeros(n_keys, dtype=bool)
+    shown[summary_keys] = True
+
+    # Circles a workbook declares in a band the dashboard carries, but which its table lacks
+    missing = np.flatnonzero(np.isin(totals['Band'], np.unique(summary['Band'])) & ~shown[total_keys])
+    missing_detail = [f"Declared in the workbook ({d:g} MHz) but missing from the dashboard table"
+                      for d in totals['Declared_Quantum_MHz'][missing]]
+
+    unknown = summary['Circle_ID'] < 0
+    unknown_detail = ['Not a canonical circle name or alias'] * int(unknown.sum())
+
+    # Circles without a declared total offer nothing in the band
+    dashboard = summary['Quantum_MHz']
+    workbook = np.where(declared, declared_mhz, 0.0)[summary_keys]
+    mismatch = ~unknown & ~np.isclose(workbook, dashboard, atol=TOLERANCE_MHZ)
+    mismatch_detail = [f"Dashboard shows {d:g} MHz, workbook declares {w:g} MHz"
+                       for d, w in zip(dashboard[mismatch], workbook[mismatch])]
+
+    return [_issues('State names', 'error', totals, missing, missing_detail),
+            _issues('State names', 'warning', summary, unknown, unknown_detail),
+            _issues('Reconciliation', 'error', summary, mismatch, mismatch_detail)]
+
+
+def validate_spectrum_data(summary, blocks, totals):
+    """Run every ingest check and return the problems found as one table
+
+    `summary` is the long Band/State table from `ingest.band_summary`; `blocks`
+    and `totals` come from `ingest.load_block_table`.
+    """
+    summary = _columns(summary)
+    blocks = _columns(blocks)
+    totals = _columns(totals)
+    band_codes, band_labels = pd.factorize(np.concatenate([summary['Band'], blocks['Band']]).astype(object))
+    sizes = np.array([BLOCK_SIZE_MHZ[band] for band in band_labels])[band_codes]
+    summary['Block_Size_MHz'] = sizes[:len(summary['Band'])]
+    blocks['Block_Size_MHz'] = sizes[len(summary['Band']):]
+    blocks['Duplex'] = np.array([DUPLEX_MODES[band] for band in band_labels])[band_codes][len(summary['Band']):]
+    (summary_keys, block_keys, total_keys), n_keys = _group_keys(summary, blocks, totals)
+
+    found = (check_dashboard_arithmetic(summary) +
+             check_workbook_totals(blocks, totals, block_keys, total_keys, n_keys) +
+             check_frequency_order(blocks, block_keys) +
+             check_overlaps(blocks, block_keys) +
+             check_duplex_scheme(blocks) +
+             check_state_consistency(summary, totals, summary_keys, total_keys, n_keys))
+
+    counts = [len(detail) for _, _, _, _, detail in found]
+    return pd.DataFrame({
+        'Check': np.repeat([check for check, _, _, _, _ in found], counts),
+        'Severity': np.repeat([severity for _, severity, _, _, _ in found], counts),
+        'Band': np.concatenate([band for _, _, band, _, _ in found]),
+        'State': np.concatenate([state for _, _, _, state, _ in found]),
+        'Detail': np.concatenate([np.asarray(detail, dtype=object) for _, _, _, _, detail in found]),
+    }, columns=REPORT_COLUMNS)
@@ -0,0 +1,130 @@
+"""Reserve-price valuation of the spectrum on offer: ₹/MHz, ₹/MHz-pop and outlay"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from circles import N_CIRCLES, circle_ids
+from holdings import normalize_band
+from ingest import BANDS, QUANTUM_COLUMNS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Reserve price per band and circle in ₹ crore per MHz (per MHz of paired quantum for FDD bands)
+RESERVE_PRICES_PATH = os.path.join(DATA_DIR, 'reserve_prices.csv')
+# Population and mobile subscribers per circle
+POPULATION_PATH = os.path.join(DATA_DIR, 'circle_population.csv')
+
+RUPEES_PER_CRORE = 1e7
+
+
+def _suffix(band):
+    return QUANTUM_COLUMNS[band].replace('Quantum_', '')
+
+
+def outlay_column(band):
+    """Column holding the reserve-price outlay (₹ crore) for the band's whole quantum"""
+    return f'Outlay_{_suffix(band)}'
+
+
+def mhz_pop_column(band):
+    """Column holding the band's reserve price in ₹ per MHz-pop"""
+    return f'Rs_per_MHz_pop_{_suffix(band)}'
+
+
+# Ways to rank circles: (per-band column, all-band column, ascending)
+RANK_BY = {
+    'Quantum (MHz)': (lambda band: QUANTUM_COLUMNS[band], 'Occupied_MHz', False),
+    'Reserve Outlay (₹ Cr)': (outlay_column, 'Outlay_Cr', False),
+    '₹ per MHz-pop': (mhz_pop_column, 'Rs_per_MHz_pop', True),
+}
+
+
+def rank_options(wide):
+    """Names of the RANK_BY rankings the per-circle frame has values for (value rankings need
+    data/reserve_prices.csv, and ₹ per MHz-pop also data/circle_population.csv, filled in)"""
+    options = []
+    for name, (per_band, overall, _) in RANK_BY.items():
+        columns = [overall] + [per_band(band) for band in BANDS]
+        if wide[[column for column in columns if column in wide.columns]].notna().any(axis=None):
+            options.append(name)
+    return options
+
+
+def load_reserve_prices(path=RESERVE_PRICES_PATH):
+    """Reserve prices as a band x circle matrix (NaN where no price is given)"""
+    prices = np.full((len(BANDS), N_CIRCLES), np.nan)
+    if not os.path.exists(path):
+        return prices
+    frame = pd.read_csv(path)
+    circles = circle_ids(frame['Circle'])
+    bands = pd.Index(BANDS).get_indexer(frame['Band'].map(normalize_band).astype(object))
+    price = pd.to_numeric(frame['Reserve_Price_Cr_per_MHz'], errors='coerce').to_numpy()
+    known = (circles >= 0) & (bands >= 0) & ~np.isnan(price)
+    prices[bands[known], circles[known]] = price[known]
+    return prices
+
+
+def load_circle_population(path=POPULATION_PATH):
+    """Population and subscribers per Circle_ID (NaN where not given)"""
+    population = np.full(N_CIRCLES, np.nan)
+    subscribers = np.full(N_CIRCLES, np.nan)
+    if not os.path.exists(path):
+        return population, subscribers
+    frame = pd.read_csv(path)
+    circles = circle_ids(frame['Circle'])
+    known = circles >= 0
+    population[circles[known]] = pd.to_numeric(frame['Population'], errors='coerce').to_numpy()[known]
+    subscribers[circles[known]] = pd.to_numeric(frame['Subscribers'], errors='coerce').to_numpy()[known]
+    return population, subscribers
+
+
+def with_valuation(wide, prices, population, subscribers):
+    """Add reserve-price columns to the per-circle frame, one vectorized pass per band
+
+    Per band: price (₹ Cr/MHz), outlay (₹ Cr) and ₹/MHz-pop. Across bands:
+    Outlay_Cr, Cr_per_MHz (per MHz of quantum), Rs_per_MHz_pop and Rs_per_MHz_sub.
+    Circles or bands without a price stay NaN.
+    """
+    wide = wide.copy()
+    ids = wide['Circle_ID'].to_numpy()
+    population = population[ids]
+    subscribers = subscribers[ids]
+    bands = [band for band in BANDS if QUANTUM_COLUMNS[band] in wide.columns]
+    price = prices[pd.Index(BANDS).get_indexer(bands)][:, ids].T
+    quantum = wide[[QUANTUM_COLUMNS[band] for band in bands]].to_numpy(dtype=float)
+    outlay = price * quantum
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_pop = price * RUPEES_PER_CRORE / population[:, None]
+        for i, band in enumerate(bands):
+            wide[f'Price_{_suffix(band)}'] = price[:, i]
+            wide[outlay_column(band)] = outlay[:, i]
+            wide[mhz_pop_column(band)] = per_pop[:, i]
+
+        # Bands with spectrum but no price leave the circle's totals unknown
+        priced = ~np.isnan(outlay) | (quantum == 0)
+        total_outlay = np.where(priced.all(axis=1), np.nansum(outlay, axis=1), np.nan)
+        total_quantum = quantum.sum(axis=1)
+        wide['Outlay_Cr'] = total_outlay
+        wide['Cr_per_MHz'] = total_outlay / total_quantum
+        wide['Rs_per_MHz_pop'] = total_outlay * RUPEES_PER_CRORE / (total_quantum * population)
+        wide['Rs_per_MHz_sub'] = total_outlay * RUPEES_PER_CRORE / (total_quantum * subscribers)
+    return wide
+
+
+def top_circles(df, band, n, rank_by, rankings, columns):
+    """Top `n` rows of a band table by the chosen ranking, from the precomputed `RankIndex`
+
+    Value rankings add the metric as a column. Falls back to quantum when no
+    prices are loaded.
+    """
+    per_band, _, ascending = RANK_BY[rank_by]
+    column = per_band(band)
+    quantum = QUANTUM_COLUMNS[band]
+    among = df['Circle_ID'].to_numpy()
+    if column == quantum or np.isnan(rankings.values(column)).all():
+        return rankings.rows(df, rankings.top(quantum, n, among))[columns]
+    circles = rankings.top(column, n, among, ascending)
+    return rankings.rows(df, circles)[columns].assign(**{column: rankings.values(column)[circles]})